@@ -8,12 +8,15 @@ from models import PDFFileItem, PDFProcessResult, EncryptionStatus
 from pdf_unlocker import unlock_pdf
 from file_namer import get_unique_filename
 from folder_importer import filter_pdf_files
-from pdf_analyzer import PdfAnalyzer
+from pdf_analyzer import PdfAnalyzer, batch_probe
 from pdf_handler import process_pdfs_in_batch
 from logger import logger
 from font_manager import get_recommended_fonts
 from config import DEFAULT_FONT_NAME, DEFAULT_FONT_SIZE, DEFAULT_HEADER_Y, DEFAULT_FOOTER_Y
 
+# 一次导入的文件数达到该值时改用进程池批量探测；spawn 工作进程启动约需 1 秒，少量文件串行更快
+_BATCH_PROBE_MIN_FILES = 64
+
 class ProcessingController:
     def __init__(self, view=None):
         self.view = view
@@ -22,20 +25,28 @@ class ProcessingController:
     def handle_file_import(self, paths: List[str]) -> List[PDFFileItem]:
         pdf_paths = filter_pdf_files(paths)
         logger.info(f"Processing {len(pdf_paths)} PDF files")
+        probes = {}
+        if len(pdf_paths) >= _BATCH_PROBE_MIN_FILES:
+            try:
+                probes = {p["path"]: p for p in batch_probe(pdf_paths)}
+            except (OSError, RuntimeError) as e:
+                # 进程池不可用（如工作进程异常退出）时回退为逐个探测
+                logger.warning(f"Batch probe failed, falling back to serial: {e}")
         file_items = []
         for path in pdf_paths:
             try:
                 logger.info(f"Processing file: {path}")
                 name = os.path.basename(path)
                 analyzer = PdfAnalyzer()
-                size = analyzer.get_pdf_file_size_mb(path)
+                probe = probes.get(path)
+                size = probe["size_mb"] if probe else analyzer.get_pdf_file_size_mb(path)
                 logger.info(f"File {name}: size={size:.2f}MB")
                 
                 status = EncryptionStatus.OK
                 page_count = 0
                 try:
                     # 使用集中式分析器获取页数
-                    page_count = analyzer.get_pdf_page_count(path)
+                    page_count = probe["page_count"] if probe else analyzer.get_pdf_page_count(path)
                     # 仍使用 PdfReader 判断加密状态
                     reader = PdfReader(path)
                     logger.info(f"File {name}: pages={page_count}")
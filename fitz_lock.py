@@ -0,0 +1,28 @@
+"""
+fitz_lock.py
+- PyMuPDF（fitz）进程级访问锁
+
+PyMuPDF 不是线程安全的：预览渲染线程、候选项扫描、处理线程与界面线程
+都可能同时调用 fitz，所有打开/读取/渲染/关闭文档的调用都须持有此锁。
+只在实际的 fitz 调用期间持锁，排版、合成、日志等纯 Python 工作放在锁外，
+避免界面线程等待整段渲染。使用可重入锁，已持锁的调用链内部再次获取不会死锁。
+"""
+
+import threading
+from contextlib import contextmanager
+
+import fitz
+
+FITZ_LOCK = threading.RLock()
+
+
+@contextmanager
+def fitz_document(*args, **kwargs):
+    """在锁内打开与关闭 fitz 文档；使用期间的 fitz 调用须自行持锁。"""
+    with FITZ_LOCK:
+        doc = fitz.open(*args, **kwargs)
+    try:
+        yield doc
+    finally:
+        with FITZ_LOCK:
+            doc.close()
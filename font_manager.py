@@ -1,7 +1,12 @@
 import sys
 import os
-from typing import List
+import json
+from functools import lru_cache
+from typing import List, Optional, Set, Tuple
+from PySide6.QtCore import qVersion
 from PySide6.QtGui import QFontDatabase
+from config import CONFIG_DIR
+from fitz_lock import FITZ_LOCK
 from logger import logger
 
 try:
@@ -14,6 +19,16 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from matplotlib.font_manager import findfont, FontProperties
 
+# 本进程内已注册到 ReportLab 的字体名，O(1) 判定，免去每次构造注册名列表
+_REGISTERED_FONTS: Set[str] = set(pdfmetrics.getRegisteredFontNames())
+
+
+@lru_cache(maxsize=256)
+def _find_font_path(font_name: str) -> str:
+    """matplotlib findfont 首次调用较慢，按字体名缓存解析结果。"""
+    return findfont(FontProperties(family=font_name), fallback_to_default=True)
+
+
 def register_font_safely(font_name: str) -> bool:
     """
     安全注册系统字体到 ReportLab 环境。
@@ -21,14 +36,14 @@ def register_font_safely(font_name: str) -> bool:
     Returns:
         bool: True 表示注册成功或已注册；False 表示未找到或失败。
     """
-    if font_name in pdfmetrics.getRegisteredFontNames():
+    if font_name in _REGISTERED_FONTS:
         logger.debug(f"[Font] '{font_name}' already registered.")
         return True
     try:
-        font_prop = FontProperties(family=font_name)
-        font_path = findfont(font_prop, fallback_to_default=True)
+        font_path = _find_font_path(font_name)
         if font_path:
             pdfmetrics.registerFont(TTFont(font_name, font_path))
+            _REGISTERED_FONTS.add(font_name)
             logger.info(f"[Font] Registered '{font_name}' from: {font_path}")
             return True
         else:
@@ -38,12 +53,77 @@ def register_font_safely(font_name: str) -> bool:
         logger.warning(f"[Font] Failed to register font '{font_name}': {e}")
         return False
 
+# 系统字体列表磁盘缓存：下次启动直接读取，后台再核对（见 refresh_system_fonts）
+_FONT_CACHE_PATH = os.path.join(CONFIG_DIR, "fonts.json")
+_SYSTEM_FONTS: Optional[Tuple[str, ...]] = None
+# 本进程是否已实际枚举过（而非仅读取磁盘缓存）
+_SYSTEM_FONTS_SCANNED = False
+
+
+def _font_cache_key() -> str:
+    return f"{sys.platform}|Qt {qVersion()}"
+
+
+def _load_font_cache() -> Optional[Tuple[str, ...]]:
+    try:
+        with open(_FONT_CACHE_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("key") == _font_cache_key() and data.get("families"):
+            return tuple(data["families"])
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"读取字体缓存失败: {e}")
+    return None
+
+
+def _save_font_cache(families: Tuple[str, ...]):
+    try:
+        os.makedirs(CONFIG_DIR, exist_ok=True)
+        with open(_FONT_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump({"key": _font_cache_key(), "families": list(families)}, f, ensure_ascii=False)
+    except Exception as e:
+        logger.warning(f"写入字体缓存失败: {e}")
+
+
+def _scan_system_fonts() -> Tuple[str, ...]:
+    global _SYSTEM_FONTS_SCANNED
+    families = tuple(QFontDatabase.families())
+    _SYSTEM_FONTS_SCANNED = True
+    return families
+
+
+def _system_font_families() -> Tuple[str, ...]:
+    """枚举系统字体较慢（字体多时可达数秒）：优先读磁盘缓存，每个进程最多枚举一次。"""
+    global _SYSTEM_FONTS
+    if _SYSTEM_FONTS is None:
+        families = _load_font_cache()
+        if families is None:
+            families = _scan_system_fonts()
+            _save_font_cache(families)
+        _SYSTEM_FONTS = families
+    return _SYSTEM_FONTS
+
+
+def refresh_system_fonts() -> bool:
+    """重新枚举系统字体并在变化时更新缓存，返回列表是否变化。
+    QFontDatabase 的静态函数线程安全，可在后台线程调用。"""
+    global _SYSTEM_FONTS
+    if _SYSTEM_FONTS_SCANNED:
+        return False
+    families = _scan_system_fonts()
+    if families == _system_font_families():
+        return False
+    _SYSTEM_FONTS = families
+    _save_font_cache(families)
+    return True
+
+
 def get_system_fonts() -> List[str]:
     """
     Return a list of available system font family names.
     """
-    fonts = QFontDatabase()
-    return fonts.families()
+    return list(_system_font_families())
 
 def is_chinese_supported(font_name: str) -> bool:
     """
@@ -66,15 +146,15 @@ def extract_header_fonts(path: str, y_threshold: int = 820, page_limit: int = 3)
     """
     fonts = set()
     try:
-        doc = fitz.open(path)
-        for page in doc[:min(len(doc), page_limit)]:
-            blocks = page.get_text("dict")["blocks"]
-            for block in blocks:
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        y_top = span["bbox"][1]
-                        if y_top <= y_threshold:
-                            fonts.add(span.get("font", "Unknown"))
+        with FITZ_LOCK, fitz.open(path) as doc:
+            for page in doc[:min(len(doc), page_limit)]:
+                blocks = page.get_text("dict")["blocks"]
+                for block in blocks:
+                    for line in block.get("lines", []):
+                        for span in line.get("spans", []):
+                            y_top = span["bbox"][1]
+                            if y_top <= y_threshold:
+                                fonts.add(span.get("font", "Unknown"))
     except Exception as e:
         logger.error(f"Error extracting header fonts from {path}: {e}")
     return list(fonts)
@@ -93,15 +173,15 @@ def extract_footer_fonts(path: str, y_threshold: int = 100, page_limit: int = 3)
     """
     fonts = set()
     try:
-        doc = fitz.open(path)
-        for page in doc[:min(len(doc), page_limit)]:
-            blocks = page.get_text("dict")["blocks"]
-            for block in blocks:
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        y_bottom = span["bbox"][1]
-                        if y_bottom <= y_threshold:
-                            fonts.add(span.get("font", "Unknown"))
+        with FITZ_LOCK, fitz.open(path) as doc:
+            for page in doc[:min(len(doc), page_limit)]:
+                blocks = page.get_text("dict")["blocks"]
+                for block in blocks:
+                    for line in block.get("lines", []):
+                        for span in line.get("spans", []):
+                            y_bottom = span["bbox"][1]
+                            if y_bottom <= y_threshold:
+                                fonts.add(span.get("font", "Unknown"))
     except Exception as e:
         logger.error(f"Error extracting footer fonts from {path}: {e}")
     return list(fonts)
@@ -2,6 +2,7 @@
 import sys
 import os
 import argparse
+import multiprocessing
 from PySide6.QtWidgets import QApplication
 from ui import MainWindow
 from logger import logger
@@ -100,4 +101,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包版（PyInstaller）中进程池的工作进程会重新执行入口，须先交给 multiprocessing 处理
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -5,18 +5,131 @@ pdf_analyzer.py
 
 from __future__ import annotations
 
+import multiprocessing
 import os
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import List, Dict, Any, Iterable, Mapping, Optional
 import argparse
 import json
+import re
 
-# 轻量依赖：PyPDF2 读取基础信息
-from PyPDF2 import PdfReader
-from PyPDF2.errors import PdfReadError
+import numpy as np
+
+# PyMuPDF 读取基础信息：仅解析目录/trailer，避免完整对象树解析
+import fitz
+
+from fitz_lock import FITZ_LOCK, fitz_document
 
 import logging
 logger = logging.getLogger(__name__)
 
+__all__ = ["PdfAnalyzer", "batch_probe"]
+
+# 文件缺失/损坏等可预期的打开失败（fitz 自带的 FileNotFoundError 不继承内置异常）
+_OPEN_ERRORS = (FileNotFoundError, fitz.FileNotFoundError, fitz.FileDataError)
+
+# 启发式判定用的常量集合（模块级构建一次）
+_CONTENT_CHARS = frozenset("。，！？；：（）【】、")
+_HEADER_FOOTER_KEYWORDS = ('page', '第', '页', 'of', '证据', '日期', 'confidential', 'draft', 'final', 'version')
+_HEADER_FOOTER_KW_RE = re.compile("|".join(map(re.escape, _HEADER_FOOTER_KEYWORDS)), re.IGNORECASE)
+_COMMON_FONTS = ('arial', 'helvetica', 'times', 'simsun', 'simhei')
+
+# Artifact 页眉/页脚标记内容（在原始内容流字节上匹配）
+_ARTIFACT_RE = re.compile(
+    rb"/Artifact\s*<<[^>]*?/Subtype\s*/(?P<kind>Header|Footer)[^>]*?>>\s*BDC(?P<body>.*?)EMC", re.DOTALL)
+_SIMPLE_ARTIFACT_RE = re.compile(
+    rb"BDC\s*<<[^>]*?/Subtype\s*/(?P<kind>Header|Footer)[^>]*?>>(?P<body>.*?)EMC", re.DOTALL)
+_PAREN_STRING_RE = re.compile(rb"\((.*?)(?<!\\)\)", re.DOTALL)
+# 跨内容流续接的未闭合标记内容最多保留的字节数（足够容纳一段页眉/页脚标记）
+_MAX_ARTIFACT_CARRY = 1024
+
+# 启发式扫描：带状区域文本连续一致的页数达到该值即提前结束
+_STABLE_PAGES = 2
+
+# 带状区域文本提取：不保留图片块
+_BAND_TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+
+@lru_cache(maxsize=4096)
+def _probe_cached(path: str, mtime_ns: int, size: int) -> SimpleNamespace:
+    """一次打开读取页数/元数据/首页字体；键含 mtime 与 size，文件变化后自动失效。"""
+    with FITZ_LOCK, fitz.open(path) as doc:
+        meta = doc.metadata or {}
+        return SimpleNamespace(
+            page_count=doc.page_count,
+            size_mb=size / 1048576.0,
+            metadata={
+                "title": meta.get("title") or None,
+                "author": meta.get("author") or None,
+                "creator": meta.get("creator") or None,
+                "producer": meta.get("producer") or None,
+                "created": meta.get("creationDate") or None,
+            },
+            # get_fonts 返回 (xref, ext, type, basefont, name, encoding, ...)
+            first_page_fonts=[f[3] for f in doc[0].get_fonts(full=False)] if doc.page_count else [],
+        )
+
+
+def _probe(path: str) -> SimpleNamespace:
+    st = os.stat(path)
+    return _probe_cached(path, st.st_mtime_ns, st.st_size)
+
+
+def _extract_strings(segment: bytes) -> List[str]:
+    """提取标记内容片段中的 (...) 字面字符串，反转义后按 latin-1 解码。"""
+    out: List[str] = []
+    for raw in _PAREN_STRING_RE.findall(segment):
+        text = raw.replace(b"\\(", b"(").replace(b"\\)", b")").replace(b"\\\\", b"\\").decode("latin-1").strip()
+        if text:
+            out.append(text)
+    return out
+
+
+def _open_marked_tail(buf: bytes) -> bytes:
+    """返回 buf 末尾尚未闭合的标记内容（自最后一个 EMC 之后的首个开标记起，最多 _MAX_ARTIFACT_CARRY 字节）。"""
+    # 正文匹配到首个 EMC 即止，因此最后一个 EMC 之前开始的标记内容不会再跨流匹配
+    last = buf.rfind(b"EMC")
+    start = last + 3 if last >= 0 else 0
+    openers = [i for i in (buf.find(b"/Artifact", start), buf.find(b"BDC", start)) if i >= 0]
+    if not openers:
+        return b""
+    # 普通标记内容（如 /Span BDC）可能一直延续到流末尾，截断以免续接内容无限增长
+    return buf[max(min(openers), len(buf) - _MAX_ARTIFACT_CARRY):]
+
+
+def _scan_artifacts(chunks: Iterable[bytes], headers: List[str], footers: List[str]) -> None:
+    """逐个内容流匹配 Artifact 页眉/页脚，直接在字节上匹配，仅解码命中的字符串片段。"""
+    carry = b""
+    for chunk in chunks:
+        buf = carry + chunk if carry else chunk
+        # 绝大多数内容流不含页眉/页脚标记：先用字节子串查找（C 层快速扫描）预筛，命中才走正则
+        if b"/Header" in buf or b"/Footer" in buf:
+            for pattern in (_ARTIFACT_RE, _SIMPLE_ARTIFACT_RE):
+                for m in pattern.finditer(buf):
+                    (headers if m.group("kind") == b"Header" else footers).extend(_extract_strings(m.group("body")))
+        carry = _open_marked_tail(buf)
+
+
+def _band_text_dicts(doc, page_num: int):
+    """读取一页的尺寸与页眉/页脚两条带状区域的文本字典；只在 fitz 调用期间持锁。"""
+    with FITZ_LOCK:
+        page = doc[page_num]
+        rect = page.rect
+        if rect.width <= 0 or rect.height <= 0:
+            del page
+            return rect.width, rect.height, ()
+        # 只提取页眉/页脚两条带状区域，跳过正文与图形内容的解析
+        bands = (
+            fitz.Rect(0, 0, rect.width, rect.height * 0.10),
+            fitz.Rect(0, rect.height * 0.90, rect.width, rect.height),
+        )
+        dicts = tuple(page.get_text("dict", clip=clip, flags=_BAND_TEXT_FLAGS) for clip in bands)
+        # Page 析构同样会调用 MuPDF，须在锁内释放
+        del page
+    return rect.width, rect.height, dicts
+
 
 class PdfAnalyzer:
     """集中式 PDF 分析器"""
@@ -24,18 +137,17 @@ class PdfAnalyzer:
     # --- 基础信息 ---
     def get_pdf_page_count(self, path: str) -> int:
         try:
-            reader = PdfReader(path)
-            return len(reader.pages)
-        except (FileNotFoundError, PdfReadError) as e:
+            return _probe(path).page_count
+        except _OPEN_ERRORS as e:
             logger.warning(f"[Page Count] Cannot read {path}: {e}")
         except Exception as e:
             logger.exception(f"[Page Count] Unexpected error for {path}: {e}")
         return 0
 
     def get_pdf_file_size_mb(self, path: str) -> float:
+        # 不在此处取整，显示处自行格式化（如 f"{v:.2f}"）
         try:
-            size_bytes = os.path.getsize(path)
-            return round(size_bytes / (1024 * 1024), 2)
+            return os.stat(path).st_size / 1048576.0
         except FileNotFoundError as e:
             logger.warning(f"[File Size] File not found: {path}: {e}")
         except Exception as e:
@@ -44,16 +156,8 @@ class PdfAnalyzer:
 
     def get_pdf_metadata(self, path: str) -> dict:
         try:
-            reader = PdfReader(path)
-            meta = reader.metadata
-            return {
-                "title": meta.title if meta else None,
-                "author": meta.author if meta else None,
-                "creator": meta.creator if meta else None,
-                "producer": meta.producer if meta else None,
-                "created": meta.get("/CreationDate", None) if meta else None,
-            }
-        except (FileNotFoundError, PdfReadError) as e:
+            return dict(_probe(path).metadata)
+        except _OPEN_ERRORS as e:
             logger.warning(f"[Metadata] Cannot extract from {path}: {e}")
         except Exception as e:
             logger.exception(f"[Metadata] Unexpected error for {path}: {e}")
@@ -62,18 +166,18 @@ class PdfAnalyzer:
     def get_pdf_fonts(self, path: str, pages: int = 1) -> dict:
         fonts: List[dict] = []
         try:
-            reader = PdfReader(path)
-            pages_to_check = min(pages, len(reader.pages))
-            for i in range(pages_to_check):
-                page = reader.pages[i]
-                page_fonts: List[str] = []
-                resources = page.get("/Resources", {})
-                if "/Font" in resources:
-                    font_dict = resources["/Font"]
-                    if hasattr(font_dict, "keys"):
-                        page_fonts = list(font_dict.keys())
-                fonts.append({"page": i + 1, "fonts": page_fonts})
-        except (FileNotFoundError, PdfReadError) as e:
+            if pages == 1:
+                probe = _probe(path)
+                if probe.page_count:
+                    fonts.append({"page": 1, "fonts": list(probe.first_page_fonts)})
+                return {"pages": fonts}
+            with FITZ_LOCK, fitz.open(path) as doc:
+                pages_to_check = min(pages, doc.page_count)
+                for i in range(pages_to_check):
+                    # get_fonts 返回 (xref, ext, type, basefont, name, encoding, ...)
+                    page_fonts = [f[3] for f in doc[i].get_fonts(full=False)]
+                    fonts.append({"page": i + 1, "fonts": page_fonts})
+        except _OPEN_ERRORS as e:
             logger.warning(f"[Fonts] Failed to read {path}: {e}")
         except Exception as e:
             logger.exception(f"[Fonts] Unexpected error in {path}: {e}")
@@ -82,81 +186,96 @@ class PdfAnalyzer:
     # --- Artifact 提取 ---
     def extract_artifact_headers_footers(self, path: str, max_pages: int = 10) -> dict:
         import pikepdf
-        from pikepdf import Name
-        import re
 
-        result = {"pages": []}
         try:
             with pikepdf.open(path) as pdf:
-                pages_to_scan = min(max_pages, len(pdf))
-                for i, page in enumerate(pdf.pages[:pages_to_scan]):
-                    content_obj = page.obj.get(Name('/Contents'))
-                    if content_obj is None:
-                        result["pages"].append({"page": i + 1, "header": [], "footer": []})
-                        continue
-                    if isinstance(content_obj, pikepdf.Array):
-                        content_bytes = b"".join([c.read_bytes() for c in content_obj])
-                    elif isinstance(content_obj, pikepdf.Stream):
-                        content_bytes = content_obj.read_bytes()
-                    else:
-                        content_bytes = b""
-                    text = content_bytes.decode('latin-1', errors='ignore')
-
-                    header_pattern = r"/Artifact\s*<<[^>]*?/Subtype\s*/Header[^>]*?>>\s*BDC([\s\S]*?)EMC"
-                    footer_pattern = r"/Artifact\s*<<[^>]*?/Subtype\s*/Footer[^>]*?>>\s*BDC([\s\S]*?)EMC"
-                    simple_header_pattern = r"BDC\s*<<[^>]*?/Subtype\s*/Header[^>]*?>>([\s\S]*?)EMC"
-                    simple_footer_pattern = r"BDC\s*<<[^>]*?/Subtype\s*/Footer[^>]*?>>([\s\S]*?)EMC"
-
-                    def _extract_strings(segment: str) -> List[str]:
-                        raw = re.findall(r"\((.*?)(?<!\\)\)", segment, re.DOTALL)
-                        out = [s.replace("\\(", "(").replace("\\)", ")").replace("\\\\", "\\") for s in raw]
-                        return [s.strip() for s in out if s.strip()]
-
-                    headers: List[str] = []
-                    footers: List[str] = []
-                    for pattern in [header_pattern, simple_header_pattern]:
-                        for seg in re.findall(pattern, text, re.DOTALL):
-                            headers.extend(_extract_strings(seg))
-                    for pattern in [footer_pattern, simple_footer_pattern]:
-                        for seg in re.findall(pattern, text, re.DOTALL):
-                            footers.extend(_extract_strings(seg))
-                    headers = list(set(headers))
-                    footers = list(set(footers))
-                    result["pages"].append({"page": i + 1, "header": headers, "footer": footers})
-            return result
+                return self._artifact_from_pike(pdf, max_pages)
         except Exception as e:
             logger.warning(f"[Artifact] Extraction failed for {path}: {e}")
-            return result
+            return {"pages": []}
+
+    def _artifact_from_pike(self, pdf, max_pages: int) -> dict:
+        import pikepdf
+        from pikepdf import Name
+
+        result = {"pages": []}
+        try:
+            pages_to_scan = min(max_pages, len(pdf.pages))
+            for i, page in enumerate(pdf.pages[:pages_to_scan]):
+                content_obj = page.obj.get(Name('/Contents'))
+                if content_obj is None:
+                    result["pages"].append({"page": i + 1, "header": [], "footer": []})
+                    continue
+                if isinstance(content_obj, pikepdf.Array):
+                    chunks = (c.read_bytes() for c in content_obj)
+                elif isinstance(content_obj, pikepdf.Stream):
+                    chunks = (content_obj.read_bytes(),)
+                else:
+                    chunks = ()
+
+                headers: List[str] = []
+                footers: List[str] = []
+                _scan_artifacts(chunks, headers, footers)
+                headers = list(dict.fromkeys(headers))
+                footers = list(dict.fromkeys(footers))
+                result["pages"].append({"page": i + 1, "header": headers, "footer": footers})
+        except Exception as e:
+            logger.warning(f"[Artifact] Extraction failed for {pdf.filename}: {e}")
+        return result
 
     # --- 启发式检测 ---
     def detect_headers_footers_heuristic(self, path: str, max_pages: int = 10) -> dict:
         try:
-            import fitz
-            doc = fitz.open(path)
+            with fitz_document(path) as doc:
+                return self._heuristic_from_fitz(doc, max_pages)
+        except Exception as e:
+            logger.warning(f"Heuristic header/footer detection failed: {e}")
+            return {"pages": []}
+
+    def _heuristic_from_fitz(self, doc, max_pages: int) -> dict:
+        try:
             results: Dict[str, Any] = {"pages": [], "header_candidates": [], "footer_candidates": []}
-            pages_to_analyze = min(max_pages, len(doc))
+            with FITZ_LOCK:
+                pages_to_analyze = min(max_pages, len(doc))
             all_text_blocks: List[Dict[str, Any]] = []
             all_texts: List[str] = []
+            inherited_pages: set = set()
+            prev_key = None
+            stable_count = 0
             for page_num in range(pages_to_analyze):
-                page = doc[page_num]
-                blocks = page.get_text("dict")
-                for block in blocks.get("blocks", []):
-                    if "lines" in block:
-                        for line in block["lines"]:
-                            for span in line.get("spans", []):
-                                txt = span.get("text", "").strip()
-                                if not txt:
-                                    continue
-                                all_texts.append(txt)
-                                all_text_blocks.append({
-                                    "page": page_num + 1,
-                                    "text": txt,
-                                    "bbox": span.get("bbox"),
-                                    "size": span.get("size", 0),
-                                    "font": span.get("font", "")
-                                })
+                page_width, page_height, band_dicts = _band_text_dicts(doc, page_num)
+                if page_width <= 0 or page_height <= 0:
+                    continue
+                page_spans: List[Dict[str, Any]] = []
+                for blocks in band_dicts:
+                    for block in blocks.get("blocks", []):
+                        if "lines" in block:
+                            for line in block["lines"]:
+                                for span in line.get("spans", []):
+                                    txt = span.get("text", "").strip()
+                                    if not txt:
+                                        continue
+                                    page_spans.append({
+                                        "page": page_num + 1,
+                                        "text": txt,
+                                        "bbox": span.get("bbox"),
+                                        "size": span.get("size", 0),
+                                        "font": span.get("font", "")
+                                    })
+                all_texts.extend(b["text"] for b in page_spans)
+                all_text_blocks.extend(page_spans)
+
+                # 页眉/页脚带文本连续多页完全一致：其余页沿用该页结果，不再逐页提取
+                key = (page_width, page_height, tuple(b["text"] for b in page_spans))
+                stable_count = stable_count + 1 if page_spans and key == prev_key else 0
+                prev_key = key
+                if stable_count >= _STABLE_PAGES:
+                    for rest in range(page_num + 1, pages_to_analyze):
+                        inherited_pages.add(rest + 1)
+                        all_texts.extend(b["text"] for b in page_spans)
+                        all_text_blocks.extend(dict(b, page=rest + 1) for b in page_spans)
+                    break
             if not all_text_blocks:
-                doc.close()
                 return results
 
             pages_data: Dict[int, List[Dict[str, Any]]] = {}
@@ -165,6 +284,8 @@ class PdfAnalyzer:
 
             # 统计候选项所需的聚合容器
             from collections import Counter, defaultdict
+            # 跨页重复次数一次性统计，候选判定时 O(1) 查询
+            text_counts = Counter(all_texts)
             header_occurrences: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
             footer_occurrences: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
 
@@ -178,41 +299,49 @@ class PdfAnalyzer:
                     labels.append("date")
                 return labels
 
+            # 各页尺寸一次性在锁内读取，后续判定不再调用 fitz
+            with FITZ_LOCK:
+                page_rects = {pn: doc[pn - 1].rect for pn in pages_data}
             for page_num in sorted(pages_data.keys()):
                 page_blocks = pages_data[page_num]
-                page_height = doc[page_num - 1].rect.height
-                page_width = doc[page_num - 1].rect.width
+                page_height = page_rects[page_num].height
+                page_width = page_rects[page_num].width
                 header_zone = page_height * 0.10
                 footer_zone = page_height * 0.90
                 headers: List[str] = []
                 footers: List[str] = []
-                for b in page_blocks:
-                    y0 = b["bbox"][1] if b.get("bbox") else 0
-                    text = b["text"]
-                    if len(text) < 2:
-                        continue
-                    if y0 < header_zone:
-                        if self._is_likely_header_footer(text, b.get("size", 0), b.get("font", ""), all_texts):
-                            headers.append(text)
+                # 提取已按带状区域裁剪；此处按 span 顶边再判定一次，与裁剪边缘相交的 span 以顶边为准
+                n = len(page_blocks)
+                y0s = np.fromiter((b["bbox"][1] if b.get("bbox") else 0 for b in page_blocks), dtype=np.float64, count=n)
+                long_enough = np.fromiter((len(b["text"]) >= 2 for b in page_blocks), dtype=bool, count=n)
+                header_mask = long_enough & (y0s < header_zone)
+                footer_mask = long_enough & (y0s > footer_zone)
+                for zone_mask, found, occurrences in (
+                    (header_mask, headers, header_occurrences),
+                    (footer_mask, footers, footer_occurrences),
+                ):
+                    for idx in np.flatnonzero(zone_mask):
+                        b = page_blocks[idx]
+                        text = b["text"]
+                        if self._is_likely_header_footer(text, b.get("size", 0), b.get("font", ""), text_counts):
+                            found.append(text)
                             # 记录候选的详细位置信息
-                            header_occurrences[text].append({
-                                "page": page_num,
-                                "bbox": b.get("bbox"),
-                                "width": page_width,
-                                "height": page_height,
-                            })
-                    elif y0 > footer_zone:
-                        if self._is_likely_header_footer(text, b.get("size", 0), b.get("font", ""), all_texts):
-                            footers.append(text)
-                            footer_occurrences[text].append({
+                            occurrences[text].append({
                                 "page": page_num,
                                 "bbox": b.get("bbox"),
                                 "width": page_width,
                                 "height": page_height,
                             })
-                headers = list(set(headers))
-                footers = list(set(footers))
-                results["pages"].append({"page": page_num, "headers": headers, "footers": footers})
+                # 按文本首次出现的 y 排序（一次遍历建表，避免排序时逐项线性查找）
+                y_by_text: Dict[str, float] = {}
+                for b, y0 in zip(page_blocks, y0s.tolist()):
+                    y_by_text.setdefault(b["text"], y0)
+                headers = sorted(dict.fromkeys(headers), key=y_by_text.get)
+                footers = sorted(dict.fromkeys(footers), key=y_by_text.get)
+                page_result = {"page": page_num, "headers": headers, "footers": footers}
+                if page_num in inherited_pages:
+                    page_result["inherited"] = True
+                results["pages"].append(page_result)
 
             # 构建候选列表（text + 代表性 bbox + repeating + labels + count）
             def _first_occ(occ_list: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -257,39 +386,53 @@ class PdfAnalyzer:
                         "height": occ0.get("height", 0),
                     }
                 })
-            doc.close()
             return results
         except Exception as e:
             logger.warning(f"Heuristic header/footer detection failed: {e}")
             return {"pages": []}
 
-    def _is_likely_header_footer(self, text: str, font_size: float, font_name: str, all_texts: List[str]) -> bool:
+    def _is_likely_header_footer(self, text: str, font_size: float, font_name: str, text_counts: Mapping[str, int]) -> bool:
         if not text or len(text.strip()) < 2:
             return False
         if text.isdigit() and len(text) <= 3:
             return False
         if len(text) > 100:
             return False
-        content_indicators = ['。', '，', '！', '？', '；', '：', '（', '）', '【', '】', '、']
-        if any(ch in text for ch in content_indicators):
+        if not _CONTENT_CHARS.isdisjoint(text):
             return False
-        if all_texts.count(text) < 2:
+        if text_counts.get(text, 0) < 2:
             return False
-        keywords = ['page', '第', '页', 'of', '证据', '日期', 'confidential', 'draft', 'final', 'version']
-        text_lower = text.lower()
-        if any(k in text_lower for k in keywords):
+        if _HEADER_FOOTER_KW_RE.search(text):
             return True
         if 0 < font_size < 16:
             return True
-        common_fonts = ['arial', 'helvetica', 'times', 'simsun', 'simhei']
-        if any(f in font_name.lower() for f in common_fonts):
+        font_lower = font_name.lower()
+        if any(f in font_lower for f in _COMMON_FONTS):
             return True
         return False
 
     # --- 融合输出 ---
     def extract_all_headers_footers(self, path: str, max_pages: int = 10) -> dict:
-        artifact_result = self.extract_artifact_headers_footers(path, max_pages)
-        heuristic_result = self.detect_headers_footers_heuristic(path, max_pages)
+        import pikepdf
+
+        try:
+            # 两个库各只打开一次，两种提取共用同一份已解析文档
+            with pikepdf.open(path) as pike_doc, fitz_document(path) as fitz_doc:
+                return self._extract_all_from_doc(pike_doc, fitz_doc, max_pages)
+        except Exception as e:
+            logger.warning(f"[Merge] Cannot open {path} with both backends, extracting separately: {e}")
+        return self._merge_results(
+            self.extract_artifact_headers_footers(path, max_pages),
+            self.detect_headers_footers_heuristic(path, max_pages),
+        )
+
+    def _extract_all_from_doc(self, pike_doc, fitz_doc, max_pages: int) -> dict:
+        return self._merge_results(
+            self._artifact_from_pike(pike_doc, max_pages),
+            self._heuristic_from_fitz(fitz_doc, max_pages),
+        )
+
+    def _merge_results(self, artifact_result: dict, heuristic_result: dict) -> dict:
         merged_result = {"pages": []}
         art_pages = {p["page"]: p for p in artifact_result.get("pages", [])}
         heu_pages = {p["page"]: p for p in heuristic_result.get("pages", [])}
@@ -310,18 +453,17 @@ class PdfAnalyzer:
 
     def _clean_text_list(self, items: List[str]) -> List[str]:
         out: List[str] = []
-        seen = set()
         for t in items:
-            if not t or len(t.strip()) < 2:
+            stripped = t.strip() if t else ""
+            if len(stripped) < 2:
                 continue
-            if t.strip().isdigit() and len(t.strip()) <= 3:
+            if stripped.isdigit() and len(stripped) <= 3:
                 continue
-            if len(t.strip()) > 100:
+            if len(stripped) > 100:
                 continue
-            if t not in seen:
-                seen.add(t)
-                out.append(t)
-        return out
+            out.append(t)
+        # 保序去重
+        return list(dict.fromkeys(out))
 
     # --- 汇总报告 ---
     def analyze(self, path: str, max_pages: int = 10) -> dict:
@@ -351,6 +493,37 @@ class PdfAnalyzer:
         return report
 
 
+# --- 批量探测 ---
+def _probe_one(path: str) -> dict:
+    analyzer = PdfAnalyzer()
+    return {
+        "path": path,
+        "page_count": analyzer.get_pdf_page_count(path),
+        "size_mb": analyzer.get_pdf_file_size_mb(path),
+        "metadata": analyzer.get_pdf_metadata(path),
+        "fonts": analyzer.get_pdf_fonts(path, pages=1),
+    }
+
+
+def batch_probe(paths: List[str], workers: Optional[int] = None) -> List[dict]:
+    """
+    批量探测多个 PDF 的基础信息（页数/大小/元数据/首页字体），按文件并行到进程池。
+    面向批量导入等调用方；单文件场景请继续使用 PdfAnalyzer 的对应方法。
+    返回顺序与 paths 一致；单个文件读取失败时对应字段为默认值，不影响其他文件。
+    """
+    if not paths:
+        return []
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        return [_probe_one(p) for p in paths]
+    # 调用方在界面线程（Qt 已起多个线程），fork 不安全，统一用 spawn；打包版需在入口调用 freeze_support
+    ctx = multiprocessing.get_context("spawn")
+    # 每个进程分到约 4 批，摊薄进程间通信开销
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as ex:
+        return list(ex.map(_probe_one, paths, chunksize=chunksize))
+
+
 def _cli_main():
     parser = argparse.ArgumentParser(description="Analyze PDF headers/footers and fonts")
     parser.add_argument("pdf", help="Path to PDF file")
@@ -368,7 +541,7 @@ def _cli_main():
     # 简要控制台输出
     print("\n=== PDF Analysis Report ===")
     print(f"Path:        {report['path']}")
-    print(f"Size (MB):   {report['size_mb']}")
+    print(f"Size (MB):   {report['size_mb']:.2f}")
     print(f"Pages:       {report['page_count']}")
     print(f"Metadata:    {report['metadata']}")
     print(f"Artifact H/F: H={report.get('has_structured_header')} F={report.get('has_structured_footer')}")
@@ -58,10 +58,6 @@ def _escape_pdf_text(text: str) -> str:
     """Escape backslashes and parentheses for PDF literal strings."""
     return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
 
-def _utf16be_hex_str(text: str) -> str:
-    """将字符串编码为UTF-16BE，并返回其十六进制表示形式。"""
-    return text.encode('utf-16be').hex()
-
 _DATE_FIELD_RE = re.compile(r"\{date(?::([^}]+))?\}")
 
 def _expand_placeholders(raw: str, *, page: int, total: int, source_path: str) -> str:
@@ -337,19 +333,26 @@ def process_pdfs_in_batch(
                         for page in pdf.pages:
                             _normalize_page_to_a4(page)
                             
+                    page_total = len(pdf.pages)
+
                     # 为非ASCII字体预先准备好字体资源
-                    # 这会一次性将字体复制到所有页面
-                    header_font_res_name = None
+                    # 这会一次性将字体复制到所有页面；载体只嵌入实际用到的字形，页码随页变化，数字全部带上
+                    header_font = None
                     if item.header_text and not _is_ascii(item.header_text):
                         cn_font_h = header_settings.get("structured_cn_font") if header_settings.get("structured_cn_fixed") else suggest_chinese_fallback_font(header_settings.get("font_name"))
-                        header_font_res_name = ensure_type0_font(pdf, cn_font_h)
+                        header_glyphs = _expand_placeholders(
+                            item.header_text, page=1, total=page_total, source_path=item.path
+                        ) + "0123456789"
+                        header_font = ensure_type0_font(pdf, cn_font_h, header_glyphs)
 
-                    footer_font_res_name = None
+                    footer_font = None
                     if item.footer_text and not _is_ascii(item.footer_text):
                         cn_font_f = footer_settings.get("structured_cn_font") if footer_settings.get("structured_cn_fixed") else suggest_chinese_fallback_font(footer_settings.get("font_name"))
-                        footer_font_res_name = ensure_type0_font(pdf, cn_font_f)
+                        footer_glyphs = _expand_placeholders(
+                            item.footer_text, page=1, total=page_total, source_path=item.path
+                        ) + "0123456789"
+                        footer_font = ensure_type0_font(pdf, cn_font_f, footer_glyphs)
 
-                    page_total = len(pdf.pages)
                     header_base_font = _map_to_base14(header_settings.get("font_name"))
                     footer_base_font = _map_to_base14(footer_settings.get("font_name"))
 
@@ -375,8 +378,7 @@ def process_pdfs_in_batch(
                                     float(header_settings.get("x", 72)),
                                     float(header_settings.get("y", 752)),
                                     subtype='Header', base_font=header_base_font, meta=hdr_meta)
-                            elif header_font_res_name:
-                                hex_bytes = _utf16be_hex_str(header_text_expanded)
+                            elif header_font:
                                 meta_str = (
                                     f" /DDTemplate ({_escape_pdf_text(item.header_text or '')})"
                                     f" /DDDateFmt ({_escape_pdf_text(header_settings.get('date_fmt', '%Y-%m-%d'))})"
@@ -384,9 +386,8 @@ def process_pdfs_in_batch(
                                     f" /DDUnit (pt) /DDVersion (1.0) /DDType (Header)"
                                 )
                                 content = (f"/Artifact << /Type /Pagination /Subtype /Header{meta_str} >> BDC "
-                                           f"BT /{header_font_res_name} {header_settings.get('font_size', 9)} Tf "
-                                           f"1 0 0 1 {header_settings.get('x', 72)} {header_settings.get('y', 752)} Tm "
-                                           f"<{hex_bytes}> Tj ET EMC\n")
+                                           f"BT 1 0 0 1 {header_settings.get('x', 72)} {header_settings.get('y', 752)} Tm "
+                                           f"{header_font.show_text(header_text_expanded, header_settings.get('font_size', 9))} ET EMC\n")
                                 page.add_content(content)
 
                         if item.footer_text and mode != 'remove':
@@ -408,8 +409,7 @@ def process_pdfs_in_batch(
                                     float(footer_settings.get("x", 72)),
                                     float(footer_settings.get("y", 40)),
                                     subtype='Footer', base_font=footer_base_font, meta=ftr_meta)
-                            elif footer_font_res_name:
-                                hex_bytes = _utf16be_hex_str(footer_text_expanded)
+                            elif footer_font:
                                 meta_str = (
                                     f" /DDTemplate ({_escape_pdf_text(item.footer_text or '')})"
                                     f" /DDDateFmt ({_escape_pdf_text(footer_settings.get('date_fmt', '%Y-%m-%d'))})"
@@ -417,9 +417,8 @@ def process_pdfs_in_batch(
                                     f" /DDUnit (pt) /DDVersion (1.0) /DDType (Footer)"
                                 )
                                 content = (f"/Artifact << /Type /Pagination /Subtype /Footer{meta_str} >> BDC "
-                                           f"BT /{footer_font_res_name} {footer_settings.get('font_size', 9)} Tf "
-                                           f"1 0 0 1 {footer_settings.get('x', 72)} {footer_settings.get('y', 40)} Tm "
-                                           f"<{hex_bytes}> Tj ET EMC\n")
+                                           f"BT 1 0 0 1 {footer_settings.get('x', 72)} {footer_settings.get('y', 40)} Tm "
+                                           f"{footer_font.show_text(footer_text_expanded, footer_settings.get('font_size', 9))} ET EMC\n")
                                 page.add_content(content)
                     
                     # 确保 MarkInfo 设置
@@ -498,23 +497,22 @@ def _optimize_memory_for_large_pdf(input_path: str, max_memory_mb: int = 500) ->
         if file_size_mb <= max_memory_mb:
             return input_path  # 文件不大，直接返回
         
-        # 文件过大，创建压缩版本
-        doc = fitz.open(input_path)
-        
         # 创建临时压缩文件
         import tempfile
         temp_fd, temp_path = tempfile.mkstemp(suffix=".pdf", prefix="docdeck_compressed_")
         os.close(temp_fd)
-        
-        # 压缩PDF（降低分辨率，移除不必要的元数据）
-        doc.save(
-            temp_path,
-            garbage=4,  # 最大垃圾回收
-            deflate=True,  # 使用deflate压缩
-            clean=True,  # 清理元数据
-            linear=True  # 线性化PDF
-        )
-        doc.close()
+
+        # 文件过大，创建压缩版本（在处理线程中运行，须持有 fitz 锁）
+        from fitz_lock import FITZ_LOCK
+        with FITZ_LOCK, fitz.open(input_path) as doc:
+            # 压缩PDF（降低分辨率，移除不必要的元数据）
+            doc.save(
+                temp_path,
+                garbage=4,  # 最大垃圾回收
+                deflate=True,  # 使用deflate压缩
+                clean=True,  # 清理元数据
+                linear=True  # 线性化PDF
+            )
         
         logger.info(f"大文件 {input_path} ({file_size_mb:.1f}MB) 已压缩到 {temp_path}")
         return temp_path
@@ -1,6 +1,8 @@
 import fitz  # PyMuPDF
 from typing import Optional, TypedDict
 
+from fitz_lock import FITZ_LOCK
+
 # 使用您项目中统一的logger实例
 from logger import logger, log_and_display_error
 
@@ -44,15 +46,18 @@ def unlock_pdf(input_path: str, output_path: str, password: str = '') -> UnlockR
         }
 
     try:
-        # 打开PDF文件
-        doc = fitz.open(input_path)
+        # 打开PDF文件（PyMuPDF 非线程安全，每次 fitz 调用都在锁内进行，日志与错误提示在锁外）
+        with FITZ_LOCK:
+            doc = fitz.open(input_path)
+            encrypted = doc.is_encrypted
+            authenticated = not encrypted or doc.authenticate(password)
 
         # 检查PDF是否加密。如果是，则尝试验证密码。
-        if doc.is_encrypted:
+        if encrypted:
             logger.info(f"文件 '{input_path}' 已加密，尝试解锁...")
 
             # 使用提供的密码进行验证。
-            if not doc.authenticate(password):
+            if not authenticated:
                 # 如果验证失败，说明密码错误或缺失。
                 raise WrongPasswordError("提供的密码不正确或缺失。")
 
@@ -61,7 +66,8 @@ def unlock_pdf(input_path: str, output_path: str, password: str = '') -> UnlockR
             logger.info(f"文件 '{input_path}' 未加密，将直接进行保存。")
 
         # 保存文档。PyMuPDF的save方法会自动移除加密。
-        doc.save(output_path)
+        with FITZ_LOCK:
+            doc.save(output_path)
         
         logger.info(f"文件 '{input_path}' 成功处理，输出保存到: {output_path}")
         
@@ -94,9 +100,10 @@ def unlock_pdf(input_path: str, output_path: str, password: str = '') -> UnlockR
     
     finally:
         # 确保文档对象在使用后被关闭
-        if doc:
+        if doc is not None:  # Document 的真值判断会读取页数，这里只判空
             try:
-                doc.close()
+                with FITZ_LOCK:
+                    doc.close()
                 logger.debug(f"成功关闭文档: {input_path}") # 关闭日志级别可以设为DEBUG
             except Exception as close_error:
                 logger.error(f"关闭文档 '{input_path}' 时发生错误: {close_error}")
\ No newline at end of file
@@ -1,6 +1,25 @@
+__all__ = [
+    "HEADER_SAFE_MIN_Y",
+    "FOOTER_SAFE_MAX_Y",
+    "PRINT_MARGIN_LIMIT",
+    "SAFE_HEADER_Y",
+    "SAFE_FOOTER_Y",
+    "is_within_header_region",
+    "is_within_footer_region",
+    "is_out_of_print_safe_area",
+    "suggest_safe_header_y",
+    "suggest_safe_footer_y",
+    "estimate_text_width",
+    "get_aligned_x_position",
+    "estimate_standard_header_width",
+]
+
 HEADER_SAFE_MIN_Y = 720  # 792 pt - 72 pt (top safe area)
 FOOTER_SAFE_MAX_Y = 72   # bottom safe area
 PRINT_MARGIN_LIMIT = 12  # within 12 pt from edge is risky for print
+SAFE_HEADER_Y = 752      # 792 - 40
+SAFE_FOOTER_Y = 40       # 40 pt from bottom
+_TOP_PRINT_LIMIT = 792 - PRINT_MARGIN_LIMIT
 
 
 def is_within_header_region(y: float, page_height: float = 792) -> bool:
@@ -42,7 +61,7 @@ def is_out_of_print_safe_area(y: float, top: bool = True) -> bool:
         bool: True if out of safe margin area.
     """
     if top:
-        return y > 792 - PRINT_MARGIN_LIMIT
+        return y > _TOP_PRINT_LIMIT
     else:
         return y < PRINT_MARGIN_LIMIT
 
@@ -54,7 +73,7 @@ def suggest_safe_header_y() -> float:
     Returns:
         float: Suggested Y position for header.
     """
-    return 752  # 792 - 40
+    return SAFE_HEADER_Y
 
 
 def suggest_safe_footer_y() -> float:
@@ -64,7 +83,7 @@ def suggest_safe_footer_y() -> float:
     Returns:
         float: Suggested Y position for footer.
     """
-    return 40
+    return SAFE_FOOTER_Y
 
 def estimate_text_width(text: str, font_size: float) -> float:
     """
@@ -0,0 +1,48 @@
+"""
+测试公共夹具：离屏 QApplication 与临时 PDF 文件
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# 添加项目路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """生成简单的多页 A4 PDF，返回路径"""
+    import fitz
+
+    def _make(name: str = "sample.pdf", pages: int = 3, text: str = "Body text") -> str:
+        path = tmp_path / name
+        doc = fitz.open()
+        for i in range(pages):
+            page = doc.new_page(width=595, height=842)
+            page.insert_text((72, 400), f"{text} {i + 1}", fontsize=12)
+        doc.save(str(path))
+        doc.close()
+        return str(path)
+
+    return _make
+
+
+def spin_event_loop(ms: int = 100):
+    """运行事件循环 ms 毫秒，让定时器与排队信号得到处理"""
+    from PySide6.QtCore import QEventLoop, QTimer
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
@@ -0,0 +1,88 @@
+"""
+pdf_analyzer：跨内容流的 Artifact 页眉/页脚匹配
+"""
+
+import pdf_analyzer
+from pdf_analyzer import _open_marked_tail, _scan_artifacts
+
+
+def _scan(chunks):
+    headers, footers = [], []
+    _scan_artifacts(chunks, headers, footers)
+    return headers, footers
+
+
+def test_artifact_in_single_stream():
+    stream = b"q /Artifact << /Type /Pagination /Subtype /Header >> BDC BT (Title) Tj ET EMC Q"
+    assert _scan([stream]) == (["Title"], [])
+
+
+def test_header_body_split_across_streams():
+    chunks = [
+        b"q BT (Body) Tj ET /Artifact << /Type /Pagination /Subtype /Header >> BDC BT (Hel",
+        b"lo) Tj ET EMC Q",
+    ]
+    assert _scan(chunks) == (["Hello"], [])
+
+
+def test_footer_opener_split_from_subtype():
+    chunks = [
+        b"BT (Body) Tj ET /Artifact << /Type /Pagination",
+        b" /Subtype /Footer >> BDC BT (Page 1) Tj ET EMC",
+        b"q Q",
+    ]
+    assert _scan(chunks) == ([], ["Page 1"])
+
+
+def test_closed_artifact_is_not_matched_twice():
+    chunks = [
+        b"/Artifact << /Subtype /Header >> BDC (H) Tj EMC",
+        b"BT (Body) Tj ET",
+    ]
+    assert _scan(chunks) == (["H"], [])
+
+
+def test_carry_is_bounded_for_long_marked_content():
+    buf = b"/Span << /MCID 0 >> BDC " + b"BT (x) Tj ET " * 10000
+    tail = _open_marked_tail(buf)
+    assert len(tail) == pdf_analyzer._MAX_ARTIFACT_CARRY
+    assert _open_marked_tail(b"BT (x) Tj ET EMC") == b""
+
+
+def test_artifact_after_long_span_still_matches_across_streams():
+    chunks = [
+        b"/Span << /MCID 0 >> BDC " + b"BT (x) Tj ET " * 10000
+        + b"/Artifact << /Subtype /Footer >> BDC BT (Fo",
+        b"oter) Tj ET EMC",
+    ]
+    assert _scan(chunks) == ([], ["Footer"])
+
+
+def test_batch_probe_serial_and_process_pool_agree(make_pdf, tmp_path):
+    paths = [make_pdf(f"f{i}.pdf", pages=i + 1) for i in range(3)]
+    paths.append(str(tmp_path / "missing.pdf"))
+
+    serial = pdf_analyzer.batch_probe(paths, workers=1)
+    pooled = pdf_analyzer.batch_probe(paths, workers=2)
+    assert [r["path"] for r in pooled] == paths
+    assert [r["page_count"] for r in pooled] == [1, 2, 3, 0]
+    assert pooled == serial
+    assert pdf_analyzer.batch_probe([]) == []
+
+
+def test_bulk_import_uses_batch_probe(make_pdf, monkeypatch):
+    import controller
+
+    paths = [make_pdf(f"f{i}.pdf", pages=2) for i in range(3)]
+    calls = []
+
+    def _batch(ps):
+        calls.append(list(ps))
+        return pdf_analyzer.batch_probe(ps, workers=1)
+
+    monkeypatch.setattr(controller, "_BATCH_PROBE_MIN_FILES", 2)
+    monkeypatch.setattr(controller, "batch_probe", _batch)
+    monkeypatch.setattr(controller, "get_recommended_fonts", lambda ps: [])
+    items = controller.ProcessingController().handle_file_import(paths)
+    assert calls == [paths]
+    assert [i.page_count for i in items] == [2, 2, 2]
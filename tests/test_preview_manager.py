@@ -0,0 +1,157 @@
+"""
+PreviewManager：防抖与后台渲染路径
+"""
+
+from PySide6.QtCore import QThreadPool
+
+from conftest import spin_event_loop
+
+
+def _wait_for_preview(window, rounds: int = 20):
+    """等防抖定时器触发、渲染线程完成并把结果送回界面线程"""
+    for _ in range(rounds):
+        spin_event_loop(50)
+        window.preview._render_pool.waitForDone(5000)
+        QThreadPool.globalInstance().waitForDone(5000)
+        pixmap = window.pdf_preview_canvas.pixmap()
+        if pixmap is not None and not pixmap.isNull():
+            return pixmap
+    return None
+
+
+def _make_window(qapp):
+    from ui.main_window import MainWindow
+    window = MainWindow()
+    window.show()
+    return window
+
+
+def test_preview_renders_after_import_and_event_loop(qapp, make_pdf):
+    """导入后表格重新填充会把当前行重置为 -1，延迟的刷新仍应渲染所选文件"""
+    window = _make_window(qapp)
+    try:
+        window._process_imported_paths([make_pdf()])
+        window.file_table.selectRow(0)
+        pixmap = _wait_for_preview(window)
+        assert pixmap is not None, window.pdf_preview_canvas.text()
+        assert pixmap.width() > 0 and pixmap.height() > 0
+    finally:
+        window.close()
+
+
+def test_update_preview_is_debounced(qapp, make_pdf):
+    """连续多次请求只渲染一次"""
+    window = _make_window(qapp)
+    try:
+        window._process_imported_paths([make_pdf()])
+        window.file_table.selectRow(0)
+        _wait_for_preview(window)
+
+        renders = []
+        preview = window.preview
+        original = preview.update_pdf_content_preview
+
+        def counting(*args, **kwargs):
+            renders.append(args)
+            return original(*args, **kwargs)
+
+        preview.update_pdf_content_preview = counting
+        for _ in range(5):
+            preview.update_preview()
+        assert renders == []
+        spin_event_loop(400)
+        assert len(renders) == 1
+    finally:
+        window.close()
+
+
+def test_stale_render_results_are_dropped(qapp, make_pdf):
+    """序号落后的渲染结果不应覆盖画布"""
+    window = _make_window(qapp)
+    try:
+        window._process_imported_paths([make_pdf()])
+        window.file_table.selectRow(0)
+        pixmap = _wait_for_preview(window)
+        assert pixmap is not None
+        key = pixmap.cacheKey()
+
+        preview = window.preview
+        preview._on_render_failed(preview._render_seq - 1, "stale")
+        assert window.pdf_preview_canvas.pixmap().cacheKey() == key
+    finally:
+        window.close()
+
+
+def test_invalidate_does_not_wait_for_fitz_lock(qapp, make_pdf):
+    """界面线程丢弃句柄时不等待 FITZ_LOCK，句柄留待之后在锁内关闭"""
+    import threading
+    from fitz_lock import FITZ_LOCK
+
+    window = _make_window(qapp)
+    try:
+        window._process_imported_paths([make_pdf()])
+        window.file_table.selectRow(0)
+        assert _wait_for_preview(window) is not None
+        preview = window.preview
+        assert preview._doc_cache
+
+        held, release = threading.Event(), threading.Event()
+
+        def _hold():
+            with FITZ_LOCK:
+                held.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=_hold)
+        holder.start()
+        held.wait(5)
+        try:
+            preview.invalidate()
+            assert not preview._doc_cache
+            assert preview._retired_handles
+        finally:
+            release.set()
+            holder.join()
+
+        preview._close_retired()
+        assert not preview._retired_handles
+    finally:
+        window.close()
+
+
+def _write_header_pdf(path: str, text: str):
+    """首页顶部带文字的单页 PDF（预览只显示页眉/页脚条带）"""
+    import fitz
+    doc = fitz.open()
+    page = doc.new_page(width=595, height=842)
+    page.insert_text((72, 40), text, fontsize=24)
+    doc.save(path)
+    doc.close()
+
+
+def test_file_rewritten_in_place_is_rerendered(qapp, tmp_path):
+    """同一路径的文件被改写后，预览显示新内容并关闭旧句柄"""
+    path = str(tmp_path / "rewritten.pdf")
+    _write_header_pdf(path, "First version")
+    window = _make_window(qapp)
+    try:
+        window._process_imported_paths([path])
+        window.file_table.selectRow(0)
+        first = _wait_for_preview(window)
+        assert first is not None
+        first_image = first.toImage()
+        preview = window.preview
+        (old_key, old_entry), = preview._doc_cache.items()
+
+        _write_header_pdf(path, "Second, longer version")
+        window.pdf_preview_canvas.clear()
+        preview.update_preview()
+        second = _wait_for_preview(window)
+        assert second is not None
+        assert second.toImage() != first_image
+
+        assert list(preview._doc_cache) != [old_key]
+        assert all(key[0] == path for key in preview._doc_cache)
+        assert old_entry["fitz"].is_closed
+    finally:
+        window.close()
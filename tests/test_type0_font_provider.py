@@ -0,0 +1,123 @@
+"""
+type0_font_provider：载体子集选择、编码与缓存
+"""
+
+import os
+import re
+from io import BytesIO
+
+import fitz
+import pikepdf
+import pytest
+import reportlab
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+import type0_font_provider as t0
+
+_VERA = os.path.join(os.path.dirname(reportlab.__file__), "fonts", "Vera.ttf")
+_FONT = "DocDeckTestVera"
+
+
+@pytest.fixture
+def vera(monkeypatch):
+    """以 ReportLab 自带的 Vera.ttf 作为已注册字体，并隔离载体缓存"""
+    pdfmetrics.registerFont(TTFont(_FONT, _VERA))
+    monkeypatch.setattr(t0, "_REGISTERED", {_FONT})
+    monkeypatch.setattr(t0, "_FONT_CARRIER_CACHE", type(t0._FONT_CARRIER_CACHE)())
+    created = []
+    original = t0._create_font_carrier_pdf
+
+    def _create(font_name, glyphs=""):
+        created.append(glyphs)
+        return original(font_name, glyphs)
+
+    monkeypatch.setattr(t0, "_create_font_carrier_pdf", _create)
+    return created
+
+
+def _target_pdf(pages: int = 2) -> pikepdf.Pdf:
+    pdf = pikepdf.new()
+    for _ in range(pages):
+        pdf.add_blank_page(page_size=(595, 842))
+    return pdf
+
+
+def _page_text(pdf: pikepdf.Pdf, text: str, font: t0.Type0Font) -> str:
+    """把 text 写到第一页后保存，用 fitz 按 ToUnicode 读回"""
+    ops = f"BT 1 0 0 1 72 700 Tm {font.show_text(text, 12)} ET\n".encode("latin-1")
+    pdf.pages[0].contents_add(pikepdf.Stream(pdf, ops))
+    buf = BytesIO()
+    pdf.save(buf)
+    with fitz.open(stream=buf.getvalue(), filetype="pdf") as doc:
+        return doc[0].get_text().strip()
+
+
+def test_carrier_ttf_subset_is_copied_not_helvetica(vera):
+    pdf = _target_pdf()
+    font = t0.ensure_type0_font(pdf, _FONT, "Page 12")
+    assert font is not None and font.res_names == ("TTF1",)
+    copied = pdf.Root.Pages.Resources.Font.TTF1
+    assert str(copied.BaseFont).endswith("+BitstreamVeraSans-Roman")
+    assert "/FontDescriptor" in copied and "/ToUnicode" in copied
+
+
+def test_text_round_trips_through_to_unicode(vera):
+    pdf = _target_pdf()
+    text = "Page 3 of 9"
+    font = t0.ensure_type0_font(pdf, _FONT, text + "0123456789")
+    assert _page_text(pdf, text, font) == text
+
+
+def test_carrier_is_cached_per_glyph_set(vera):
+    first = t0.ensure_type0_font(_target_pdf(), _FONT, "abc")
+    second = t0.ensure_type0_font(_target_pdf(), _FONT, "cab ")
+    assert vera == ["abc"]
+    assert first.codes == second.codes
+
+    t0.ensure_type0_font(_target_pdf(), _FONT, "xyz")
+    assert vera == ["abc", "xyz"]
+
+
+def test_same_document_reuses_ensured_font(vera):
+    pdf = _target_pdf()
+    font = t0.ensure_type0_font(pdf, _FONT, "abc")
+    assert t0.ensure_type0_font(pdf, _FONT, "abc") is font
+    assert vera == ["abc"]
+
+
+def test_prewarm_registers_each_font_once(monkeypatch):
+    calls = []
+    import font_manager
+    monkeypatch.setattr(font_manager, "register_font_safely", lambda name: calls.append(name) or True)
+    monkeypatch.setattr(t0, "_REGISTERED", set())
+    t0.prewarm_type0_fonts(["SimSun", "SimSun", ""])
+    t0.prewarm_type0_fonts(["SimSun"])
+    assert calls == ["SimSun"]
+
+
+def test_show_text_switches_subsets():
+    font = t0.Type0Font(("TTF1", "TTF2"), {"a": (0, 0x61), "字": (1, 0x01)})
+    ops = font.show_text("a字a?", 9)
+    assert ops == "/TTF1 9 Tf <61> Tj /TTF2 9 Tf <01> Tj /TTF1 9 Tf <6100> Tj"
+    assert re.fullmatch(r"(/TTF\d 9 Tf <[0-9a-f]+> Tj ?)+", ops)
+
+
+@pytest.mark.parametrize("fresh_carrier", [False, True])
+def test_reprocessing_output_reuses_embedded_subset(vera, fresh_carrier):
+    """再次处理本工具的输出时复用已嵌入的子集，不再新增 /TTFn"""
+    pdf = _target_pdf()
+    first = t0.ensure_type0_font(pdf, _FONT, "Page 12")
+    buf = BytesIO()
+    pdf.save(buf)
+    if fresh_carrier:
+        # 载体被淘汰后重新生成，子集数据相同，仍应识别为同一字体
+        t0._FONT_CARRIER_CACHE.clear()
+
+    buf.seek(0)
+    with pikepdf.open(buf) as again:
+        second = t0.ensure_type0_font(again, _FONT, "Page 12")
+        assert second.res_names == first.res_names
+        for page in again.pages:
+            fonts = t0._effective_resources(page.obj).Font
+            assert [str(k) for k in fonts.keys()] == ["/TTF1"]
@@ -1,118 +1,374 @@
 # type0_font_provider.py
 """
-此模块负责为PDF文档提供 Type0 字体资源。
+此模块负责为PDF文档提供可显示中文等非 ASCII 文本的嵌入字体资源。
 
 核心功能是 `ensure_type0_font`，它采用“载体PDF”策略：
-1. 使用 ReportLab 在内存中生成一个包含特定中文字体的单页PDF。ReportLab 会负责正确地
-   构建和嵌入 Type0 字体描述符、CIDFont、ToUnicode CMap 等复杂对象。
-2. 使用 pikepdf 打开这个“载体PDF”，并将其中的字体资源复制到目标PDF文档中。
-3. 返回在目标PDF中可用的字体资源名称。
+1. 使用 ReportLab 在内存中生成一个单页PDF，用指定的 TTF 字体画出需要的全部字符。ReportLab 会
+   嵌入只含这些字形的 TrueType 子集（每个子集最多 256 个单字节编码），并附带 ToUnicode CMap。
+2. 使用 pikepdf 打开这个“载体PDF”，挑出该 TTF 的子集字体（跳过 ReportLab 页面初始的 Helvetica），
+   复制到目标PDF文档中。
+3. 返回 `Type0Font`：各子集在目标PDF中的资源名，以及由 ToUnicode 得到的字符编码表，
+   调用方用 `show_text` 生成按子集切换字体的 Tf/Tj 操作序列。
 
-这种方法避免了手动构造 Type0 字体的复杂性，稳定可靠。
+这种方法避免了手动构造嵌入字体的复杂性，稳定可靠。
 """
 
-from typing import Dict, Optional
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 import pikepdf
 from pikepdf import Name
-from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from io import BytesIO
 
 from logger import logger
-from font_manager import register_font_safely
+# reportlab 与 font_manager（连带 matplotlib、fitz）只在首次生成载体时导入，不拖慢导入本模块的启动路径
 
-# 缓存已创建的字体载体PDF，避免重复生成
-_FONT_CARRIER_CACHE: Dict[str, bytes] = {}
+CarrierKey = Tuple[str, FrozenSet[str]]
 
+# 载体中始终绘制的字符，保证字形集合为空时也会嵌入字体
+_BASE_GLYPHS = "字"
 
-def _create_font_carrier_pdf(font_name: str) -> Optional[bytes]:
+# 缓存已解析的字体载体，键为 (字体名, 字形集合)，值为 (载体PDF, 子集列表)，避免重复生成和重复解析；
+# 读路径无锁，只在写入时加锁。字形集合随页眉页脚文本变化，按写入顺序限制条目数
+_FONT_CARRIER_CACHE: "OrderedDict[CarrierKey, tuple]" = OrderedDict()
+_FONT_CARRIER_CACHE_MAX = 32
+_FONT_CARRIER_LOCK = threading.Lock()
+
+# 本进程内已由本模块注册到 ReportLab 的字体，载体缓存淘汰后重建时不再重复注册
+_REGISTERED: Set[str] = set()
+
+# 常用的 PDF 名字对象只构造一次，避免在逐页循环中反复创建
+_N_RES = Name('/Resources')
+_N_FONT = Name('/Font')
+_N_PARENT = Name('/Parent')
+_N_BASE_FONT = Name('/BaseFont')
+_N_TO_UNICODE = Name('/ToUnicode')
+_N_FONT_DESCRIPTOR = Name('/FontDescriptor')
+
+# ToUnicode CMap 中的单字节映射：bfchar 为 <code> <unicode>，bfrange 为 <lo> <hi> <unicode起点>
+_BFCHAR_RE = re.compile(rb"<([0-9A-Fa-f]{2})>\s*<([0-9A-Fa-f]+)>")
+_BFRANGE_RE = re.compile(rb"<([0-9A-Fa-f]{2})>\s*<([0-9A-Fa-f]{2})>\s*<([0-9A-Fa-f]+)>")
+_BFCHAR_BLOCK_RE = re.compile(rb"beginbfchar(.*?)endbfchar", re.DOTALL)
+_BFRANGE_BLOCK_RE = re.compile(rb"beginbfrange(.*?)endbfrange", re.DOTALL)
+
+@lru_cache(maxsize=128)
+def _ttf_name(i: int) -> Name:
+    return Name(f"/TTF{i}")
+
+# 每个目标PDF已嵌入字体的记录 {(font_name, 字形集合): (Type0Font, 载体PDF)}，挂在 Pdf 对象自身上，随文档一同释放
+# 持有载体引用是因为 copy_foreign 的流数据在保存时才读取，载体被缓存淘汰后仍需可用
+# （pikepdf.Pdf 不支持弱引用，无法用 id(pdf) + weakref.finalize 管理外部字典）
+_ENSURED_ATTR = "_docdeck_type0_fonts"
+
+
+class Type0Font:
+    """目标PDF中可用的载体字体：各子集的资源名（不含 '/'）与 字符 -> (子集序号, 单字节编码) 表。"""
+
+    __slots__ = ("res_names", "codes")
+
+    def __init__(self, res_names: Tuple[str, ...], codes: Dict[str, Tuple[int, int]]):
+        self.res_names = res_names
+        self.codes = codes
+
+    def show_text(self, text: str, font_size) -> str:
+        """返回在当前文本位置绘制 text 的 Tf/Tj 操作序列；跨子集时切换字体，缺失的字符以 .notdef（编码 0）占位。"""
+        ops: List[str] = []
+        run_subset, run = 0, bytearray()
+        for ch in text:
+            subset, code = self.codes.get(ch, (0, 0))
+            if subset != run_subset and run:
+                ops.append(f"/{self.res_names[run_subset]} {font_size} Tf <{run.hex()}> Tj")
+                run = bytearray()
+            run_subset = subset
+            run.append(code)
+        if run:
+            ops.append(f"/{self.res_names[run_subset]} {font_size} Tf <{run.hex()}> Tj")
+        return " ".join(ops)
+
+
+def _ensure_registered(font_name: str) -> bool:
+    """把字体注册到 ReportLab（解析 TTF 是生成载体最耗时的一步），每个字体只注册一次。"""
+    if font_name in _REGISTERED:
+        return True
+    from font_manager import register_font_safely
+    if not register_font_safely(font_name):
+        logger.error(f"[Type0] 字体 '{font_name}' 注册失败，无法创建字体载体。")
+        return False
+    _REGISTERED.add(font_name)
+    return True
+
+
+def _create_font_carrier_pdf(font_name: str, glyphs: str = "") -> Optional[BytesIO]:
     """
     使用 ReportLab 创建一个包含指定字体的单页PDF。
-    这个PDF被称为“字体载体”，因为它包含了所有需要的 Type0 字体描述符。
+    这个PDF被称为“字体载体”：`glyphs` 中的字符一次画出，嵌入的子集恰好覆盖实际输出。
+    返回已回到起始位置的 BytesIO，直接交给 pikepdf 读取，避免 getvalue() 的整段拷贝。
     """
-    if not register_font_safely(font_name):
-        logger.error(f"[Type0] 字体 '{font_name}' 注册失败，无法创建字体载体。")
+    from reportlab.pdfgen import canvas
+
+    if not _ensure_registered(font_name):
         return None
-    
+
     try:
         packet = BytesIO()
         can = canvas.Canvas(packet, pagesize=(100, 100))
         can.setFont(font_name, 10)
-        # 写入一个常见的汉字来强制嵌入字体信息
-        can.drawString(10, 50, "字")
+        # 写入一个常见的汉字来强制嵌入字体信息，并一次画出所有需要的字形
+        can.drawString(10, 50, _BASE_GLYPHS + glyphs)
         can.save()
-        return packet.getvalue()
+        packet.seek(0)
+        return packet
     except Exception as e:
         logger.error(f"[Type0] 创建字体载体PDF时出错: {e}", exc_info=True)
         return None
 
-def ensure_type0_font(pdf: pikepdf.Pdf, font_name: str) -> Optional[str]:
+def _carrier_key(font_name: str, glyphs: str) -> CarrierKey:
+    """载体缓存键：字体名 + 去掉基础字符与空白后的字形集合。"""
+    return font_name, frozenset(c for c in glyphs if not c.isspace()) - frozenset(_BASE_GLYPHS)
+
+def _face_name(font_name: str) -> Optional[str]:
+    """ReportLab 中已注册 TTF 的 PostScript 名（子集的 /BaseFont 为 /XXXXXX+<该名>）。"""
+    from reportlab.pdfbase import pdfmetrics
+    try:
+        name = pdfmetrics.getFont(font_name).face.name
+    except (KeyError, AttributeError):
+        return None
+    return name.decode("latin-1") if isinstance(name, bytes) else str(name)
+
+def _unicode_codes(to_unicode: bytes) -> Dict[str, int]:
+    """解析 ToUnicode CMap 的单字节映射，返回 字符 -> 编码；映射到 U+0000 的 .notdef 编码跳过。"""
+    codes: Dict[str, int] = {}
+
+    def _add(code: int, dst: bytes):
+        text = bytes.fromhex(dst.decode("ascii")).decode("utf-16-be", errors="ignore")
+        if len(text) == 1 and text != "\0":
+            codes.setdefault(text, code)
+
+    for block in _BFCHAR_BLOCK_RE.findall(to_unicode):
+        for code, dst in _BFCHAR_RE.findall(block):
+            _add(int(code, 16), dst)
+    for block in _BFRANGE_BLOCK_RE.findall(to_unicode):
+        for lo, hi, dst in _BFRANGE_RE.findall(block):
+            start = int(dst, 16)
+            for offset in range(int(hi, 16) - int(lo, 16) + 1):
+                _add(int(lo, 16) + offset, b"%04X" % (start + offset))
+    return codes
+
+def _carrier_subsets(carrier_pdf: pikepdf.Pdf, font_name: str) -> List[tuple]:
+    """
+    挑出载体页面上属于该 TTF 的子集字体，按子集序号排序，返回 [(字体对象, 字符->编码), ...]。
+    ReportLab 页面初始字体 /F1 是未嵌入的标准 Helvetica，必须跳过；子集资源名形如 /F2+0、/F2+1。
+    """
+    face = _face_name(font_name)
+    fonts = carrier_pdf.pages[0].obj.get(_N_RES, {}).get(_N_FONT, {})
+    found = []
+    for key, font_obj in fonts.items():
+        to_unicode = font_obj.get(_N_TO_UNICODE)
+        if _N_FONT_DESCRIPTOR not in font_obj or not isinstance(to_unicode, pikepdf.Stream):
+            continue
+        base = str(font_obj.get(_N_BASE_FONT, "")).lstrip("/")
+        if face is not None and base.split("+", 1)[-1] != face:
+            continue
+        index = int(key.rsplit("+", 1)[1]) if "+" in key else 0
+        found.append((index, font_obj, _unicode_codes(to_unicode.read_bytes())))
+    found.sort(key=lambda t: t[0])
+    return [(font_obj, codes) for _, font_obj, codes in found]
+
+def _get_carrier(font_name: str, glyphs: str = "") -> Optional[tuple]:
+    """返回 (载体PDF, 子集列表)，首次请求时生成并解析一次后常驻缓存。"""
+    key = _carrier_key(font_name, glyphs)
+    carrier = _FONT_CARRIER_CACHE.get(key)
+    if carrier is not None:
+        logger.debug(f"[Type0] 缓存命中，重复使用字体 '{font_name}' 的载体PDF。")
+        return carrier
+
+    with _FONT_CARRIER_LOCK:
+        carrier = _FONT_CARRIER_CACHE.get(key)
+        if carrier is not None:
+            return carrier
+        logger.info(f"[Type0] 缓存未命中，为字体 '{font_name}' 创建新的载体PDF（{len(key[1])} 个附加字形）。")
+        carrier_io = _create_font_carrier_pdf(font_name, "".join(sorted(key[1])))
+        if carrier_io is None:
+            return None
+        try:
+            # pikepdf 持有该流并按需读取，缓存中的 Pdf 与其缓冲区同生命周期
+            carrier_pdf = pikepdf.open(carrier_io)
+            subsets = _carrier_subsets(carrier_pdf, font_name)
+        except Exception as e:
+            logger.error(f"[Type0] 解析字体载体PDF时出错: {e}", exc_info=True)
+            return None
+        if not subsets:
+            logger.error(f"[Type0] 载体PDF中未找到字体 '{font_name}' 的嵌入子集。")
+            return None
+        carrier = (carrier_pdf, subsets)
+        _FONT_CARRIER_CACHE[key] = carrier
+        # 超出上限时淘汰最早写入的载体（已复制过字体的目标PDF自行持有载体引用）
+        while len(_FONT_CARRIER_CACHE) > _FONT_CARRIER_CACHE_MAX:
+            _FONT_CARRIER_CACHE.popitem(last=False)
+        return carrier
+
+def prewarm_type0_fonts(font_names: Iterable[str]) -> None:
+    """
+    预先把指定字体注册到 ReportLab，供后台线程在启动时调用。
+    载体按实际输出的字形生成，无法提前构建；注册（解析 TTF）是其中最耗时的一步，首次嵌入时只剩绘制一页小PDF。
+    """
+    for font_name in dict.fromkeys(f for f in font_names if f):
+        with _FONT_CARRIER_LOCK:
+            ok = _ensure_registered(font_name)
+        if ok:
+            logger.debug(f"[Type0] 字体 '{font_name}' 已预先注册。")
+
+def _effective_resources(page_obj) -> Optional[pikepdf.Dictionary]:
+    """返回页面实际生效的 /Resources：自身的，或页树中最近祖先节点继承来的。"""
+    node = page_obj
+    while node is not None:
+        res = node.get(_N_RES)
+        if res is not None:
+            return res
+        node = node.get(_N_PARENT)
+    return None
+
+_FONT_SIGNATURE_KEYS = (Name('/BaseFont'), Name('/Subtype'), Name('/Encoding'))
+_FONT_FILE_KEYS = (Name('/FontFile2'), Name('/FontFile'), Name('/FontFile3'))
+
+def _stream_bytes(obj) -> Optional[bytes]:
+    return obj.read_bytes() if isinstance(obj, pikepdf.Stream) else None
+
+def _font_file_bytes(font_obj) -> Optional[bytes]:
+    """返回字体描述符中嵌入的字体程序数据，未嵌入时返回 None。"""
+    descriptor = font_obj.get(_N_FONT_DESCRIPTOR)
+    if descriptor is None:
+        return None
+    for key in _FONT_FILE_KEYS:
+        data = _stream_bytes(descriptor.get(key))
+        if data is not None:
+            return data
+    return None
+
+def _find_embedded_font(res_targets, font_obj) -> Optional[str]:
+    """
+    查找目标PDF中与载体字体相同的已有字体，返回其资源名。
+    只有载体字体本身已嵌入（有 FontDescriptor 与 ToUnicode）时才复用，否则标准字体（如 Helvetica）
+    会与目标中任意同名字体误配。比较 /BaseFont、/Subtype、/Encoding；子集前缀（如 AAAAAA+）不唯一，
+    还须 ToUnicode 与字体程序数据完全一致。各页生效的资源字典都须指向同一对象。
     """
-    确保目标PDF中有所需的 Type0 字体资源。
+    signature = tuple(font_obj.get(k) for k in _FONT_SIGNATURE_KEYS)
+    to_unicode = _stream_bytes(font_obj.get(_N_TO_UNICODE))
+    font_file = _font_file_bytes(font_obj)
+    if signature[0] is None or to_unicode is None or font_file is None:
+        return None
+    # 根节点的 /Resources 可能是刚建的空字典（保存时 QPDF 会把继承属性下推到各页），只检查各页实际生效的资源字典
+    page_targets = res_targets[1:] or res_targets[:1]
+    for res_key, obj in page_targets[0].get(_N_FONT, {}).items():
+        if not obj.is_indirect or tuple(obj.get(k) for k in _FONT_SIGNATURE_KEYS) != signature:
+            continue
+        if _stream_bytes(obj.get(_N_TO_UNICODE)) != to_unicode or _font_file_bytes(obj) != font_file:
+            continue
+        if all(
+            (other := res.get(_N_FONT, {}).get(res_key)) is not None and other.objgen == obj.objgen
+            for res in page_targets[1:]
+        ):
+            return str(res_key)
+    return None
+
+def ensure_type0_font(pdf: pikepdf.Pdf, font_name: str, glyphs: str = "") -> Optional[Type0Font]:
+    """
+    确保目标PDF中有所需的嵌入字体资源。
 
     Args:
         pdf: 目标 pikepdf.Pdf 对象。
         font_name: 需要确保存在的字体名（系统中的 TTF 字体名）。
+        glyphs: 随后要用该字体绘制的全部字符，载体只嵌入这些字形。
 
     Returns:
-        在PDF内部的字体资源名（例如 '/F1'），如果失败则返回 None。
+        Type0Font（各子集在PDF内部的资源名，例如 'TTF1'，以及字符编码表），如果失败则返回 None。
     """
-    carrier_bytes = _FONT_CARRIER_CACHE.get(font_name)
-    if not carrier_bytes:
-        logger.info(f"[Type0] 缓存未命中，为字体 '{font_name}' 创建新的载体PDF。")
-        carrier_bytes = _create_font_carrier_pdf(font_name)
-        if not carrier_bytes:
-            return None
-        _FONT_CARRIER_CACHE[font_name] = carrier_bytes
-    else:
-        logger.debug(f"[Type0] 缓存命中，重复使用字体 '{font_name}' 的载体PDF。")
+    key = _carrier_key(font_name, glyphs)
+    ensured = getattr(pdf, _ENSURED_ATTR, None)
+    if ensured is None:
+        ensured = {}
+        setattr(pdf, _ENSURED_ATTR, ensured)
+    elif key in ensured:
+        font = ensured[key][0]
+        logger.debug(f"[Type0] 字体 '{font_name}' 已嵌入当前PDF，复用资源名 {font.res_names}。")
+        return font
+
+    # 页树只遍历一次；空文档无处挂载字体，直接返回，也不必生成载体
+    pages = list(pdf.pages)
+    if not pages:
+        logger.warning(f"[Type0] 目标PDF没有页面，跳过字体 '{font_name}' 的嵌入。")
+        return None
+
+    carrier = _get_carrier(font_name, glyphs)
+    if carrier is None:
+        return None
+    carrier_pdf, subsets = carrier
 
     try:
-        with pikepdf.open(BytesIO(carrier_bytes)) as carrier_pdf:
-            carrier_page = carrier_pdf.pages[0]
-            # ReportLab 通常会将字体资源放在页面的 /Resources/Font 下
-            carrier_fonts = carrier_page.obj.get(Name('/Resources'), {}).get(Name('/Font'), {})
-            
-            if not carrier_fonts:
-                logger.error(f"[Type0] 载体PDF中未找到字体资源。")
-                return None
-
-            # 遍历载体中的所有字体，并将它们复制到目标PDF中
-            # 通常只有一个，但为了稳健性我们遍历
-            target_font_res_name = None
-            for font_key, font_obj in carrier_fonts.items():
-                # 检查目标PDF中是否已有同名字体资源
-                # 为避免冲突，我们生成一个新的、唯一的资源名
-                i = 1
-                new_font_key = f"/TTF{i}"
-                # 查找一个在整个文档的 /Resources/Font 中都唯一的 key
-                # (这是一个简化逻辑，实际应用中可能需要更复杂的全局唯一性检查)
-                while any(Name(new_font_key) in p.obj.get(Name('/Resources'), {}).get(Name('/Font'), {}) for p in pdf.pages):
-                    i += 1
-                    new_font_key = f"/TTF{i}"
-                
-                # 复制字体对象。copy_foreign 会处理所有依赖的子对象。
-                copied_font_obj = pdf.copy_foreign(font_obj)
-                
-                # 将复制的字体资源添加到每一页
-                # 注意：更优化的做法是添加到文档级别的资源字典，但添加到每页更简单直接
-                for page in pdf.pages:
-                    if page.obj.get(Name('/Resources')) is None:
-                        page.obj[Name('/Resources')] = pikepdf.Dictionary()
-                    
-                    page_res = page.obj.get(Name('/Resources'))
-                    if page_res.get(Name('/Font')) is None:
-                        page_res[Name('/Font')] = pikepdf.Dictionary()
-                        
-                    page_res.get(Name('/Font'))[Name(new_font_key)] = copied_font_obj
-
-                logger.info(f"[Type0] 成功将字体 '{font_name}' 从载体复制到目标PDF，资源名为 '{new_font_key}'。")
-                target_font_res_name = new_font_key.lstrip('/')
-                # 我们只需要复制第一个找到的字体
-                break
-            
-            return target_font_res_name
+        # 一次遍历收集整个文档各页 /Resources/Font 中已用的 key，供所有子集复用
+        # 文档级资源挂在页树根节点，各页自身或中间节点的 /Resources 会遮蔽继承，需一并打补丁
+        root_pages = pdf.Root.Pages
+        root_res = root_pages.get(_N_RES)
+        if root_res is None:
+            root_res = pikepdf.Dictionary()
+            root_pages[_N_RES] = root_res
+        res_targets = [root_res]
+        seen_res = set()
+        for p in pages:
+            res = _effective_resources(p.obj)
+            if res is None:
+                continue
+            if res.is_indirect:
+                if res.objgen in seen_res:
+                    continue
+                seen_res.add(res.objgen)
+            res_targets.append(res)
+
+        used_keys = set()
+        for res in res_targets:
+            used_keys.update(str(k) for k in res.get(_N_FONT, {}).keys())
+
+        res_names: List[str] = []
+        codes: Dict[str, Tuple[int, int]] = {}
+        for index, (font_obj, subset_codes) in enumerate(subsets):
+            for ch, code in subset_codes.items():
+                codes.setdefault(ch, (index, code))
+
+            # 目标PDF已嵌入同一字体子集（例如再次处理本工具的输出）时直接复用，免去 copy_foreign
+            existing_key = _find_embedded_font(res_targets, font_obj)
+            if existing_key:
+                logger.info(f"[Type0] 目标PDF已包含字体 '{font_name}' 的子集，复用资源名 '{existing_key}'。")
+                res_names.append(existing_key.lstrip('/'))
+                continue
+
+            # 为避免冲突，生成一个在整个文档的 /Resources/Font 中都唯一的资源名
+            i = 1
+            while f"/TTF{i}" in used_keys:
+                i += 1
+            new_font_key = f"/TTF{i}"
+            new_font_name = _ttf_name(i)
+            used_keys.add(new_font_key)
+
+            # 复制字体对象。copy_foreign 会处理所有依赖的子对象。
+            copied_font_obj = pdf.copy_foreign(font_obj)
+
+            # 写入文档级 /Resources/Font，并只给遮蔽继承的资源字典补同一引用；每个字典只查找一次 /Font
+            font_key_name, font_ref, n_font = new_font_name, copied_font_obj, _N_FONT
+            for res in res_targets:
+                fonts = res.get(n_font)
+                if fonts is None:
+                    fonts = pikepdf.Dictionary()
+                    res[n_font] = fonts
+                fonts[font_key_name] = font_ref
+
+            logger.info(f"[Type0] 成功将字体 '{font_name}' 的子集从载体复制到目标PDF，资源名为 '{new_font_key}'。")
+            res_names.append(new_font_key.lstrip('/'))
+
+        font = Type0Font(tuple(res_names), codes)
+        ensured[key] = (font, carrier_pdf)
+        return font
 
     except Exception as e:
         logger.error(f"[Type0] 从载体PDF复制字体资源时出错: {e}", exc_info=True)
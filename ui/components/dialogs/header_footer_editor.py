@@ -1,8 +1,58 @@
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QSpinBox,
-    QPushButton, QListWidget, QListWidgetItem, QCheckBox
+    QPushButton, QListWidget, QCheckBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, QSignalBlocker, Signal, Slot
+import pikepdf
+
+from logger import logger
+
+# 打开/解析 PDF 时可预期的失败（fitz 的文件错误均继承 RuntimeError）
+_EXPECTED_ERRORS = (OSError, RuntimeError, ValueError, pikepdf.PdfError)
+
+
+_ANALYZER = None
+
+
+def _get_analyzer():
+    """模块级共享的 PdfAnalyzer，避免每次打开对话框都重新创建"""
+    global _ANALYZER
+    if _ANALYZER is None:
+        from pdf_analyzer import PdfAnalyzer
+        _ANALYZER = PdfAnalyzer()
+    return _ANALYZER
+
+
+class _CandidatesSignals(QObject):
+    ready = Signal(list, list)
+
+
+class _CandidatesWorker(QRunnable):
+    """后台提取页眉/页脚候选（Artifact + 启发式），完成后发出 ready(headers, footers)"""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self.signals = _CandidatesSignals()
+
+    @Slot()
+    def run(self):
+        headers = []
+        footers = []
+        try:
+            # extract_all_headers_footers 已合并 Artifact 与启发式结果
+            art = _get_analyzer().extract_all_headers_footers(self.path, max_pages=5)
+            # 按出现顺序去重
+            pages = art.get('pages', [])
+            headers = list(dict.fromkeys(t for p in pages for t in (p.get('header') or ())))
+            footers = list(dict.fromkeys(t for p in pages for t in (p.get('footer') or ())))
+        except _EXPECTED_ERRORS as e:
+            logger.warning(f"[Candidates] Failed to read {self.path}: {e}")
+        except Exception as e:
+            logger.error(f"[Candidates] Unexpected error for {self.path}: {e}", exc_info=True)
+        finally:
+            # 无论成功与否都通知对话框，失败时以空候选收尾
+            self.signals.ready.emit(headers, footers)
 
 
 class HeaderFooterEditorDialog(QDialog):
@@ -100,64 +150,66 @@ class HeaderFooterEditorDialog(QDialog):
         # 加载候选
         self._load_candidates()
 
-        # 实时预览联动
-        def _maybe_preview():
-            if self.live_preview_checkbox.isChecked():
-                # 将当前编辑框值临时写入主UI控件，调用主预览
-                try:
-                    # 单独写入 header/footer 文本，避免页脚跟随页眉问题
-                    if hasattr(self.main_window, 'header_text_input'):
-                        self.main_window.header_text_input.blockSignals(True)
-                        self.main_window.header_text_input.setText(self.header_line.text())
-                        self.main_window.header_text_input.blockSignals(False)
-                    if hasattr(self.main_window, 'footer_text_input'):
-                        self.main_window.footer_text_input.blockSignals(True)
-                        self.main_window.footer_text_input.setText(self.footer_line.text())
-                        self.main_window.footer_text_input.blockSignals(False)
-                    self.main_window.x_input.setValue(self.x_spin.value())
-                    self.main_window.y_input.setValue(self.y_spin.value())
-                    self.main_window.footer_x_input.setValue(self.fx_spin.value())
-                    self.main_window.footer_y_input.setValue(self.fy_spin.value())
-                except Exception:
-                    pass
-                self.main_window.update_preview()
+        # 实时预览联动：合并连续输入，空闲 150ms 后只渲染最后一次变更
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(150)
+        self._preview_timer.timeout.connect(self._run_preview)
 
         for w in [self.header_line, self.footer_line, self.date_fmt_line]:
-            w.textChanged.connect(_maybe_preview)
+            w.textChanged.connect(self._maybe_preview)
         for w in [self.x_spin, self.y_spin, self.fx_spin, self.fy_spin]:
-            w.valueChanged.connect(_maybe_preview)
+            w.valueChanged.connect(self._maybe_preview)
+
+    def _maybe_preview(self, *_args):
+        if self.live_preview_checkbox.isChecked():
+            self._preview_timer.start()
+
+    def _run_preview(self):
+        if not self.live_preview_checkbox.isChecked():
+            return
+        # 将当前编辑框值临时写入主UI控件，调用主预览
+        try:
+            # 单独写入 header/footer 文本，避免页脚跟随页眉问题
+            if hasattr(self.main_window, 'header_text_input'):
+                with QSignalBlocker(self.main_window.header_text_input):
+                    self.main_window.header_text_input.setText(self.header_line.text())
+            if hasattr(self.main_window, 'footer_text_input'):
+                with QSignalBlocker(self.main_window.footer_text_input):
+                    self.main_window.footer_text_input.setText(self.footer_line.text())
+            self.main_window.x_input.setValue(self.x_spin.value())
+            self.main_window.y_input.setValue(self.y_spin.value())
+            self.main_window.footer_x_input.setValue(self.fx_spin.value())
+            self.main_window.footer_y_input.setValue(self.fy_spin.value())
+        except Exception:
+            pass
+        self.main_window.update_preview()
 
     def _load_candidates(self):
+        """在线程池中解析候选，对话框先行显示，结果经信号回到主线程填充"""
         try:
             item = self.main_window.file_items[self.row_index]
-            from pdf_analyzer import PdfAnalyzer
-            analyzer = PdfAnalyzer()
-            art = analyzer.extract_all_headers_footers(item.path, max_pages=5)
-            # Artifact
-            headers = []
-            footers = []
-            for p in art.get('pages', []):
-                headers += p.get('header', []) or []
-                footers += p.get('footer', []) or []
-            # 启发式
-            try:
-                # 直接使用 PdfAnalyzer
-                from pdf_analyzer import PdfAnalyzer
-                heur = PdfAnalyzer().detect_headers_footers_heuristic(item.path, max_pages=5)
-                for p in heur.get('pages', []):
-                    # 已有 _is_likely 判定
-                    pass
-            except Exception:
-                pass
-            # 填充列表
-            for t in sorted(set(headers)):
-                self.header_list.addItem(QListWidgetItem(t))
-            for t in sorted(set(footers)):
-                self.footer_list.addItem(QListWidgetItem(t))
         except Exception:
-            pass
+            return
+        worker = _CandidatesWorker(item.path)
+        # 保留信号桥引用，确保排队信号送达前不被回收
+        self._candidates_signals = worker.signals
+        worker.signals.ready.connect(self._on_candidates_ready)
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_candidates_ready(self, headers: list, footers: list):
+        # 填充列表（保持出现顺序，批量插入期间暂停重绘与信号，结束后只绘制一次）
+        for lst, items in ((self.header_list, headers), (self.footer_list, footers)):
+            lst.setUpdatesEnabled(False)
+            lst.blockSignals(True)
+            try:
+                lst.addItems(items)
+            finally:
+                lst.blockSignals(False)
+                lst.setUpdatesEnabled(True)
 
     def _on_accept(self):
+        self._preview_timer.stop()
         # 将编辑内容回写到主窗口控件
         try:
             if hasattr(self.main_window, 'header_text_input'):
@@ -183,6 +235,7 @@ class HeaderFooterEditorDialog(QDialog):
         self.accept()
 
     def _on_reject(self):
+        self._preview_timer.stop()
         # 恢复原值
         try:
             self.main_window.header_text_input.setText(self._backup['header_text'])
@@ -10,6 +10,146 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
+# 样式表在导入时构建一次，各控件复用同一字符串对象
+_GROUP_QSS = """
+    QGroupBox {
+        background-color: #f8f9fa;
+        border: 2px solid #dee2e6;
+        border-radius: 10px;
+        margin-top: 15px;
+        padding-top: 15px;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 15px;
+        padding: 0 10px 0 10px;
+        color: #2c3e50;
+        background-color: #f8f9fa;
+        font-size: 14px;
+        font-weight: bold;
+    }
+"""
+
+_TABLE_QSS = """
+    QTableWidget {
+        background-color: white;
+        border: 1px solid #dee2e6;
+        border-radius: 6px;
+        gridline-color: #e9ecef;
+        selection-background-color: #e3f2fd;
+    }
+    QTableWidget::item {
+        padding: 8px;
+        border-bottom: 1px solid #e9ecef;
+    }
+    QTableWidget::item:selected {
+        background-color: #e3f2fd;
+        color: #1976d2;
+    }
+    QHeaderView::section {
+        background-color: #f8f9fa;
+        border: none;
+        border-bottom: 2px solid #dee2e6;
+        padding: 8px;
+        color: #2c3e50;
+        font-weight: bold;
+        min-height: 30px;  /* 确保表头高度足够 */
+    }
+    QHeaderView::section:hover {
+        background-color: #e9ecef;
+        cursor: pointer;  /* 显示为手型光标，提示可点击 */
+    }
+    QComboBox {
+        min-height: 25px;
+        padding: 5px;
+        border: 1px solid #ccc;
+        border-radius: 3px;
+        background-color: white;
+        color: black;
+    }
+    QComboBox::drop-down {
+        width: 20px;
+        border-left: 1px solid #ccc;
+    }
+    QLineEdit {
+        min-height: 25px;
+        padding: 5px;
+        border: 1px solid #ccc;
+        border-radius: 3px;
+        background-color: white;
+        color: black;
+    }
+"""
+
+_STATUS_LABEL_QSS = """
+    QLabel {
+        color: #6c757d;
+        font-weight: bold;
+        font-size: 12px;
+        padding: 8px;
+        background-color: #f8f9fa;
+        border: 1px solid #dee2e6;
+        border-radius: 6px;
+        min-width: 200px;
+    }
+"""
+
+_PROGRESS_QSS = """
+    QProgressBar {
+        border: 2px solid #dee2e6;
+        border-radius: 6px;
+        text-align: center;
+        font-weight: bold;
+    }
+    QProgressBar::chunk {
+        background-color: #28a745;
+        border-radius: 4px;
+    }
+"""
+
+# 操作按钮按 objectName 取配色，与分组样式合成一份样式表挂在按钮组上，只解析一次
+# （挂在 QApplication 上会被主窗口自身的 QPushButton 规则覆盖）
+_BTN_QSS_TMPL = """
+    QPushButton#%(name)s {
+        background-color: %(bg)s;
+        color: white;
+        border: none;
+        border-radius: 6px;
+        font-size: 12px;
+        font-weight: bold;
+        padding: 8px 16px;
+    }
+    QPushButton#%(name)s:hover {
+        background-color: %(hover)s;
+    }
+    QPushButton#%(name)s:pressed {
+        background-color: %(pressed)s;
+    }
+    QPushButton#%(name)s:disabled {
+        background-color: #bdc3c7;
+        color: #7f8c8d;
+    }
+"""
+_CONTROL_GROUP_QSS = _GROUP_QSS + "".join(_BTN_QSS_TMPL % colors for colors in (
+    {"name": "btn-primary", "bg": "#2196F3", "hover": "#1976D2", "pressed": "#1565C0"},
+    {"name": "btn-danger", "bg": "#f44336", "hover": "#d32f2f", "pressed": "#c62828"},
+    {"name": "btn-accent", "bg": "#9C27B0", "hover": "#7B1FA2", "pressed": "#6A1B9A"},
+))
+
+_ROW_HEIGHT = 32
+
+# 各列的宽度模式，批量插入结束后据此恢复
+_COLUMN_RESIZE_MODES = (
+    QHeaderView.ResizeToContents,  # 序号列
+    QHeaderView.ResizeToContents,  # Flags
+    QHeaderView.ResizeToContents,  # Mode
+    QHeaderView.Stretch,           # 文件名（拉伸填充）
+    QHeaderView.ResizeToContents,  # 大小
+    QHeaderView.ResizeToContents,  # 页数
+    QHeaderView.Interactive,       # 页眉
+    QHeaderView.Interactive,       # 页脚
+)
+
 
 class FileTableManager:
     """文件表格管理器"""
@@ -26,24 +166,7 @@ class FileTableManager:
         
         # 创建表格区域组
         table_group = QGroupBox("📋 " + self._("File List"))
-        table_group.setStyleSheet("""
-            QGroupBox {
-                background-color: #f8f9fa;
-                border: 2px solid #dee2e6;
-                border-radius: 10px;
-                margin-top: 15px;
-                padding-top: 15px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px 0 10px;
-                color: #2c3e50;
-                background-color: #f8f9fa;
-                font-size: 14px;
-                font-weight: bold;
-            }
-        """)
+        table_group.setStyleSheet(_GROUP_QSS)
         
         table_group_layout = QVBoxLayout()
         table_group_layout.setContentsMargins(10, 10, 10, 10)  # 减少边距
@@ -63,6 +186,12 @@ class FileTableManager:
             self._("Header Text"), 
             self._("Footer Text")
         ])
+
+        # 固定行高：滚动时按行号直接算偏移，不再逐行测量内容
+        vh = self.main_window.file_table.verticalHeader()
+        vh.setSectionResizeMode(QHeaderView.Fixed)
+        vh.setDefaultSectionSize(_ROW_HEIGHT)
+        vh.setMinimumSectionSize(_ROW_HEIGHT)
         
         # 设置表格属性
         self.main_window.file_table.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -75,14 +204,7 @@ class FileTableManager:
         
         # 设置列宽
         header = self.main_window.file_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)  # 序号列
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)  # Flags
-        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)  # Mode
-        header.setSectionResizeMode(3, QHeaderView.Stretch)  # 文件名（拉伸填充）
-        header.setSectionResizeMode(4, QHeaderView.ResizeToContents)  # 大小
-        header.setSectionResizeMode(5, QHeaderView.ResizeToContents)  # 页数
-        header.setSectionResizeMode(6, QHeaderView.Interactive)  # 页眉
-        header.setSectionResizeMode(7, QHeaderView.Interactive)  # 页脚
+        self._apply_column_resize_modes(header)
         
         # 设置最小列宽，确保内容可见
         header.setMinimumSectionSize(80)
@@ -102,57 +224,7 @@ class FileTableManager:
         header.setDefaultAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         
         # 表格样式
-        self.main_window.file_table.setStyleSheet("""
-            QTableWidget {
-                background-color: white;
-                border: 1px solid #dee2e6;
-                border-radius: 6px;
-                gridline-color: #e9ecef;
-                selection-background-color: #e3f2fd;
-            }
-            QTableWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #e9ecef;
-                min-height: 30px;  /* 确保行高足够 */
-            }
-            QTableWidget::item:selected {
-                background-color: #e3f2fd;
-                color: #1976d2;
-            }
-            QHeaderView::section {
-                background-color: #f8f9fa;
-                border: none;
-                border-bottom: 2px solid #dee2e6;
-                padding: 8px;
-                color: #2c3e50;
-                font-weight: bold;
-                min-height: 30px;  /* 确保表头高度足够 */
-            }
-            QHeaderView::section:hover {
-                background-color: #e9ecef;
-                cursor: pointer;  /* 显示为手型光标，提示可点击 */
-            }
-            QComboBox {
-                min-height: 25px;
-                padding: 5px;
-                border: 1px solid #ccc;
-                border-radius: 3px;
-                background-color: white;
-                color: black;
-            }
-            QComboBox::drop-down {
-                width: 20px;
-                border-left: 1px solid #ccc;
-            }
-            QLineEdit {
-                min-height: 25px;
-                padding: 5px;
-                border: 1px solid #ccc;
-                border-radius: 3px;
-                background-color: white;
-                color: black;
-            }
-        """)
+        self.main_window.file_table.setStyleSheet(_TABLE_QSS)
         
         # 在表格上方添加状态显示区域
         status_layout = QHBoxLayout()
@@ -162,18 +234,7 @@ class FileTableManager:
         # 左侧：处理状态标签
         self.main_window.progress_label = QLabel("")
         self.main_window.progress_label.setAlignment(Qt.AlignLeft)
-        self.main_window.progress_label.setStyleSheet("""
-            QLabel {
-                color: #6c757d;
-                font-weight: bold;
-                font-size: 12px;
-                padding: 8px;
-                background-color: #f8f9fa;
-                border: 1px solid #dee2e6;
-                border-radius: 6px;
-                min-width: 200px;
-            }
-        """)
+        self.main_window.progress_label.setStyleSheet(_STATUS_LABEL_QSS)
         
         # 中间：弹性空间
         status_layout.addWidget(self.main_window.progress_label)
@@ -183,18 +244,7 @@ class FileTableManager:
         self.main_window.progress_bar = QProgressBar()
         self.main_window.progress_bar.setVisible(False)
         self.main_window.progress_bar.setMinimumWidth(200)
-        self.main_window.progress_bar.setStyleSheet("""
-            QProgressBar {
-                border: 2px solid #dee2e6;
-                border-radius: 6px;
-                text-align: center;
-                font-weight: bold;
-            }
-            QProgressBar::chunk {
-                background-color: #28a745;
-                border-radius: 4px;
-            }
-        """)
+        self.main_window.progress_bar.setStyleSheet(_PROGRESS_QSS)
         
         status_layout.addWidget(self.main_window.progress_bar)
         
@@ -213,27 +263,30 @@ class FileTableManager:
         
         return layout
         
+    @staticmethod
+    def _apply_column_resize_modes(header: QHeaderView):
+        for col, mode in enumerate(_COLUMN_RESIZE_MODES):
+            header.setSectionResizeMode(col, mode)
+
+    def begin_bulk_insert(self):
+        """批量添加行前调用：暂停排序、重绘，并固定列宽，避免每次 setItem 触发重排与按内容测宽"""
+        table = self.main_window.file_table
+        self._bulk_sorting = table.isSortingEnabled()
+        table.setSortingEnabled(False)
+        table.setUpdatesEnabled(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
+    def end_bulk_insert(self):
+        """批量添加结束后调用：恢复列宽模式，只排序、重绘一次"""
+        table = self.main_window.file_table
+        self._apply_column_resize_modes(table.horizontalHeader())
+        table.setSortingEnabled(getattr(self, '_bulk_sorting', True))
+        table.setUpdatesEnabled(True)
+
     def _create_control_buttons(self) -> QGroupBox:
         """创建右侧控制按钮组"""
         control_group = QGroupBox("🎛️ " + self._("File Operations"))
-        control_group.setStyleSheet("""
-            QGroupBox {
-                background-color: #f8f9fa;
-                border: 2px solid #dee2e6;
-                border-radius: 10px;
-                margin-top: 15px;
-                padding-top: 15px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px 0 10px;
-                color: #2c3e50;
-                background-color: #f8f9fa;
-                font-size: 14px;
-                font-weight: bold;
-            }
-        """)
+        control_group.setStyleSheet(_CONTROL_GROUP_QSS)
         
         button_layout = QVBoxLayout()
         button_layout.setSpacing(10)
@@ -242,101 +295,21 @@ class FileTableManager:
         # 移动按钮
         self.main_window.move_up_button = QPushButton("⬆️ " + self._("Move Up"))
         self.main_window.move_up_button.setMinimumHeight(35)
-        self.main_window.move_up_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                font-size: 12px;
-                font-weight: bold;
-                padding: 8px 16px;
-            }
-            QPushButton:hover {
-                background-color: #1976D2;
-            }
-            QPushButton:pressed {
-                background-color: #1565C0;
-            }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-                color: #7f8c8d;
-            }
-        """)
+        self.main_window.move_up_button.setObjectName("btn-primary")
         
         self.main_window.move_down_button = QPushButton("⬇️ " + self._("Move Down"))
         self.main_window.move_down_button.setMinimumHeight(35)
-        self.main_window.move_down_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                font-size: 12px;
-                font-weight: bold;
-                padding: 8px 16px;
-            }
-            QPushButton:hover {
-                background-color: #1976D2;
-            }
-            QPushButton:pressed {
-                background-color: #1565C0;
-            }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-                color: #7f8c8d;
-            }
-        """)
+        self.main_window.move_down_button.setObjectName("btn-primary")
         
         # 删除按钮
         self.main_window.remove_button = QPushButton("🗑️ " + self._("Remove"))
         self.main_window.remove_button.setMinimumHeight(35)
-        self.main_window.remove_button.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                font-size: 12px;
-                font-weight: bold;
-                padding: 8px 16px;
-            }
-            QPushButton:hover {
-                background-color: #d32f2f;
-            }
-            QPushButton:pressed {
-                background-color: #c62828;
-            }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-                color: #7f8c8d;
-            }
-        """)
+        self.main_window.remove_button.setObjectName("btn-danger")
         
         # 解锁按钮
         self.main_window.unlock_button = QPushButton("🔓 " + self._("移除文件限制..."))
         self.main_window.unlock_button.setMinimumHeight(35)
-        self.main_window.unlock_button.setStyleSheet("""
-            QPushButton {
-                background-color: #9C27B0;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                font-size: 12px;
-                font-weight: bold;
-                padding: 8px 16px;
-            }
-            QPushButton:hover {
-                background-color: #7B1FA2;
-            }
-            QPushButton:pressed {
-                background-color: #6A1B9A;
-            }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-                color: #7f8c8d;
-            }
-        """)
+        self.main_window.unlock_button.setObjectName("btn-accent")
         
         # 布局组装
         button_layout.addWidget(self.main_window.move_up_button)
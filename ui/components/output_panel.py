@@ -13,6 +13,8 @@ import sys
 import subprocess
 import platform
 
+from ui.utils.ui_helpers import file_dialog_options
+
 
 class OutputPanel:
     """输出面板管理器"""
@@ -21,7 +23,6 @@ class OutputPanel:
         self.main_window = main_window
         self._ = main_window._
         # 获取默认输出文件夹
-        import os
         self.output_folder = os.path.expanduser("~/Downloads")
         
     def create_output_layout(self) -> QVBoxLayout:
@@ -178,13 +179,15 @@ class OutputPanel:
     def _open_output_folder(self):
         """打开输出文件夹"""
         try:
-            if os.path.exists(self.main_window.output_folder):
+            folder = os.path.abspath(self.main_window.output_folder)
+            if os.path.isdir(folder):
                 if sys.platform == "win32":
-                    os.startfile(self.main_window.output_folder)
-                elif sys.platform == "darwin":
-                    subprocess.run(["open", self.main_window.output_folder])
+                    os.startfile(folder)
                 else:
-                    subprocess.run(["xdg-open", self.main_window.output_folder])
+                    # 不等待子进程：xdg-open 等包装脚本可能阻塞到文件管理器启动完成
+                    opener = "open" if sys.platform == "darwin" else "xdg-open"
+                    subprocess.Popen([opener, folder], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                     start_new_session=True, close_fds=True)
             else:
                 self.main_window.show_error(self._("Output folder does not exist"), 
                                          f"Path: {self.main_window.output_folder}")
@@ -194,10 +197,12 @@ class OutputPanel:
     def _select_output_folder(self):
         """选择输出文件夹"""
         try:
+            options = file_dialog_options() | QFileDialog.ShowDirsOnly
             folder = QFileDialog.getExistingDirectory(
                 self.main_window,
                 self._("Select Output Folder"),
-                self.main_window.output_folder or os.path.expanduser("~/Downloads")
+                self.main_window.output_folder or os.path.expanduser("~/Downloads"),
+                options
             )
             if folder:
                 self.main_window.output_folder = folder
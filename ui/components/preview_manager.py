@@ -5,8 +5,11 @@
 """
 
 import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from io import BytesIO
-from typing import Optional
+from typing import Optional, Set, Tuple
 try:
     import fitz
 except Exception:  # pragma: no cover
@@ -14,13 +17,168 @@ except Exception:  # pragma: no cover
 import pikepdf
 from PySide6.QtWidgets import QLabel, QGroupBox, QVBoxLayout
 from PySide6.QtGui import QPixmap, QImage, QPainter, QColor, QFont
-from PySide6.QtCore import Qt, QRect
+from PySide6.QtCore import Qt, QEvent, QPoint, QRect, QTimer, QObject, QRunnable, QThreadPool, QSignalBlocker, Signal
 from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
 
-from geometry_context import build_geometry_context
-from font_manager import register_font_safely
-from logger import logger
+from fitz_lock import FITZ_LOCK
+from geometry_context import GeometryContext, build_geometry_context
+from font_manager import register_font_safely, suggest_chinese_fallback_font
+from logger import logger, track_error
+
+_TEXT_LAYER_CACHE_SIZE = 64
+_BASE_IMAGE_CACHE_BYTES = 128 * 1024 * 1024
+_DOC_CACHE_SIZE = 8
+# 预览缩放范围（按 0.25 量化，便于缓存命中）与条带覆盖的页面高度（原 1.5 倍下的 80 像素）
+_MIN_PREVIEW_SCALE = 0.75
+_MAX_PREVIEW_SCALE = 2.5
+_STRIP_HEIGHT_PT = 80 / 1.5
+
+
+def _doc_key(path: str) -> tuple:
+    """文档缓存键 (路径, mtime_ns, 大小)：文件被原地改写后键随之变化，旧句柄与旧位图不再命中"""
+    st = os.stat(path)
+    return path, st.st_mtime_ns, st.st_size
+
+
+class _ImageLRU:
+    """按字节预算淘汰的渲染缓存，值为 (samples, width, height, stride, x, y)，键的第一项为文档缓存键"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._total = 0
+
+    def get(self, key) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, samples: bytes, width: int, height: int, stride: int, x: int = 0, y: int = 0):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._total -= len(old[0])
+        self._entries[key] = (samples, width, height, stride, x, y)
+        self._total += len(samples)
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._total -= len(evicted[0])
+
+    def invalidate(self, path: Optional[str] = None, keep: Optional[tuple] = None):
+        """丢弃某个文件的条目（文档键为 keep 的除外）；path 为 None 时清空"""
+        if path is None:
+            self._entries.clear()
+            self._total = 0
+            return
+        for key in [k for k in self._entries if k[0][0] == path and k[0] != keep]:
+            self._total -= len(self._entries.pop(key)[0])
+
+
+@lru_cache(maxsize=256)
+def _exists_cached(path: str, generation: int) -> bool:
+    """文件存在性缓存；文件列表变化时调用方递增 generation 使旧结果失效"""
+    return os.path.exists(path)
+
+
+# 已成功注册到 ReportLab 的字体（进程级）；注册失败的字体下次仍会重试
+_REGISTERED: Set[str] = set()
+
+
+def _ensure_font(font_name: str) -> bool:
+    """注册字体，已注册过的直接返回，避免每次预览都重复解析字体文件"""
+    if font_name in _REGISTERED:
+        return True
+    ok = register_font_safely(font_name)
+    if ok:
+        _REGISTERED.add(font_name)
+    return ok
+
+
+def _aligned_x(c, text: str, font_name: str, font_size: float, page_width: float,
+               align: Optional[str], x: float) -> float:
+    """按对齐方式计算文本起点：居中忽略 x，右对齐时 x 作为右边距"""
+    if align == 'center':
+        return (page_width - c.stringWidth(text, font_name, font_size)) / 2
+    if align == 'right':
+        return page_width - c.stringWidth(text, font_name, font_size) - x
+    return x
+
+
+def _blit_strip(src: QImage, src_y: int, dst: QImage, dst_y: int, height: int):
+    """同格式图像按行直接拷贝 height 行（宽度取 dst），不经过 QPainter"""
+    src_bpl = src.bytesPerLine()
+    dst_bpl = dst.bytesPerLine()
+    src_buf = src.constBits()
+    dst_buf = dst.bits()
+    if src_bpl == dst_bpl:
+        size = dst_bpl * height
+        dst_buf[dst_y * dst_bpl:dst_y * dst_bpl + size] = src_buf[src_y * src_bpl:src_y * src_bpl + size]
+        return
+    row_bytes = dst.width() * dst.depth() // 8
+    for row in range(height):
+        s = (src_y + row) * src_bpl
+        d = (dst_y + row) * dst_bpl
+        dst_buf[d:d + row_bytes] = src_buf[s:s + row_bytes]
+
+
+def _preview_scale(target_width: float, page_width: float) -> float:
+    """使渲染宽度接近目标物理像素宽度的缩放系数，限制在合理范围并按 0.25 量化"""
+    if page_width <= 0 or target_width <= 0:
+        return 1.5
+    scale = max(_MIN_PREVIEW_SCALE, min(_MAX_PREVIEW_SCALE, target_width / page_width))
+    return round(scale * 4) / 4
+
+
+class _PreviewUnavailable(Exception):
+    """渲染线程中的可预期失败，消息直接显示在预览画布上"""
+
+
+class _PreviewRenderSignals(QObject):
+    finished = Signal(int, QImage, int, int)  # seq, 预览图像, 总页数, 实际页码
+    failed = Signal(int, str)  # seq, 提示文本
+
+
+class PreviewRenderTask(QRunnable):
+    """在线程池中渲染一次预览；所有输入均为界面线程采集的快照"""
+
+    def __init__(self, manager: "PreviewManager", seq: int, params: dict):
+        super().__init__()
+        self.manager = manager
+        self.seq = seq
+        self.params = params
+
+    def run(self):
+        manager = self.manager
+        signals = manager._render_signals
+        # 开始前已有更新的请求，则不再渲染
+        if self.seq != manager._render_seq:
+            return
+        try:
+            image, page_count, page_num = manager._render_preview_image(**self.params)
+        except _PreviewUnavailable as e:
+            signals.failed.emit(self.seq, str(e))
+            return
+        except Exception as e:
+            logger.error(f"预览更新失败: {e}", exc_info=True)
+            signals.failed.emit(self.seq, f"{manager._('Preview error')}: {str(e)}")
+            return
+        if self.seq == manager._render_seq:
+            signals.finished.emit(self.seq, image, page_count, page_num)
+
+
+class _ShowWatcher(QObject):
+    """预览画布重新显示时回调"""
+
+    def __init__(self, callback, parent: QObject):
+        super().__init__(parent)
+        self._callback = callback
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Show:
+            self._callback()
+        return False
+
 
 class PreviewManager:
     """预览管理器 - 完整的预览功能实现"""
@@ -28,19 +186,69 @@ class PreviewManager:
     def __init__(self, main_window):
         self.main_window = main_window
         self._ = main_window._
-        # 基页渲染缓存：key = (path, page_num, normalize, scale)
-        self._base_image_cache = {}
+        # 基页条带渲染缓存（按字节预算 LRU）：key = (文档键, page_num, zoom, clip)
+        self._base_image_cache = _ImageLRU(_BASE_IMAGE_CACHE_BYTES)
+        # 文本层位图缓存（LRU）：切换行或重复刷新时，输入未变则不再重新排版渲染
+        self._text_layer_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # 已打开的文档句柄（LRU）：(path, mtime_ns, size) -> {"fitz": Document, "pikepdf": Pdf}，翻页/改字号时不再重新解析文件
+        self._doc_cache: "OrderedDict[tuple, dict]" = OrderedDict()
+        # 已摘除、待关闭的句柄：由渲染线程（或 close_all）在 fitz 锁内关闭，界面线程不必等待渲染
+        self._retired_handles: list = []
+        # 文件列表代数：增删文件时递增，使 _exists_cached 的结果失效
+        self._fs_generation = 0
+        # 各缓存同时被界面线程（失效）与渲染线程访问
+        self._cache_lock = threading.Lock()
+        # 预览防抖：一串连续变化只在最后一次之后渲染
+        self._preview_timer = QTimer(main_window)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(80)
+        self._preview_timer.timeout.connect(self._do_update_preview)
+        # 可选控件（对齐下拉框、对比复选框等）的缓存引用，见 _optional_widget
+        self._optional_widgets = {}
+        # 画布不可见时只记下“待刷新”，重新显示后再渲染
+        self._preview_dirty = False
+        # 最近一次请求刷新时的选中行（表格重新填充后 currentRow 可能变为 -1）
+        self._pending_row: Optional[int] = None
+        canvas = getattr(main_window, 'pdf_preview_canvas', None)
+        if canvas is not None:
+            self._show_watcher = _ShowWatcher(self._on_canvas_shown, canvas)
+            canvas.installEventFilter(self._show_watcher)
+        # 预览合成图像的复用缓冲（仅渲染线程访问）
+        self._final_img: Optional[QImage] = None
+        # 后台渲染：单线程池串行执行，递增序号淘汰过期结果
+        self._render_seq = 0
+        self._render_pool = QThreadPool(main_window)
+        self._render_pool.setMaxThreadCount(1)
+        self._render_signals = _PreviewRenderSignals()
+        self._render_signals.finished.connect(self._on_render_finished)
+        self._render_signals.failed.connect(self._on_render_failed)
         
     def update_preview(self):
+        """请求刷新预览：连续的输入变化合并为一次渲染；画布不可见时推迟到重新显示"""
+        # 记下请求时的选中行：定时器触发前表格可能被重新填充，当前行会被重置为 -1
+        row = self.main_window.file_table.currentRow()
+        if row >= 0:
+            self._pending_row = row
+        if not self.main_window.pdf_preview_canvas.isVisible():
+            self._preview_dirty = True
+            return
+        self._preview_timer.start()
+
+    def _on_canvas_shown(self):
+        if self._preview_dirty:
+            self._preview_dirty = False
+            self._preview_timer.start()
+
+    def _do_update_preview(self):
         """更新预览显示"""
         try:
-            logger.debug("[Preview] update_preview called")
-            logger.debug(f"[Preview] file_items count: {len(self.main_window.file_items)}")
-            logger.debug(f"[Preview] current_row: {self.main_window.file_table.currentRow()}")
-            
-            # 获取当前选中的文件
+            # 获取当前选中的文件；没有选中行时沿用请求时的行，再退回第一行
             current_row = self.main_window.file_table.currentRow()
-            if current_row < 0 or current_row >= len(self.main_window.file_items):
+            if current_row < 0:
+                current_row = self._pending_row if self._pending_row is not None else 0
+            self._pending_row = None
+            logger.debug(f"[Preview] update_preview: row {current_row} of {len(self.main_window.file_items)}")
+            if current_row >= len(self.main_window.file_items):
                 logger.debug("[Preview] No valid row selected")
                 return
                 
@@ -52,13 +260,91 @@ class PreviewManager:
             logger.debug(f"[Preview] Processing item: {item.path}")
             
             # 更新PDF内容预览
-            self.update_pdf_content_preview()
+            self.update_pdf_content_preview(current_row)
             
         except Exception as e:
             logger.error(f"[Preview] Error in update_preview: {e}", exc_info=True)
-            from logger import track_error
             track_error("PreviewUpdate", f"预览更新失败: {e}", e)
             
+    def invalidate(self, path: Optional[str] = None):
+        """文件移出列表后丢弃其基页缓存；path 为 None 时清空全部"""
+        self._fs_generation += 1
+        with self._cache_lock:
+            self._base_image_cache.invalidate(path)
+            # 句柄可能正被渲染线程使用，这里只摘除并移入待关闭列表，稍后在渲染线程关闭
+            if path is None:
+                self._retired_handles.extend(self._doc_cache.values())
+                self._doc_cache.clear()
+            else:
+                for key in [k for k in self._doc_cache if k[0] == path]:
+                    self._retired_handles.append(self._doc_cache.pop(key))
+
+    def mark_files_changed(self):
+        """文件列表新增文件后调用，使缓存的文件存在性结果失效"""
+        self._fs_generation += 1
+
+    def close_all(self):
+        """关闭全部缓存的文档句柄（窗口关闭时调用）"""
+        self._render_seq += 1
+        self._render_pool.clear()
+        self._render_pool.waitForDone()
+        with self._cache_lock:
+            self._retired_handles.extend(self._doc_cache.values())
+            self._doc_cache.clear()
+        self._close_retired()
+
+    def _close_retired(self):
+        """关闭已摘除的句柄（渲染线程或渲染池空闲时调用）"""
+        with self._cache_lock:
+            retired, self._retired_handles = self._retired_handles, []
+        if retired:
+            with FITZ_LOCK:
+                for entry in retired:
+                    self._close_handles(entry)
+
+    @staticmethod
+    def _close_handles(entry: dict):
+        for handle in entry.values():
+            try:
+                handle.close()
+            except Exception:
+                pass
+
+    def _retire_stale(self, doc_key: tuple):
+        """文件被原地改写后，摘除同一路径下旧版本的句柄与基页位图（渲染线程调用）"""
+        path = doc_key[0]
+        with self._cache_lock:
+            for key in [k for k in self._doc_cache if k[0] == path and k != doc_key]:
+                self._retired_handles.append(self._doc_cache.pop(key))
+            self._base_image_cache.invalidate(path, keep=doc_key)
+
+    def _cached_handle(self, doc_key: tuple, kind: str, opener):
+        """返回 doc_key 对应的已打开句柄，必要时打开并按 LRU 淘汰最久未用的文件"""
+        with self._cache_lock:
+            entry = self._doc_cache.get(doc_key)
+            if entry is not None:
+                self._doc_cache.move_to_end(doc_key)
+                handle = entry.get(kind)
+                if handle is not None:
+                    return handle
+        handle = opener(doc_key[0])
+        with self._cache_lock:
+            entry = self._doc_cache.setdefault(doc_key, {})
+            self._doc_cache.move_to_end(doc_key)
+            entry[kind] = handle
+            # 淘汰只发生在渲染线程，被淘汰的句柄此时不会再被使用
+            while len(self._doc_cache) > _DOC_CACHE_SIZE:
+                self._retired_handles.append(self._doc_cache.popitem(last=False)[1])
+        self._close_retired()
+        return handle
+
+    def _get_fitz(self, doc_key: tuple):
+        with FITZ_LOCK:
+            return self._cached_handle(doc_key, "fitz", fitz.open)
+
+    def _get_pikepdf(self, doc_key: tuple):
+        return self._cached_handle(doc_key, "pikepdf", pikepdf.open)
+
     def update_position_preview(self):
         """更新位置预览（已弃用）"""
         pass
@@ -80,13 +366,12 @@ class PreviewManager:
             c = canvas.Canvas(buffer, pagesize=(page_width, page_height))
             
             # 注册字体
-            ok = register_font_safely(font_name)
+            ok = _ensure_font(font_name)
             try:
                 if not ok:
                     # 字体注册失败，尝试中文回退字体或内置字体
-                    from font_manager import suggest_chinese_fallback_font
                     fallback = suggest_chinese_fallback_font() or 'Helvetica'
-                    register_font_safely(fallback)
+                    _ensure_font(fallback)
                     c.setFont(fallback, font_size)
                 else:
                     c.setFont(font_name, font_size)
@@ -100,19 +385,21 @@ class PreviewManager:
             
             # 用PyMuPDF打开并渲染
             buffer.seek(0)
-            pdf_doc = fitz.open("pdf", buffer.getvalue())
-            page = pdf_doc[0]
-            
-            # 渲染为图像
-            mat = fitz.Matrix(2, 2)  # 2倍缩放提高清晰度
-            pix = page.get_pixmap(matrix=mat)
-            img_data = pix.tobytes("png")
-            
-            # 转换为QPixmap
-            qimg = QImage.fromData(img_data)
-            pixmap = QPixmap.fromImage(qimg)
-            
-            pdf_doc.close()
+            with FITZ_LOCK:
+                pdf_doc = fitz.open(stream=buffer.getbuffer(), filetype="pdf")
+                page = pdf_doc[0]
+
+                # 渲染为图像
+                mat = fitz.Matrix(2, 2)  # 2倍缩放提高清晰度
+                pix = page.get_pixmap(matrix=mat, alpha=False)
+
+                # 直接由采样缓冲区转换为QPixmap（跳过 PNG 编解码）
+                qimg = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
+                pixmap = QPixmap.fromImage(qimg)
+
+                # 在锁内释放 MuPDF 对象
+                del qimg, pix, page
+                pdf_doc.close()
             return pixmap
             
         except Exception as e:
@@ -127,74 +414,63 @@ class PreviewManager:
                             header_font_size: int,
                             footer_font_name: str,
                             footer_font_size: int,
-                            scale_factor: float) -> Optional[QPixmap]:
-        """使用ReportLab渲染文本层（含中文字体注册），再用PyMuPDF渲染为透明位图。"""
+                            scale_factor: float,
+                            hx: float,
+                            hy: float,
+                            fx: float,
+                            fy: float,
+                            header_align: Optional[str],
+                            footer_align: Optional[str],
+                            strip_rows: Tuple[int, ...],
+                            strip_height: int) -> Optional[Tuple[Optional[QImage], ...]]:
+        """使用ReportLab渲染文本层（含中文字体注册），再用PyMuPDF渲染为透明图像，
+        只保留 strip_rows 指定的各条带（每条一个 QImage，超出页面时为 None）。
+        相同输入（文本/字体/位置/对齐/页面尺寸/缩放/条带）直接返回缓存的结果。
+        在渲染线程中调用，因此只使用 QImage，且所有界面参数由调用方传入。"""
         try:
             if not header_text.strip() and not footer_text.strip():
                 return None
+
+            cache_key = (
+                header_text, footer_text,
+                header_font_name, header_font_size, footer_font_name, footer_font_size,
+                round(geom_context.effective_page_width, 2), round(geom_context.effective_page_height, 2),
+                scale_factor, hx, hy, fx, fy, header_align, footer_align,
+                strip_rows, strip_height,
+            )
+            with self._cache_lock:
+                cached = self._text_layer_cache.get(cache_key)
+                if cached is not None:
+                    self._text_layer_cache.move_to_end(cache_key)
+                    return cached
+
             # 构造PDF文本层
             buffer = BytesIO()
-            from reportlab.pdfgen import canvas as rl_canvas
-            c = rl_canvas.Canvas(buffer, pagesize=(geom_context.effective_page_width, geom_context.effective_page_height))
+            c = canvas.Canvas(buffer, pagesize=(geom_context.effective_page_width, geom_context.effective_page_height))
 
             # 注册并设置中文字体（页眉）
-            ok = register_font_safely(header_font_name)
+            ok = _ensure_font(header_font_name)
             if not ok:
-                from font_manager import suggest_chinese_fallback_font
                 header_font_name = suggest_chinese_fallback_font() or 'Helvetica'
-                register_font_safely(header_font_name)
+                _ensure_font(header_font_name)
 
             # 注册并设置中文字体（页脚）
-            ok2 = register_font_safely(footer_font_name)
+            ok2 = _ensure_font(footer_font_name)
             if not ok2:
-                from font_manager import suggest_chinese_fallback_font
                 footer_font_name = suggest_chinese_fallback_font() or 'Helvetica'
-                register_font_safely(footer_font_name)
+                _ensure_font(footer_font_name)
 
             # 翻转Y轴：ReportLab坐标为左下角
             # 同时注意：几何上下文的偏移在基页绘制中已体现；文本层保持“有效页面”坐标系
+            page_width = geom_context.effective_page_width
             if header_text.strip():
                 c.setFont(header_font_name, max(1, int(header_font_size)))
-                hx = float(self.main_window.x_input.value())
-                hy = float(self.main_window.y_input.value())
-                
-                # 检查是否有对齐设置
-                header_align = getattr(self.main_window, 'header_align_combo', None)
-                if header_align is not None:
-                    align = header_align.currentText().lower()
-                    if align == 'center':
-                        # 居中对齐
-                        text_width = c.stringWidth(header_text, header_font_name, header_font_size)
-                        page_width = geom_context.effective_page_width
-                        hx = (page_width - text_width) / 2
-                    elif align == 'right':
-                        # 右对齐
-                        text_width = c.stringWidth(header_text, header_font_name, header_font_size)
-                        page_width = geom_context.effective_page_width
-                        hx = page_width - text_width - hx  # 使用hx作为右边距
-                
+                hx = _aligned_x(c, header_text, header_font_name, header_font_size, page_width, header_align, hx)
                 c.drawString(hx, hy, header_text)
 
             if footer_text.strip():
                 c.setFont(footer_font_name, max(1, int(footer_font_size)))
-                fx = float(self.main_window.footer_x_input.value())
-                fy = float(self.main_window.footer_y_input.value())
-                
-                # 检查是否有对齐设置
-                footer_align = getattr(self.main_window, 'footer_align_combo', None)
-                if footer_align is not None:
-                    align = footer_align.currentText().lower()
-                    if align == 'center':
-                        # 居中对齐
-                        text_width = c.stringWidth(footer_text, footer_font_name, footer_font_size)
-                        page_width = geom_context.effective_page_width
-                        fx = (page_width - text_width) / 2
-                    elif align == 'right':
-                        # 右对齐
-                        text_width = c.stringWidth(footer_text, footer_font_name, footer_font_size)
-                        page_width = geom_context.effective_page_width
-                        fx = page_width - text_width - fx  # 使用fx作为右边距
-                
+                fx = _aligned_x(c, footer_text, footer_font_name, footer_font_size, page_width, footer_align, fx)
                 c.drawString(fx, fy, footer_text)
 
             c.save()
@@ -203,36 +479,59 @@ class PreviewManager:
             # 用 PyMuPDF 渲染为带透明通道的图像
             if fitz is None:
                 return None
-            doc = fitz.open("pdf", buffer.getvalue())
-            page = doc[0]
-            pix = page.get_pixmap(matrix=fitz.Matrix(scale_factor, scale_factor), alpha=True)
-            img_data = pix.tobytes("png")
-            qimg = QImage.fromData(img_data)
-            return QPixmap.fromImage(qimg)
+            with FITZ_LOCK:
+                doc = fitz.open(stream=buffer.getbuffer(), filetype="pdf")
+                page = doc[0]
+                pix = page.get_pixmap(matrix=fitz.Matrix(scale_factor, scale_factor), alpha=True)
+                # 一次光栅化整页，再按条带切出子位图，只把条带转换为 QImage
+                strips = []
+                for row in strip_rows:
+                    clip = fitz.IRect(0, row, pix.width, row + strip_height) & pix.irect
+                    if clip.is_empty:
+                        strips.append(None)
+                        continue
+                    sub = fitz.Pixmap(pix, pix.width, pix.height, clip)
+                    # MuPDF 的 alpha 采样为预乘格式；copy() 使图像脱离 sub 的缓冲区
+                    strips.append(QImage(sub.samples, sub.width, sub.height, sub.stride,
+                                         QImage.Format_RGBA8888_Premultiplied).copy())
+                    del sub
+                # 在锁内释放 MuPDF 对象
+                del pix, page
+                doc.close()
+            result = tuple(strips)
+
+            with self._cache_lock:
+                self._text_layer_cache[cache_key] = result
+                if len(self._text_layer_cache) > _TEXT_LAYER_CACHE_SIZE:
+                    self._text_layer_cache.popitem(last=False)
+            return result
         except Exception as e:
             logger.error(f"文本层渲染失败: {e}", exc_info=True)
             return None
             
-    def update_pdf_content_preview(self):
-        """更新PDF内容预览 - WYSIWYG风格，显示页眉+页脚条带"""
+    def update_pdf_content_preview(self, current_row: Optional[int] = None):
+        """更新PDF内容预览 - WYSIWYG风格，显示页眉+页脚条带。
+        在界面线程采集全部输入，渲染交给线程池，结果经信号回到界面线程。
+        current_row 为 None 时取表格当前行（无选中则第一行）。"""
         if not self.main_window.file_items:
             self.main_window.pdf_preview_canvas.setText(self._("Select a file to see preview"))
             return
             
         # 获取当前选中的文件
-        try:
-            current_row = self.main_window.file_table.currentRow()
-            if current_row < 0:
+        if current_row is None:
+            try:
+                current_row = self.main_window.file_table.currentRow()
+                if current_row < 0:
+                    current_row = 0
+            except:
                 current_row = 0
-        except:
-            current_row = 0
             
         if current_row >= len(self.main_window.file_items):
             self.main_window.pdf_preview_canvas.setText(self._("Invalid file selection"))
             return
             
         item = self.main_window.file_items[current_row]
-        if not os.path.exists(item.path):
+        if not _exists_cached(item.path, self._fs_generation):
             self.main_window.pdf_preview_canvas.setText(self._("File not found"))
             return
         
@@ -240,173 +539,251 @@ class PreviewManager:
         if fitz is None:
             self.main_window.pdf_preview_canvas.setText(self._("PyMuPDF (fitz) is not available"))
             return
-            
-        # 获取预览页码
-        preview_page_num = self.main_window.preview_page_spin.value() - 1  # 转为0基
-        
-        pdf_for_geom = None
-        doc = None
-        try:
-            # 需要同时用 pikepdf 获取几何信息，用 fitz 渲染
-            # 对加密/受限PDF增加降级处理：pikepdf失败时，使用fitz尺寸近似构建几何
-            try:
-                pdf_for_geom = pikepdf.open(item.path)
-            except Exception as ge:
-                logger.warning(f"[Preview] pikepdf open failed for {item.path}: {ge}")
-                pdf_for_geom = None
-            doc = fitz.open(item.path)
-            
-            if not doc or doc.page_count == 0:
-                self.main_window.pdf_preview_canvas.setText(self._("Cannot open or empty PDF"))
-                return
-                
-            if preview_page_num >= doc.page_count:
-                preview_page_num = 0
-                self.main_window.preview_page_spin.setValue(1)
-                
-            # 更新页码范围
-            self.main_window.preview_page_spin.setRange(1, doc.page_count)
-            
-            # 获取页面和几何上下文
-            normalize = True
-            try:
-                if hasattr(self.main_window, 'normalize_a4_checkbox'):
-                    normalize = bool(self.main_window.normalize_a4_checkbox.isChecked())
-            except Exception:
-                normalize = True
 
-            if pdf_for_geom is not None:
-                pikepdf_page = pdf_for_geom.pages[preview_page_num]
-                geom_context = build_geometry_context(pikepdf_page, normalize_a4=normalize)
-            else:
-                # pikepdf 不可用时，基于fitz页面尺寸近似构建几何上下文（不规范化）
-                page_rect = doc[preview_page_num].rect
-                from geometry_context import GeometryContext
-                geom_context = GeometryContext(
-                    original_media_box=(0.0, 0.0, float(page_rect.width), float(page_rect.height)),
-                    original_crop_box=None,
-                    original_rotation=0,
-                    effective_page_width=float(page_rect.width),
-                    effective_page_height=float(page_rect.height),
-                    transform_scale=1.0,
-                    transform_offset_x=0.0,
-                    transform_offset_y=0.0,
-                )
-            
-            # 用fitz渲染基础页面（带缓存）
-            fitz_page = doc[preview_page_num]
-            scale_factor = 1.5
-            cache_key = (item.path, preview_page_num, bool(geom_context.transform_scale != 1.0), scale_factor)
-            base_qimg = self._base_image_cache.get(cache_key)
-            if base_qimg is None:
-                mat = fitz.Matrix(scale_factor, scale_factor)
-                base_pix = fitz_page.get_pixmap(matrix=mat)
-                base_img_data = base_pix.tobytes("png")
-                base_qimg = QImage.fromData(base_img_data)
-                self._base_image_cache[cache_key] = base_qimg
-            
-            # 创建合成画布（原始大小 * scale_factor）
-            canvas_width = int(geom_context.effective_page_width * scale_factor)
-            canvas_height = int(geom_context.effective_page_height * scale_factor)
-            canvas_img = QImage(canvas_width, canvas_height, QImage.Format_ARGB32)
-            canvas_img.fill(Qt.white)
-            
-            painter = QPainter(canvas_img)
-            painter.setRenderHint(QPainter.Antialiasing)
-            
-            # 应用A4变换并绘制基础图像
-            if geom_context.transform_scale != 1.0:
-                # 计算变换后的位置和大小
-                scaled_width = int(base_qimg.width() * geom_context.transform_scale)
-                scaled_height = int(base_qimg.height() * geom_context.transform_scale)
-                offset_x = int(geom_context.transform_offset_x * scale_factor)
-                offset_y = int(geom_context.transform_offset_y * scale_factor)
-                
-                # 绘制缩放和偏移后的图像
-                scaled_base = base_qimg.scaled(scaled_width, scaled_height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                painter.drawImage(offset_x, offset_y, scaled_base)
-            else:
-                # 直接绘制
-                painter.drawImage(0, 0, base_qimg)
-                
-            # 获取页眉页脚文本和设置
-            header_text = self._get_header_text_for_item(item)
-            footer_text = self._get_footer_text_for_item(item)
-            
-            # 根据模式决定是否渲染“新文本层”与“原有Artifact层”
-            # 逐文件模式取自 file_items[row].preview_mode
-            per_file_mode = 'keep'
-            try:
-                per_file_mode = self.main_window.file_items[current_row].preview_mode
-            except Exception:
-                pass
-            mode_text = self._("替换") if per_file_mode == 'replace' else self._("保留")
-            overlay_compare = bool(getattr(self.main_window, 'overlay_compare_checkbox', None) and self.main_window.overlay_compare_checkbox.isChecked())
-
-            # 新文本层（替换模式或叠加对比开启时渲染）
-            header_font_name = self.main_window.font_select.currentText()
-            header_font_size = self.main_window.font_size_spin.value()
-            footer_font_name = self.main_window.footer_font_select.currentText()
-            footer_font_size = self.main_window.footer_font_size_spin.value()
-            # 当 header/footer 文本或位置存在时，才绘制新层；避免空白阻挡误判
-            should_draw_new = bool(header_text.strip() or footer_text.strip())
-            if should_draw_new and (mode_text in (self._("替换"),) or (overlay_compare and mode_text == self._("保留"))):
-                text_layer_pix = self._render_text_layer(
-                    header_text=header_text,
-                    footer_text=footer_text,
-                    geom_context=geom_context,
-                    header_font_name=header_font_name,
-                    header_font_size=header_font_size,
-                    footer_font_name=footer_font_name,
-                    footer_font_size=footer_font_size,
-                    scale_factor=scale_factor,
-                )
-                if text_layer_pix is not None:
-                    painter.drawPixmap(0, 0, text_layer_pix)
-                        
-            painter.end()
-            
-            # 提取页眉和页脚条带区域
-            strip_height = 80  # 每个条带的高度
-            header_strip_rect = QRect(0, 0, canvas_width, strip_height)
-            footer_strip_rect = QRect(0, canvas_height - strip_height, canvas_width, strip_height)
-            
-            # 创建最终预览图像（两个条带拼接）
-            final_height = strip_height * 2 + 10  # 两个条带 + 间隔
-            final_img = QImage(canvas_width, final_height, QImage.Format_ARGB32)
-            final_img.fill(Qt.white)
-            
-            final_painter = QPainter(final_img)
-            
-            # 绘制页眉条带
-            header_strip = canvas_img.copy(header_strip_rect)
-            final_painter.drawImage(0, 0, header_strip)
-            
-            # 绘制分隔线
-            final_painter.setPen(QColor(200, 200, 200))
-            final_painter.drawLine(0, strip_height + 5, canvas_width, strip_height + 5)
-            
-            # 绘制页脚条带
-            footer_strip = canvas_img.copy(footer_strip_rect)
-            final_painter.drawImage(0, strip_height + 10, footer_strip)
-            
-            final_painter.end()
-            
-            # 设置到预览画布
-            final_pixmap = QPixmap.fromImage(final_img)
-            self.main_window.pdf_preview_canvas.setPixmap(final_pixmap)
-            
+        try:
+            params = self._snapshot_render_params(item, current_row)
         except Exception as e:
             logger.error(f"预览更新失败: {e}", exc_info=True)
             self.main_window.pdf_preview_canvas.setText(f"{self._('Preview error')}: {str(e)}")
-        finally:
-            if pdf_for_geom:
-                pdf_for_geom.close()
-            if doc:
-                doc.close()
-                
-    def _get_header_text_for_item(self, item) -> str:
-        """获取项目的页眉文本"""
+            return
+
+        # 新任务使旧任务失效：尚未开始的直接撤出队列，已在运行的结果会被丢弃
+        self._render_seq += 1
+        self._render_pool.clear()
+        self._render_pool.start(PreviewRenderTask(self, self._render_seq, params))
+
+    def _optional_widget(self, name: str):
+        """取主窗口上可能不存在的控件，首次解析后缓存引用（不存在记为 None）"""
+        try:
+            return self._optional_widgets[name]
+        except KeyError:
+            widget = self._optional_widgets[name] = getattr(self.main_window, name, None)
+            return widget
+
+    def _snapshot_render_params(self, item, current_row: int) -> dict:
+        """在界面线程读取渲染所需的全部控件状态"""
+        mw = self.main_window
+        normalize = True
+        try:
+            normalize_checkbox = self._optional_widget('normalize_a4_checkbox')
+            if normalize_checkbox is not None:
+                normalize = bool(normalize_checkbox.isChecked())
+        except Exception:
+            normalize = True
+
+        # 获取页眉页脚文本和设置
+        header_text = self._get_header_text_for_item(item, current_row)
+        footer_text = self._get_footer_text_for_item(item)
+
+        # 根据模式决定是否渲染“新文本层”与“原有Artifact层”
+        # 逐文件模式取自 file_items[row].preview_mode
+        per_file_mode = 'keep'
+        try:
+            per_file_mode = mw.file_items[current_row].preview_mode
+        except Exception:
+            pass
+        mode_text = self._("替换") if per_file_mode == 'replace' else self._("保留")
+        overlay_checkbox = self._optional_widget('overlay_compare_checkbox')
+        overlay_compare = bool(overlay_checkbox is not None and overlay_checkbox.isChecked())
+        # 当 header/footer 文本或位置存在时，才绘制新层；避免空白阻挡误判
+        should_draw_new = bool(header_text.strip() or footer_text.strip())
+        draw_text_layer = should_draw_new and (mode_text in (self._("替换"),) or (overlay_compare and mode_text == self._("保留")))
+
+        header_align_combo = self._optional_widget('header_align_combo')
+        footer_align_combo = self._optional_widget('footer_align_combo')
+        return dict(
+            path=item.path,
+            page_num=mw.preview_page_spin.value() - 1,  # 转为0基
+            target_width=mw.pdf_preview_canvas.width() * mw.pdf_preview_canvas.devicePixelRatioF(),
+            normalize=normalize,
+            draw_text_layer=draw_text_layer,
+            text_layer_args=dict(
+                header_text=header_text,
+                footer_text=footer_text,
+                header_font_name=mw.font_select.currentText(),
+                header_font_size=mw.font_size_spin.value(),
+                footer_font_name=mw.footer_font_select.currentText(),
+                footer_font_size=mw.footer_font_size_spin.value(),
+                hx=float(mw.x_input.value()),
+                hy=float(mw.y_input.value()),
+                fx=float(mw.footer_x_input.value()),
+                fy=float(mw.footer_y_input.value()),
+                header_align=header_align_combo.currentText().lower() if header_align_combo is not None else None,
+                footer_align=footer_align_combo.currentText().lower() if footer_align_combo is not None else None,
+            ),
+        )
+
+    def _render_preview_image(self, path: str, page_num: int, target_width: float, normalize: bool,
+                              draw_text_layer: bool, text_layer_args: dict) -> Tuple[QImage, int, int]:
+        """渲染页眉+页脚条带预览（在渲染线程执行，不触碰任何控件）。
+        返回 (预览图像, 总页数, 实际渲染的页码)"""
+        # 需要同时用 pikepdf 获取几何信息，用 fitz 渲染；句柄来自缓存，用后不关闭
+        # 对加密/受限PDF增加降级处理：pikepdf失败时，使用fitz尺寸近似构建几何
+        # 只在实际的 fitz 调用期间持有 FITZ_LOCK；排版与合成在锁外进行
+        # 缓存按 (路径, mtime, 大小) 取用：文件被原地改写后旧句柄在此关闭，Windows 上不再锁住文件
+        doc_key = _doc_key(path)
+        self._retire_stale(doc_key)
+        self._close_retired()
+        try:
+            pdf_for_geom = self._get_pikepdf(doc_key)
+        except Exception as ge:
+            logger.warning(f"[Preview] pikepdf open failed for {path}: {ge}")
+            pdf_for_geom = None
+        with FITZ_LOCK:
+            doc = self._get_fitz(doc_key)
+            page_count = doc.page_count if doc else 0
+            if page_count and page_num >= page_count:
+                page_num = 0
+            page_rect = doc[page_num].rect if page_count else None
+
+        if not page_count:
+            raise _PreviewUnavailable(self._("Cannot open or empty PDF"))
+
+        if pdf_for_geom is not None:
+            pikepdf_page = pdf_for_geom.pages[page_num]
+            geom_context = build_geometry_context(pikepdf_page, normalize_a4=normalize)
+        else:
+            # pikepdf 不可用时，基于fitz页面尺寸近似构建几何上下文（不规范化）
+            geom_context = GeometryContext(
+                original_media_box=(0.0, 0.0, float(page_rect.width), float(page_rect.height)),
+                original_crop_box=None,
+                original_rotation=0,
+                effective_page_width=float(page_rect.width),
+                effective_page_height=float(page_rect.height),
+                transform_scale=1.0,
+                transform_offset_x=0.0,
+                transform_offset_y=0.0,
+            )
+        
+        # 按画布的物理像素宽度选择缩放，既不过度渲染也不在高分屏上欠采样
+        scale_factor = _preview_scale(target_width, geom_context.effective_page_width)
+        canvas_width = int(geom_context.effective_page_width * scale_factor)
+        canvas_height = int(geom_context.effective_page_height * scale_factor)
+        strip_height = max(1, round(_STRIP_HEIGHT_PT * scale_factor))  # 每个条带的高度（像素）
+        # 页面点 -> 画布像素：canvas = page * zoom + offset（A4 规范化时含缩放与偏移）
+        zoom = scale_factor * geom_context.transform_scale
+        if geom_context.transform_scale != 1.0:
+            offset_x = int(geom_context.transform_offset_x * scale_factor)
+            offset_y = int(geom_context.transform_offset_y * scale_factor)
+        else:
+            offset_x = offset_y = 0
+
+        # 创建最终预览图像（两个条带拼接）；与基页采样同为 RGB888，只对基页未覆盖的区域填白
+        final_height = strip_height * 2 + 10  # 两个条带 + 间隔
+        # 尺寸不变时复用上一次的图像；每个像素都会被重写，无需清空。
+        # 界面线程转换为 QPixmap 后释放共享引用，此处绘制不会触发深拷贝
+        final_img = self._final_img
+        if final_img is None or final_img.width() != canvas_width or final_img.height() != final_height:
+            final_img = QImage(canvas_width, final_height, QImage.Format_RGB888)
+            self._final_img = final_img
+
+        # (画布中的起始行, 最终图像中的起始行)
+        strips = ((0, 0), (canvas_height - strip_height, strip_height + 10))
+
+        # 新文本层（替换模式或叠加对比开启时渲染），按条带切好
+        text_strips = None
+        if draw_text_layer:
+            text_strips = self._render_text_layer(
+                geom_context=geom_context,
+                scale_factor=scale_factor,
+                strip_rows=tuple(canvas_y for canvas_y, _ in strips),
+                strip_height=strip_height,
+                **text_layer_args,
+            )
+
+        # 先处理基页：未缩放页面的条带与目标区域逐像素对齐且格式相同，按行直接拷贝，
+        # 绕过 QPainter 的混合管线；其余情况交给下面的 QPainter 绘制
+        # 只光栅化实际显示的页眉/页脚条带（PyMuPDF clip），不再渲染整页后丢弃中间部分
+        with FITZ_LOCK:
+            fitz_page = doc[page_num]
+            bases = [self._render_base_strip(doc_key, page_num, fitz_page, page_rect, zoom,
+                                             offset_x, offset_y, canvas_y, canvas_width, strip_height)
+                     for canvas_y, _ in strips]
+            # Page 析构同样会调用 MuPDF，须在锁内释放
+            del fitz_page
+        painted = []
+        for (canvas_y, dst_y), base in zip(strips, bases):
+            if base is None:
+                painted.append((dst_y, None, 0, 0))
+                continue
+            samples, width, height, stride, px, py = base
+            left = px + offset_x
+            top = dst_y + py + offset_y - canvas_y
+            # cached 条目在本次绘制期间持有采样缓冲区
+            base_qimg = QImage(samples, width, height, stride, QImage.Format_RGB888)
+            if left == 0 and top == dst_y and width >= canvas_width and height >= strip_height:
+                _blit_strip(base_qimg, 0, final_img, dst_y, strip_height)
+                painted.append((dst_y, None, -1, -1))
+            else:
+                painted.append((dst_y, base_qimg, left, top))
+
+        final_painter = QPainter(final_img)
+        for index, (dst_y, base_qimg, left, top) in enumerate(painted):
+            final_painter.setClipRect(QRect(0, dst_y, canvas_width, strip_height))
+            if left >= 0:
+                # 基页未铺满目标区域（页面外或规范化留白）时先填白
+                if base_qimg is None or left > 0 or top > dst_y or left + base_qimg.width() < canvas_width \
+                        or top + base_qimg.height() < dst_y + strip_height:
+                    final_painter.fillRect(0, dst_y, canvas_width, strip_height, Qt.white)
+                if base_qimg is not None:
+                    final_painter.drawImage(left, top, base_qimg)
+            if text_strips is not None and text_strips[index] is not None:
+                final_painter.drawImage(0, dst_y, text_strips[index])
+        final_painter.setClipping(False)
+
+        # 条带间隔与分隔线
+        final_painter.fillRect(0, strip_height, canvas_width, 10, Qt.white)
+        final_painter.setPen(QColor(200, 200, 200))
+        final_painter.drawLine(0, strip_height + 5, canvas_width, strip_height + 5)
+        final_painter.end()
+        return final_img, page_count, page_num
+
+    def _render_base_strip(self, doc_key: tuple, page_num: int, fitz_page, page_rect, zoom: float,
+                           offset_x: int, offset_y: int, canvas_y: int,
+                           canvas_width: int, strip_height: int) -> Optional[tuple]:
+        """渲染画布中 [canvas_y, canvas_y + strip_height) 这一条带覆盖的页面区域（带缓存）。
+        返回 (samples, width, height, stride, x, y)，x/y 为像素在 zoom 坐标系中的原点；区域落在页面外时返回 None。
+        调用方须持有 FITZ_LOCK"""
+        clip = fitz.Rect(
+            (0 - offset_x) / zoom, (canvas_y - offset_y) / zoom,
+            (canvas_width - offset_x) / zoom, (canvas_y + strip_height - offset_y) / zoom,
+        ) & page_rect
+        if clip.is_empty:
+            return None
+        cache_key = (doc_key, page_num, zoom, tuple(round(v, 3) for v in clip))
+        with self._cache_lock:
+            cached = self._base_image_cache.get(cache_key)
+        if cached is None:
+            pix = fitz_page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip, alpha=False)
+            cached = (pix.samples, pix.width, pix.height, pix.stride, pix.x, pix.y)
+            with self._cache_lock:
+                self._base_image_cache.put(cache_key, *cached)
+        return cached
+
+    def _on_render_finished(self, seq: int, image: QImage, page_count: int, page_num: int):
+        """渲染结果回到界面线程：过期结果直接丢弃"""
+        if seq != self._render_seq:
+            return
+        spin = self.main_window.preview_page_spin
+        # 已按修正后的页码渲染，调整页码控件时不再触发新一轮预览
+        with QSignalBlocker(spin):
+            if spin.value() - 1 != page_num:
+                spin.setValue(page_num + 1)
+            # 更新页码范围
+            spin.setRange(1, page_count)
+        # 设置到预览画布；按物理像素渲染，标注设备像素比后以逻辑尺寸显示
+        canvas = self.main_window.pdf_preview_canvas
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(canvas.devicePixelRatioF())
+        canvas.setPixmap(pixmap)
+
+    def _on_render_failed(self, seq: int, message: str):
+        if seq != self._render_seq:
+            return
+        self.main_window.pdf_preview_canvas.setText(message)
+
+    def _get_header_text_for_item(self, item, row: Optional[int] = None) -> str:
+        """获取项目的页眉文本；row 为 item 在 file_items 中的下标（调用方已知时传入，省去线性查找）"""
         # 优先使用表格中的文本
         current_row = self.main_window.file_table.currentRow()
         if current_row >= 0 and current_row < self.main_window.file_table.rowCount():
@@ -425,18 +802,11 @@ class PreviewManager:
             filename = os.path.splitext(os.path.basename(item.path))[0]
             return filename
         elif mode == 1:  # 自动编号模式
-            prefix = self.main_window.prefix_input.text()
-            start = self.main_window.start_spin.value()
-            step = self.main_window.step_spin.value()
-            digits = self.main_window.digits_spin.value()
-            suffix = self.main_window.suffix_input.text()
-            
+            mw = self.main_window
             # 计算当前项目的编号
-            index = self.main_window.file_items.index(item)
-            number = start + index * step
-            number_str = str(number).zfill(digits)
-            
-            return f"{prefix}{number_str}{suffix}"
+            index = row if row is not None else mw.file_items.index(item)
+            number = mw.start_spin.value() + index * mw.step_spin.value()
+            return f"{mw.prefix_input.text()}{number:0{mw.digits_spin.value()}d}{mw.suffix_input.text()}"
         else:  # 自定义模式
             return self.main_window.header_text_input.text()
             
@@ -455,7 +825,7 @@ class PreviewManager:
         
         # 使用全局页脚文本
         # 采用主窗体的全局页脚模板输入框（与UI一致）
-        footer_template = getattr(self.main_window, 'global_footer_text', None)
+        footer_template = self._optional_widget('global_footer_text')
         footer_template = footer_template.text() if footer_template is not None else ""
         if not footer_template:
             return ""
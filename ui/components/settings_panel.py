@@ -5,26 +5,150 @@ Settings Panel Module
 
 from PySide6.QtWidgets import (
     QGroupBox, QGridLayout, QLabel, QComboBox, QSpinBox, 
-    QPushButton, QHBoxLayout, QVBoxLayout, QLineEdit, QSizePolicy
+    QPushButton, QHBoxLayout, QVBoxLayout, QLineEdit, QSizePolicy, QButtonGroup,
+    QFontComboBox
 )
-from PySide6.QtCore import QObject, Signal, Qt
-from PySide6.QtGui import QFont
-from font_manager import get_system_fonts
+from functools import partial
+from typing import Optional
 
+from PySide6.QtCore import QObject, QSignalBlocker, QTimer, Signal, Slot, Qt
+from PySide6.QtGui import QColor, QFont, QPainter, QPixmap
+
+
+# 样式表在导入时构建一次并整体挂在设置分组上，子控件按类型/objectName/role 匹配，
+# 只解析一次，而不是每个控件各自 setStyleSheet
+_GROUP_QSS = """
+    QGroupBox {
+        background-color: #f8f9fa;
+        border: 2px solid #dee2e6;
+        border-radius: 10px;
+        margin-top: 15px;
+        padding-top: 15px;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 15px;
+        padding: 0 10px 0 10px;
+        color: #2c3e50;
+        background-color: #f8f9fa;
+        font-size: 14px;
+        font-weight: bold;
+    }
+"""
+
+_LABEL_QSS = """
+    QLabel {
+        font-weight: bold;
+        color: #2c3e50;
+    }
+    QLabel#colSettings, QLabel#colHeader, QLabel#colFooter {
+        font-size: 13px;
+        padding: 8px;
+        border-radius: 6px;
+    }
+    QLabel#colSettings {
+        padding: 6px;
+        background-color: #e9ecef;
+    }
+    QLabel#colHeader {
+        background-color: #d1ecf1;
+    }
+    QLabel#colFooter {
+        background-color: #d4edda;
+    }
+"""
+
+_SPINBOX_QSS = """
+    QSpinBox {
+        border: 2px solid #bdc3c7;
+        border-radius: 6px;
+        padding: 6px 10px;
+        font-size: 12px;
+        min-width: 80px;
+    }
+    QSpinBox:focus {
+        border-color: #3498db;
+    }
+"""
+
+_COMBO_QSS = """
+    QComboBox {
+        border: 2px solid #bdc3c7;
+        border-radius: 6px;
+        padding: 6px 10px;
+        font-size: 12px;
+        min-width: 120px;
+    }
+    QComboBox#unitCombo {
+        min-width: 80px;
+    }
+    QComboBox:focus {
+        border-color: #3498db;
+    }
+"""
+
+_LINE_EDIT_QSS = """
+    QLineEdit {
+        border: 2px solid #bdc3c7;
+        border-radius: 6px;
+        padding: 6px 10px;
+        font-size: 12px;
+    }
+    QLineEdit:focus {
+        border-color: #3498db;
+    }
+"""
+
+# 对齐按钮按动态属性 role（header/footer）取配色
+_ALIGN_BTN_QSS_TMPL = """
+    QPushButton[role="%(role)s"] {
+        background-color: %(bg)s;
+        border: none;
+        color: white;
+        padding: 6px 12px;
+        border-radius: 4px;
+        font-weight: bold;
+        min-width: 60px;
+    }
+    QPushButton[role="%(role)s"]:hover {
+        background-color: %(hover)s;
+    }
+    QPushButton[role="%(role)s"]:pressed {
+        background-color: %(pressed)s;
+    }
+"""
+_BTN_HEADER_QSS = _ALIGN_BTN_QSS_TMPL % {"role": "header", "bg": "#3498db", "hover": "#2980b9", "pressed": "#21618c"}
+_BTN_FOOTER_QSS = _ALIGN_BTN_QSS_TMPL % {"role": "footer", "bg": "#27ae60", "hover": "#229954", "pressed": "#1e8449"}
+
+_SETTINGS_GROUP_QSS = (_GROUP_QSS + _LABEL_QSS + _SPINBOX_QSS + _COMBO_QSS + _LINE_EDIT_QSS
+                       + _BTN_HEADER_QSS + _BTN_FOOTER_QSS)
+
+
+# 对齐按钮组编号 -> 对齐方式（页眉 左/中/右，页脚 左/中/右）
+_ALIGN_IDS = ("left", "center", "right", "footer_left", "footer_center", "footer_right")
 
 class SettingsPanel(QObject):
     """页眉页脚设置面板管理器"""
     
     # 信号定义
-    settings_changed = Signal(dict)
+    # 直接发出内部设置字典的引用（不复制），接收方只读不改
+    settings_changed = Signal(object)
     font_changed = Signal(str)
     size_changed = Signal(int)
     position_changed = Signal(int, int)
     alignment_changed = Signal(str)
+
+    # 警告图标（首次创建警告标签时栅格化）
+    _WARNING_PIXMAP: Optional[QPixmap] = None
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        # 连续输入（逐字键入、按住方向键）合并为一次 settings_changed
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(120)
+        self._debounce.timeout.connect(self._emit_settings_changed)
         self._setup_ui_elements()
         
     def _setup_ui_elements(self):
@@ -45,28 +169,16 @@ class SettingsPanel(QObject):
         self.footer_right_btn = None
         self.global_footer_input = None
         self.unit_combo = None
+        # 控件只会在 create_settings_group 中由 None 变为实例一次
+        self._ready = False
+        # 当前设置的快照：各控件变化时只改对应的键，读取时不再逐个查询控件
+        self._settings = {}
         
     def create_settings_group(self) -> QGroupBox:
         """创建页眉页脚设置网格组"""
-        group = QGroupBox("⚙️ " + self.parent._("Header & Footer Settings"))
-        group.setStyleSheet("""
-            QGroupBox {
-                background-color: #f8f9fa;
-                border: 2px solid #dee2e6;
-                border-radius: 10px;
-                margin-top: 15px;
-                padding-top: 15px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px 0 10px;
-                color: #2c3e50;
-                background-color: #f8f9fa;
-                font-size: 14px;
-                font-weight: bold;
-            }
-        """)
+        tr = self.parent._
+        group = QGroupBox("⚙️ " + tr("Header & Footer Settings"))
+        group.setObjectName("settingsGroup")
         
         grid = QGridLayout()
         grid.setSpacing(12)
@@ -79,40 +191,19 @@ class SettingsPanel(QObject):
         grid.setColumnStretch(2, 2)
         
         # 设置标签
-        settings_header = QLabel(self.parent._("Settings"))
-        settings_header.setStyleSheet("""
-            font-weight: bold; 
-            color: #2c3e50; 
-            font-size: 13px;
-            padding: 6px;
-            background-color: #e9ecef;
-            border-radius: 6px;
-        """)
+        settings_header = QLabel(tr("Settings"))
+        settings_header.setObjectName("colSettings")
         settings_header.setAlignment(Qt.AlignCenter)
         # 固定“设置”标签宽度，进一步压缩该列
         # 不固定宽度，随列宽缩放
         settings_header.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
         
-        header_header = QLabel(self.parent._("Header"))
-        header_header.setStyleSheet("""
-            font-weight: bold; 
-            color: #2c3e50; 
-            font-size: 13px;
-            padding: 8px;
-            background-color: #d1ecf1;
-            border-radius: 6px;
-        """)
+        header_header = QLabel(tr("Header"))
+        header_header.setObjectName("colHeader")
         header_header.setAlignment(Qt.AlignCenter)
         
-        footer_header = QLabel(self.parent._("Footer"))
-        footer_header.setStyleSheet("""
-            font-weight: bold; 
-            color: #2c3e50; 
-            font-size: 13px;
-            padding: 8px;
-            background-color: #d4edda;
-            border-radius: 6px;
-        """)
+        footer_header = QLabel(tr("Footer"))
+        footer_header.setObjectName("colFooter")
         footer_header.setAlignment(Qt.AlignCenter)
         
         grid.addWidget(settings_header, 0, 0)
@@ -120,42 +211,20 @@ class SettingsPanel(QObject):
         grid.addWidget(footer_header, 0, 2)
         
         # 字体选择
-        font_label = QLabel(self.parent._("Font:"))
-        font_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
+        font_label = QLabel(tr("Font:"))
         font_label.setAlignment(Qt.AlignRight)
         
-        self.font_select = QComboBox()
-        self.font_select.addItems(get_system_fonts())
+        # QFontComboBox 在 C++ 侧直接取 QFontDatabase 的字体列表，字体增删时自行刷新
+        self.font_select = QFontComboBox()
+        self.font_select.setEditable(False)
         self.font_select.setMinimumHeight(30)
-        self.font_select.setStyleSheet("""
-            QComboBox {
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                padding: 6px 10px;
-                font-size: 12px;
-                min-width: 120px;
-            }
-            QComboBox:focus {
-                border-color: #3498db;
-            }
-        """)
+        self._track(self.font_select.currentTextChanged, "header_font")
         self.font_select.currentTextChanged.connect(self._on_font_changed)
         
-        self.footer_font_select = QComboBox()
-        self.footer_font_select.addItems(get_system_fonts())
+        self.footer_font_select = QFontComboBox()
+        self.footer_font_select.setEditable(False)
         self.footer_font_select.setMinimumHeight(30)
-        self.footer_font_select.setStyleSheet("""
-            QComboBox {
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                padding: 6px 10px;
-                font-size: 12px;
-                min-width: 120px;
-            }
-            QComboBox:focus {
-                border-color: #3498db;
-            }
-        """)
+        self._track(self.footer_font_select.currentTextChanged, "footer_font")
         self.footer_font_select.currentTextChanged.connect(self._on_font_changed)
         
         grid.addWidget(font_label, 1, 0)
@@ -163,135 +232,33 @@ class SettingsPanel(QObject):
         grid.addWidget(self.footer_font_select, 1, 2)
         
         # 字体大小
-        size_label = QLabel(self.parent._("Size:"))
-        size_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
+        size_label = QLabel(tr("Size:"))
         size_label.setAlignment(Qt.AlignRight)
         
-        self.font_size_spin = QSpinBox()
-        self.font_size_spin.setRange(6, 72)
-        self.font_size_spin.setValue(14)
-        self.font_size_spin.setMinimumHeight(30)
-        self.font_size_spin.setStyleSheet("""
-            QSpinBox {
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                padding: 6px 10px;
-                font-size: 12px;
-                min-width: 80px;
-            }
-            QSpinBox:focus {
-                border-color: #3498db;
-            }
-        """)
-        self.font_size_spin.valueChanged.connect(self._on_size_changed)
-        
-        self.footer_font_size_spin = QSpinBox()
-        self.footer_font_size_spin.setRange(6, 72)
-        self.footer_font_size_spin.setValue(14)
-        self.footer_font_size_spin.setMinimumHeight(30)
-        self.footer_font_size_spin.setStyleSheet("""
-            QSpinBox {
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                padding: 6px 10px;
-                font-size: 12px;
-                min-width: 80px;
-            }
-            QSpinBox:focus {
-                border-color: #3498db;
-            }
-        """)
-        self.footer_font_size_spin.valueChanged.connect(self._on_size_changed)
+        self.font_size_spin = self._make_spinbox(6, 72, 14, "header_font_size", self._on_size_changed)
+        self.footer_font_size_spin = self._make_spinbox(6, 72, 14, "footer_font_size", self._on_size_changed)
         
         grid.addWidget(size_label, 2, 0)
         grid.addWidget(self.font_size_spin, 2, 1)
         grid.addWidget(self.footer_font_size_spin, 2, 2)
         
         # X位置
-        x_label = QLabel(self.parent._("X Position:"))
-        x_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
+        x_label = QLabel(tr("X Position:"))
         x_label.setAlignment(Qt.AlignRight)
         
-        self.x_input = QSpinBox()
-        self.x_input.setRange(0, 2000)
-        self.x_input.setValue(72)
-        self.x_input.setMinimumHeight(30)
-        self.x_input.setStyleSheet("""
-            QSpinBox {
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                padding: 6px 10px;
-                font-size: 12px;
-                min-width: 80px;
-            }
-            QSpinBox:focus {
-                border-color: #3498db;
-            }
-        """)
-        self.x_input.valueChanged.connect(self._on_position_changed)
-        
-        self.footer_x_input = QSpinBox()
-        self.footer_x_input.setRange(0, 2000)
-        self.footer_x_input.setValue(72)
-        self.footer_x_input.setMinimumHeight(30)
-        self.footer_x_input.setStyleSheet("""
-            QSpinBox {
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                padding: 6px 10px;
-                font-size: 12px;
-                min-width: 80px;
-            }
-            QSpinBox:focus {
-                border-color: #3498db;
-            }
-        """)
-        self.footer_x_input.valueChanged.connect(self._on_position_changed)
+        self.x_input = self._make_spinbox(0, 2000, 72, "header_x", self._on_position_changed)
+        self.footer_x_input = self._make_spinbox(0, 2000, 72, "footer_x", self._on_position_changed)
         
         grid.addWidget(x_label, 3, 0)
         grid.addWidget(self.x_input, 3, 1)
         grid.addWidget(self.footer_x_input, 3, 2)
         
         # Y位置
-        y_label = QLabel(self.parent._("Y Position:"))
-        y_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
+        y_label = QLabel(tr("Y Position:"))
         y_label.setAlignment(Qt.AlignRight)
         
-        self.y_input = QSpinBox()
-        self.y_input.setRange(0, 2000)
-        self.y_input.setValue(752)
-        self.y_input.setMinimumHeight(30)
-        self.y_input.setStyleSheet("""
-            QSpinBox {
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                padding: 6px 10px;
-                font-size: 12px;
-                min-width: 80px;
-            }
-            QSpinBox:focus {
-                border-color: #3498db;
-            }
-        """)
-        self.y_input.valueChanged.connect(self._on_position_changed)
-        
-        self.footer_y_input = QSpinBox()
-        self.footer_y_input.setRange(0, 2000)
-        self.footer_y_input.setValue(40)
-        self.footer_y_input.setMinimumHeight(30)
-        self.footer_y_input.setStyleSheet("""
-            QSpinBox {
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                padding: 6px 10px;
-                font-size: 12px;
-                min-width: 80px;
-            }
-            QSpinBox:focus {
-                border-color: #3498db;
-            }
-        """)
-        self.footer_y_input.valueChanged.connect(self._on_position_changed)
+        self.y_input = self._make_spinbox(0, 2000, 752, "header_y", self._on_position_changed)
+        self.footer_y_input = self._make_spinbox(0, 2000, 40, "footer_y", self._on_position_changed)
         
         header_y_layout = QHBoxLayout()
         header_y_layout.addWidget(self.y_input)
@@ -306,76 +273,16 @@ class SettingsPanel(QObject):
         grid.addLayout(footer_y_layout, 4, 2)
         
         # 对齐方式
-        align_label = QLabel(self.parent._("Alignment:"))
-        align_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
+        align_label = QLabel(tr("Alignment:"))
         align_label.setAlignment(Qt.AlignRight)
         
         # 页眉对齐按钮
         header_align_layout = QHBoxLayout()
         header_align_layout.setSpacing(8)
         
-        self.left_btn = QPushButton(self.parent._("Left"))
-        self.left_btn.setMinimumHeight(30)
-        self.left_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                border: none;
-                color: white;
-                padding: 6px 12px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 60px;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QPushButton:pressed {
-                background-color: #21618c;
-            }
-        """)
-        self.left_btn.clicked.connect(lambda: self._on_alignment_changed("left"))
-        
-        self.center_btn = QPushButton(self.parent._("Center"))
-        self.center_btn.setMinimumHeight(30)
-        self.center_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                border: none;
-                color: white;
-                padding: 6px 12px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 60px;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QPushButton:pressed {
-                background-color: #21618c;
-            }
-        """)
-        self.center_btn.clicked.connect(lambda: self._on_alignment_changed("center"))
-        
-        self.right_btn = QPushButton(self.parent._("Right"))
-        self.right_btn.setMinimumHeight(30)
-        self.right_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                border: none;
-                color: white;
-                padding: 6px 12px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 60px;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QPushButton:pressed {
-                background-color: #21618c;
-            }
-        """)
-        self.right_btn.clicked.connect(lambda: self._on_alignment_changed("right"))
+        self.left_btn = self._make_align_btn(tr("Left"), "header")
+        self.center_btn = self._make_align_btn(tr("Center"), "header")
+        self.right_btn = self._make_align_btn(tr("Right"), "header")
         
         header_align_layout.addWidget(self.left_btn)
         header_align_layout.addWidget(self.center_btn)
@@ -385,150 +292,123 @@ class SettingsPanel(QObject):
         footer_align_layout = QHBoxLayout()
         footer_align_layout.setSpacing(8)
         
-        self.footer_left_btn = QPushButton(self.parent._("Left"))
-        self.footer_left_btn.setMinimumHeight(30)
-        self.footer_left_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #27ae60;
-                border: none;
-                color: white;
-                padding: 6px 12px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 60px;
-            }
-            QPushButton:hover {
-                background-color: #229954;
-            }
-            QPushButton:pressed {
-                background-color: #1e8449;
-            }
-        """)
-        self.footer_left_btn.clicked.connect(lambda: self._on_alignment_changed("footer_left"))
-        
-        self.footer_center_btn = QPushButton(self.parent._("Center"))
-        self.footer_center_btn.setMinimumHeight(30)
-        self.footer_center_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #27ae60;
-                border: none;
-                color: white;
-                padding: 6px 12px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 60px;
-            }
-            QPushButton:hover {
-                background-color: #229954;
-            }
-            QPushButton:pressed {
-                background-color: #1e8449;
-            }
-        """)
-        self.footer_center_btn.clicked.connect(lambda: self._on_alignment_changed("footer_center"))
-        
-        self.footer_right_btn = QPushButton(self.parent._("Right"))
-        self.footer_right_btn.setMinimumHeight(30)
-        self.footer_right_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #27ae60;
-                border: none;
-                color: white;
-                padding: 6px 12px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 60px;
-            }
-            QPushButton:hover {
-                background-color: #229954;
-            }
-            QPushButton:pressed {
-                background-color: #1e8449;
-            }
-        """)
-        self.footer_right_btn.clicked.connect(lambda: self._on_alignment_changed("footer_right"))
+        self.footer_left_btn = self._make_align_btn(tr("Left"), "footer")
+        self.footer_center_btn = self._make_align_btn(tr("Center"), "footer")
+        self.footer_right_btn = self._make_align_btn(tr("Right"), "footer")
         
         footer_align_layout.addWidget(self.footer_left_btn)
         footer_align_layout.addWidget(self.footer_center_btn)
         footer_align_layout.addWidget(self.footer_right_btn)
         
+        # 六个按钮归入一个按钮组，按编号统一分发（编号即 _ALIGN_IDS 下标）
+        self._align_group = QButtonGroup(self)
+        self._align_group.setExclusive(False)
+        for button_id, btn in enumerate((self.left_btn, self.center_btn, self.right_btn,
+                                         self.footer_left_btn, self.footer_center_btn, self.footer_right_btn)):
+            self._align_group.addButton(btn, button_id)
+        self._align_group.idClicked.connect(self._on_align_id)
+        
         grid.addWidget(align_label, 5, 0)
         grid.addLayout(header_align_layout, 5, 1)
         grid.addLayout(footer_align_layout, 5, 2)
         
         # 全局页脚文本
-        global_footer_label = QLabel(self.parent._("Global Footer Text:"))
-        global_footer_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
+        global_footer_label = QLabel(tr("Global Footer Text:"))
         global_footer_label.setAlignment(Qt.AlignRight)
         
         self.global_footer_input = QLineEdit()
-        self.global_footer_input.setPlaceholderText(self.parent._("Use {page} for current page, {total} for total pages."))
+        self.global_footer_input.setPlaceholderText(tr("Use {page} for current page, {total} for total pages."))
         self.global_footer_input.setMinimumHeight(30)
-        self.global_footer_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                padding: 6px 10px;
-                font-size: 12px;
-            }
-            QLineEdit:focus {
-                border-color: #3498db;
-            }
-        """)
+        self._track(self.global_footer_input.textChanged, "global_footer_text")
         self.global_footer_input.textChanged.connect(self._on_settings_changed)
         
         grid.addWidget(global_footer_label, 6, 0)
         grid.addWidget(self.global_footer_input, 6, 1, 1, 2)
         
         # 单位选择
-        unit_label = QLabel(self.parent._("单位:"))
-        unit_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
+        unit_label = QLabel(tr("单位:"))
         unit_label.setAlignment(Qt.AlignRight)
         
         self.unit_combo = QComboBox()
+        self.unit_combo.setObjectName("unitCombo")
         self.unit_combo.addItems(["pt", "mm", "cm", "inch"])
         self.unit_combo.setCurrentText("pt")
         self.unit_combo.setMinimumHeight(30)
-        self.unit_combo.setStyleSheet("""
-            QComboBox {
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                padding: 6px 10px;
-                font-size: 12px;
-                min-width: 80px;
-            }
-            QComboBox:focus {
-                border-color: #3498db;
-            }
-        """)
+        self._track(self.unit_combo.currentTextChanged, "unit")
         self.unit_combo.currentTextChanged.connect(self._on_settings_changed)
         
         grid.addWidget(unit_label, 7, 0)
         grid.addWidget(self.unit_combo, 7, 1)
         
         group.setLayout(grid)
+        # 子控件全部就位后再挂样式表，整棵子树只做一次样式计算
+        group.setStyleSheet(_SETTINGS_GROUP_QSS)
+        # 原地更新：各控件的写入函数绑定的是这个字典对象本身
+        self._settings.update(self._read_settings())
+        self._ready = True
         return group
-        
+
+    def _make_spinbox(self, min_: int, max_: int, default: int, key: str, slot) -> QSpinBox:
+        """创建数值输入框：范围、默认值，并接入设置快照与处理函数"""
+        spin = QSpinBox()
+        spin.setRange(min_, max_)
+        spin.setValue(default)
+        spin.setMinimumHeight(30)
+        self._track(spin.valueChanged, key)
+        spin.valueChanged.connect(slot)
+        return spin
+
+    def _make_align_btn(self, text: str, role: str) -> QPushButton:
+        """创建对齐按钮（text 已翻译），role（header/footer）决定配色"""
+        btn = QPushButton(text)
+        btn.setMinimumHeight(30)
+        btn.setProperty("role", role)
+        return btn
+
+    def _track(self, signal, key: str):
+        """控件值变化时同步更新设置快照（先于其他处理函数连接）"""
+        # partial 包装 dict.__setitem__，信号触发时直接走 C 调用，不经过 Python 函数帧
+        signal.connect(partial(self._settings.__setitem__, key))
+        
+    @classmethod
+    def _warning_pixmap(cls) -> QPixmap:
+        """警告图标只栅格化一次，所有警告标签共用（需在 QApplication 创建后调用）"""
+        if cls._WARNING_PIXMAP is None:
+            pixmap = QPixmap(16, 16)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            font = QFont()
+            font.setPixelSize(13)
+            painter.setFont(font)
+            painter.setPen(QColor("#e74c3c"))
+            painter.drawText(pixmap.rect(), Qt.AlignCenter, "⚠️")
+            painter.end()
+            cls._WARNING_PIXMAP = pixmap
+        return cls._WARNING_PIXMAP
+
     def _create_warning_label(self) -> QLabel:
         """创建警告标签"""
-        warning = QLabel("⚠️")
+        warning = QLabel()
+        warning.setPixmap(self._warning_pixmap())
         warning.setToolTip(self.parent._("This position is too close to the edge..."))
-        warning.setStyleSheet("color: #e74c3c; font-size: 16px;")
         return warning
         
-    def _on_font_changed(self):
+    @Slot(str)
+    def _on_font_changed(self, _text: str = ""):
         """字体改变时的处理"""
         if self.font_select and self.footer_font_select:
             self.font_changed.emit(self.font_select.currentText())
             self._on_settings_changed()
             
-    def _on_size_changed(self):
+    @Slot(int)
+    def _on_size_changed(self, _value: int = 0):
         """字体大小改变时的处理"""
         if self.font_size_spin and self.footer_font_size_spin:
             self.size_changed.emit(self.font_size_spin.value())
             self._on_settings_changed()
             
-    def _on_position_changed(self):
+    @Slot(int)
+    def _on_position_changed(self, _value: int = 0):
         """位置改变时的处理"""
         if self.x_input and self.y_input:
             self.position_changed.emit(self.x_input.value(), self.y_input.value())
@@ -538,19 +418,29 @@ class SettingsPanel(QObject):
         """对齐方式改变时的处理"""
         self.alignment_changed.emit(alignment)
         self._on_settings_changed()
-        
+
+    @Slot(int)
+    def _on_align_id(self, button_id: int):
+        self._on_alignment_changed(_ALIGN_IDS[button_id])
+
+    @Slot()
     def _on_settings_changed(self):
-        """设置改变时的处理"""
-        settings = self.get_current_settings()
-        self.settings_changed.emit(settings)
+        """设置改变时的处理：重新计时，静止一段时间后才发出 settings_changed"""
+        self._debounce.start()
+
+    @Slot()
+    def _emit_settings_changed(self):
+        if self._ready:
+            self.settings_changed.emit(self._settings)
         
     def get_current_settings(self) -> dict:
         """获取当前设置"""
-        if not all([self.font_select, self.font_size_spin, self.x_input, self.y_input, 
-                   self.footer_font_select, self.footer_font_size_spin, self.footer_x_input, 
-                   self.footer_y_input, self.global_footer_input, self.unit_combo]):
+        if not self._ready:
             return {}
-            
+        return self._settings.copy()
+
+    def _read_settings(self) -> dict:
+        """从控件逐项读取设置"""
         return {
             'header_font': self.font_select.currentText(),
             'header_font_size': self.font_size_spin.value(),
@@ -565,27 +455,37 @@ class SettingsPanel(QObject):
         }
         
     def apply_settings(self, settings: dict):
-        """应用设置"""
-        if not settings:
+        """应用设置：批量写入期间屏蔽控件信号，结束后只发出一次 settings_changed"""
+        if not settings or not self._ready:
             return
-            
-        if 'header_font' in settings and self.font_select:
-            self.font_select.setCurrentText(settings['header_font'])
-        if 'header_font_size' in settings and self.font_size_spin:
+
+        widgets = (self.font_select, self.font_size_spin, self.x_input, self.y_input,
+                   self.footer_font_select, self.footer_font_size_spin, self.footer_x_input,
+                   self.footer_y_input, self.global_footer_input, self.unit_combo)
+        blockers = [QSignalBlocker(w) for w in widgets]
+        if 'header_font' in settings:
+            self.font_select.setCurrentFont(QFont(settings['header_font']))
+        if 'header_font_size' in settings:
             self.font_size_spin.setValue(settings['header_font_size'])
-        if 'header_x' in settings and self.x_input:
+        if 'header_x' in settings:
             self.x_input.setValue(settings['header_x'])
-        if 'header_y' in settings and self.y_input:
+        if 'header_y' in settings:
             self.y_input.setValue(settings['header_y'])
-        if 'footer_font' in settings and self.footer_font_select:
-            self.footer_font_select.setCurrentText(settings['footer_font'])
-        if 'footer_font_size' in settings and self.footer_font_size_spin:
+        if 'footer_font' in settings:
+            self.footer_font_select.setCurrentFont(QFont(settings['footer_font']))
+        if 'footer_font_size' in settings:
             self.footer_font_size_spin.setValue(settings['footer_font_size'])
-        if 'footer_x' in settings and self.footer_x_input:
+        if 'footer_x' in settings:
             self.footer_x_input.setValue(settings['footer_x'])
-        if 'footer_y' in settings and self.footer_y_input:
+        if 'footer_y' in settings:
             self.footer_y_input.setValue(settings['footer_y'])
-        if 'global_footer_text' in settings and self.global_footer_input:
+        if 'global_footer_text' in settings:
             self.global_footer_input.setText(settings['global_footer_text'])
-        if 'unit' in settings and self.unit_combo:
+        if 'unit' in settings:
             self.unit_combo.setCurrentText(settings['unit'])
+        for blocker in blockers:
+            blocker.unblock()
+
+        # 信号被屏蔽，快照不会自动更新：统一回读一次
+        self._settings.update(self._read_settings())
+        self._on_settings_changed()
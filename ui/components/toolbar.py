@@ -5,12 +5,93 @@ Toolbar Manager Module
 
 from PySide6.QtWidgets import (
     QHBoxLayout, QPushButton, QLabel, QComboBox, QGroupBox,
-    QVBoxLayout, QLineEdit, QSpinBox, QHBoxLayout
+    QVBoxLayout, QLineEdit, QSpinBox, QHBoxLayout, QWidget
 )
-from PySide6.QtCore import QObject, Signal
+import textwrap
+from contextlib import contextmanager
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
 from PySide6.QtGui import QFont
 
 
+# 工具栏与自动编号分组的样式表在导入时构建一次，挂到父窗口上，
+# 子控件按 objectName 匹配，不再逐个控件 setStyleSheet
+_TOOL_BTN_QSS_TMPL = """
+    QPushButton#%(name)s {
+        background-color: %(bg)s;
+        font-size: 13px;
+        padding: 10px 20px;
+    }
+    QPushButton#%(name)s:hover {
+        background-color: %(hover)s;
+    }
+"""
+
+_AUTO_NUM_FIELD_QSS = """
+    QGroupBox#autoNumberGroup %(type)s {
+        border: 2px solid #bdc3c7;
+        border-radius: 6px;
+        padding: 8px;
+        font-size: 12px;
+    }
+    QGroupBox#autoNumberGroup %(type)s:focus {
+        border-color: #3498db;
+    }
+"""
+
+_TOOLBAR_QSS = textwrap.dedent("".join(_TOOL_BTN_QSS_TMPL % colors for colors in (
+    {"name": "importButton", "bg": "#27ae60", "hover": "#229954"},
+    {"name": "clearButton", "bg": "#e74c3c", "hover": "#c0392b"},
+    {"name": "unlockButton", "bg": "#8e44ad", "hover": "#7d3c98"},
+)) + """
+    QPushButton#unlockButton {
+        color: white;
+    }
+    QLabel#modeLabel, QGroupBox#autoNumberGroup QLabel {
+        font-weight: bold;
+        color: #2c3e50;
+    }
+    QComboBox#modeSelectCombo {
+        font-size: 13px;
+        padding: 8px 15px;
+        min-width: 150px;
+    }
+    QGroupBox#autoNumberGroup {
+        background-color: #ecf0f1;
+        border: 2px solid #bdc3c7;
+        border-radius: 10px;
+        margin-top: 15px;
+        padding-top: 15px;
+    }
+""" + _AUTO_NUM_FIELD_QSS % {"type": "QLineEdit"} + _AUTO_NUM_FIELD_QSS % {"type": "QSpinBox"})
+
+# 自动编号控件的初始值（分组未创建前 get_auto_number_settings 也返回这些值）
+_AUTO_NUMBER_DEFAULTS = {
+    'prefix': "Doc-",
+    'start_number': 1,
+    'step': 1,
+    'digits': 3,
+    'suffix': "",
+}
+
+
+class _LazyGroupBox(QGroupBox):
+    """首次显示（或显式 ensure_built）时才调用 builder 填充内容的分组框"""
+
+    def __init__(self, title: str, builder, parent=None):
+        super().__init__(title, parent)
+        self._builder = builder
+
+    def ensure_built(self):
+        if self._builder is not None:
+            builder, self._builder = self._builder, None
+            builder(self)
+
+    def showEvent(self, event):
+        self.ensure_built()
+        super().showEvent(event)
+
+
 class ToolbarManager(QObject):
     """顶部工具栏管理器"""
     
@@ -25,6 +106,9 @@ class ToolbarManager(QObject):
         super().__init__(parent)
         self.parent = parent
         self._setup_ui_elements()
+        # 样式表只在父窗口上追加一次，工具栏与自动编号分组的控件共用
+        if isinstance(parent, QWidget) and _TOOLBAR_QSS not in parent.styleSheet():
+            parent.setStyleSheet(parent.styleSheet() + _TOOLBAR_QSS)
         
     def _setup_ui_elements(self):
         """初始化UI元素引用"""
@@ -37,6 +121,15 @@ class ToolbarManager(QObject):
         self.step_input = None
         self.digits_input = None
         self.suffix_input = None
+        self.auto_number_group = None
+        self._auto_number_built = False
+        # 连续输入合并为一次 auto_number_changed；batch() 期间只记录有改动
+        self._emit_timer = QTimer(self)
+        self._emit_timer.setSingleShot(True)
+        self._emit_timer.setInterval(80)
+        self._emit_timer.timeout.connect(self._flush_auto_number)
+        self._silenced = False
+        self._batch_dirty = False
         
     def create_top_bar(self) -> QHBoxLayout:
         """创建顶部包含导入、清空和模式选择的工具栏"""
@@ -57,30 +150,12 @@ class ToolbarManager(QObject):
         
         self.import_button = QPushButton("📁 " + self.parent._("Import Files or Folders"))
         self.import_button.setMinimumHeight(35)
-        self.import_button.setStyleSheet("""
-            QPushButton {
-                background-color: #27ae60;
-                font-size: 13px;
-                padding: 10px 20px;
-            }
-            QPushButton:hover {
-                background-color: #229954;
-            }
-        """)
+        self.import_button.setObjectName("importButton")
         self.import_button.clicked.connect(self.import_requested.emit)
         
         self.clear_button = QPushButton("🗑️ " + self.parent._("Clear List"))
         self.clear_button.setMinimumHeight(35)
-        self.clear_button.setStyleSheet("""
-            QPushButton {
-                background-color: #e74c3c;
-                font-size: 13px;
-                padding: 10px 20px;
-            }
-            QPushButton:hover {
-                background-color: #c0392b;
-            }
-        """)
+        self.clear_button.setObjectName("clearButton")
         self.clear_button.clicked.connect(self.clear_requested.emit)
         
         import_group.addWidget(self.import_button)
@@ -89,17 +164,7 @@ class ToolbarManager(QObject):
         # 实体解锁按钮（批量解锁所选文件）
         self.unlock_button = QPushButton("🔓 " + self.parent._("移除文件限制..."))
         self.unlock_button.setMinimumHeight(35)
-        self.unlock_button.setStyleSheet("""
-            QPushButton {
-                background-color: #8e44ad;
-                color: white;
-                font-size: 13px;
-                padding: 10px 20px;
-            }
-            QPushButton:hover {
-                background-color: #7d3c98;
-            }
-        """)
+        self.unlock_button.setObjectName("unlockButton")
         self.unlock_button.clicked.connect(self.unlock_requested.emit)
         import_group.addWidget(self.unlock_button)
         layout.addLayout(import_group)
@@ -111,7 +176,7 @@ class ToolbarManager(QObject):
         mode_group.setSpacing(10)
         
         mode_label = QLabel(self.parent._("Header Mode:"))
-        mode_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
+        mode_label.setObjectName("modeLabel")
         
         self.mode_select_combo = QComboBox()
         self.mode_select_combo.addItems([
@@ -120,13 +185,7 @@ class ToolbarManager(QObject):
             self.parent._("Custom Mode")
         ])
         self.mode_select_combo.setMinimumHeight(35)
-        self.mode_select_combo.setStyleSheet("""
-            QComboBox {
-                font-size: 13px;
-                padding: 8px 15px;
-                min-width: 150px;
-            }
-        """)
+        self.mode_select_combo.setObjectName("modeSelectCombo")
         self.mode_select_combo.currentTextChanged.connect(self._on_mode_changed)
         
         mode_group.addWidget(mode_label)
@@ -136,18 +195,17 @@ class ToolbarManager(QObject):
         return layout
         
     def create_auto_number_group(self) -> QGroupBox:
-        """创建自动编号设置的控件组"""
-        group = QGroupBox("🔢 " + self.parent._("Auto Number Settings"))
-        group.setStyleSheet("""
-            QGroupBox {
-                background-color: #ecf0f1;
-                border: 2px solid #bdc3c7;
-                border-radius: 10px;
-                margin-top: 15px;
-                padding-top: 15px;
-            }
-        """)
-        
+        """创建自动编号设置的控件组：先返回空分组，首次显示（进入自动编号模式）时才创建内部控件"""
+        group = _LazyGroupBox("🔢 " + self.parent._("Auto Number Settings"), self._build_auto_number_group)
+        group.setObjectName("autoNumberGroup")
+        self.auto_number_group = group
+        if self.mode_select_combo is not None:
+            group.setVisible(self.get_current_mode() == self.parent._("Auto Number Mode"))
+        return group
+
+    def _build_auto_number_group(self, group: QGroupBox):
+        """填充自动编号分组的内部控件（只执行一次）"""
+        defaults = _AUTO_NUMBER_DEFAULTS
         layout = QVBoxLayout()
         layout.setSpacing(15)
         
@@ -157,19 +215,7 @@ class ToolbarManager(QObject):
         # 前缀
         prefix_layout = QVBoxLayout()
         prefix_label = QLabel(self.parent._("Prefix:"))
-        prefix_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
-        self.prefix_input = QLineEdit("Doc-")
-        self.prefix_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                padding: 8px;
-                font-size: 12px;
-            }
-            QLineEdit:focus {
-                border-color: #3498db;
-            }
-        """)
+        self.prefix_input = QLineEdit(defaults['prefix'])
         self.prefix_input.textChanged.connect(self._on_auto_number_changed)
         prefix_layout.addWidget(prefix_label)
         prefix_layout.addWidget(self.prefix_input)
@@ -178,21 +224,9 @@ class ToolbarManager(QObject):
         # 起始编号
         start_layout = QVBoxLayout()
         start_label = QLabel(self.parent._("Start #:"))
-        start_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
         self.start_number_input = QSpinBox()
         self.start_number_input.setRange(1, 9999)
-        self.start_number_input.setValue(1)
-        self.start_number_input.setStyleSheet("""
-            QSpinBox {
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                padding: 8px;
-                font-size: 12px;
-            }
-            QSpinBox:focus {
-                border-color: #3498db;
-            }
-        """)
+        self.start_number_input.setValue(defaults['start_number'])
         self.start_number_input.valueChanged.connect(self._on_auto_number_changed)
         start_layout.addWidget(start_label)
         start_layout.addWidget(self.start_number_input)
@@ -201,21 +235,9 @@ class ToolbarManager(QObject):
         # 步长
         step_layout = QVBoxLayout()
         step_label = QLabel(self.parent._("Step:"))
-        step_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
         self.step_input = QSpinBox()
         self.step_input.setRange(1, 100)
-        self.step_input.setValue(1)
-        self.step_input.setStyleSheet("""
-            QSpinBox {
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                padding: 8px;
-                font-size: 12px;
-            }
-            QSpinBox:focus {
-                border-color: #3498db;
-            }
-        """)
+        self.step_input.setValue(defaults['step'])
         self.step_input.valueChanged.connect(self._on_auto_number_changed)
         step_layout.addWidget(step_label)
         step_layout.addWidget(self.step_input)
@@ -229,21 +251,9 @@ class ToolbarManager(QObject):
         # 位数
         digits_layout = QVBoxLayout()
         digits_label = QLabel(self.parent._("Digits:"))
-        digits_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
         self.digits_input = QSpinBox()
         self.digits_input.setRange(1, 6)
-        self.digits_input.setValue(3)
-        self.digits_input.setStyleSheet("""
-            QSpinBox {
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                padding: 8px;
-                font-size: 12px;
-            }
-            QSpinBox:focus {
-                border-color: #3498db;
-            }
-        """)
+        self.digits_input.setValue(defaults['digits'])
         self.digits_input.valueChanged.connect(self._on_auto_number_changed)
         digits_layout.addWidget(digits_label)
         digits_layout.addWidget(self.digits_input)
@@ -252,19 +262,7 @@ class ToolbarManager(QObject):
         # 后缀
         suffix_layout = QVBoxLayout()
         suffix_label = QLabel(self.parent._("Suffix:"))
-        suffix_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
-        self.suffix_input = QLineEdit("")
-        self.suffix_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                padding: 8px;
-                font-size: 12px;
-            }
-            QLineEdit:focus {
-                border-color: #3498db;
-            }
-        """)
+        self.suffix_input = QLineEdit(defaults['suffix'])
         self.suffix_input.textChanged.connect(self._on_auto_number_changed)
         suffix_layout.addWidget(suffix_label)
         suffix_layout.addWidget(self.suffix_input)
@@ -272,24 +270,38 @@ class ToolbarManager(QObject):
         
         layout.addLayout(row2)
         group.setLayout(layout)
-        
-        return group
+        self._auto_number_built = True
         
     def _on_mode_changed(self, mode: str):
         """模式改变时的处理"""
+        if self.auto_number_group is not None:
+            self.auto_number_group.setVisible(mode == self.parent._("Auto Number Mode"))
         self.mode_changed.emit(mode)
         
-    def _on_auto_number_changed(self):
-        """自动编号设置改变时的处理"""
-        if self.prefix_input and self.start_number_input and self.step_input and self.digits_input and self.suffix_input:
-            settings = {
-                'prefix': self.prefix_input.text(),
-                'start_number': self.start_number_input.value(),
-                'step': self.step_input.value(),
-                'digits': self.digits_input.value(),
-                'suffix': self.suffix_input.text()
-            }
-            self.auto_number_changed.emit(settings)
+    def _on_auto_number_changed(self, *_args):
+        """自动编号设置改变时的处理：重新计时，静止一段时间后才发出 auto_number_changed"""
+        if self._silenced:
+            self._batch_dirty = True
+        else:
+            self._emit_timer.start()
+
+    @Slot()
+    def _flush_auto_number(self):
+        if self._auto_number_built:
+            self.auto_number_changed.emit(self.get_auto_number_settings())
+
+    @contextmanager
+    def batch(self):
+        """批量修改自动编号控件：期间不计时，结束后如有改动只发出一次信号"""
+        outer = self._silenced
+        self._silenced = True
+        try:
+            yield
+        finally:
+            self._silenced = outer
+            if not outer and self._batch_dirty:
+                self._batch_dirty = False
+                self._emit_timer.start()
             
     def get_current_mode(self) -> str:
         """获取当前选择的模式"""
@@ -297,8 +309,9 @@ class ToolbarManager(QObject):
         
     def get_auto_number_settings(self) -> dict:
         """获取自动编号设置"""
-        if not all([self.prefix_input, self.start_number_input, self.step_input, self.digits_input, self.suffix_input]):
-            return {}
+        if not self._auto_number_built:
+            # 分组尚未创建：控件的值必然是默认值
+            return dict(_AUTO_NUMBER_DEFAULTS) if self.auto_number_group is not None else {}
             
         return {
             'prefix': self.prefix_input.text(),
@@ -310,13 +323,16 @@ class ToolbarManager(QObject):
         
     def set_auto_number_settings(self, settings: dict):
         """设置自动编号参数"""
-        if self.prefix_input and 'prefix' in settings:
-            self.prefix_input.setText(settings['prefix'])
-        if self.start_number_input and 'start_number' in settings:
-            self.start_number_input.setValue(settings['start_number'])
-        if self.step_input and 'step' in settings:
-            self.step_input.setValue(settings['step'])
-        if self.digits_input and 'digits' in settings:
-            self.digits_input.setValue(settings['digits'])
-        if self.suffix_input and 'suffix' in settings:
-            self.suffix_input.setText(settings['suffix'])
+        if self.auto_number_group is not None:
+            self.auto_number_group.ensure_built()
+        with self.batch():
+            if self.prefix_input and 'prefix' in settings:
+                self.prefix_input.setText(settings['prefix'])
+            if self.start_number_input and 'start_number' in settings:
+                self.start_number_input.setValue(settings['start_number'])
+            if self.step_input and 'step' in settings:
+                self.step_input.setValue(settings['step'])
+            if self.digits_input and 'digits' in settings:
+                self.digits_input.setValue(settings['digits'])
+            if self.suffix_input and 'suffix' in settings:
+                self.suffix_input.setText(settings['suffix'])
@@ -6,7 +6,7 @@
 
 import os
 from PySide6.QtWidgets import QMessageBox, QFileDialog
-from PySide6.QtCore import QSettings
+from PySide6.QtCore import QSettings, QSignalBlocker, QTimer
 
 from logger import logger
 
@@ -14,42 +14,65 @@ from logger import logger
 class EventHandlers:
     """事件处理器"""
     
+    # 预设位置（pt，A4）：页眉 x, 页眉 y, 页脚 x, 页脚 y；72 为 1 英寸边距，297 为宽度中心，523 = 595 - 72
+    _PRESETS = {
+        "top_left": (72, 792, 72, 50),
+        "top_center": (297, 792, 297, 50),
+        "top_right": (523, 792, 523, 50),
+        "bottom_left": (72, 50, 72, 792),
+        "bottom_center": (297, 50, 297, 792),
+        "bottom_right": (523, 50, 523, 792),
+    }
+    
+    # 位置输入框按单位的范围与步长：x 范围, y 范围, 步长（A4 纸张）
+    _UNIT_CFG = {
+        "mm": ((0, 210), (0, 297), 1),      # 210x297mm
+        "inch": ((0, 827), (0, 1169), 10),  # 约 8.27x11.69 英寸，以百分之一英寸为单位
+        "pt": ((0, 595), (0, 842), 1),      # 595x842 points（默认）
+    }
+    
     def __init__(self, main_window):
         self.main_window = main_window
         self._ = main_window._
+        # 模板名（已翻译）-> 建议文本，只随语言变化，切换语言时重建
+        self._template_mapping = None
+        # 处理完成提示用到的译文，同样在切换语言时重建
+        self._message_tokens = None
+        # 应用设置存储只打开一次，各处理函数共用（仅在界面线程使用）
+        self._settings = QSettings("DocDeck", "DocDeck")
+        # 同一轮事件循环内的多次预览请求合并为一次渲染
+        self._preview_timer = QTimer(main_window)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(0)
+        self._preview_timer.timeout.connect(main_window.update_preview)
+        
+    def _schedule_preview(self):
+        """在本轮事件循环结束时刷新预览（重复调用只刷新一次）"""
+        self._preview_timer.start()
         
     def _on_font_changed(self, text: str):
         """当字体改变时的处理"""
-        self.main_window.update_preview()
+        self._schedule_preview()
         
     def _on_unit_changed(self, unit: str):
         """当单位改变时触发预设位置更新"""
-        # 根据不同单位调整位置输入控件的范围和步长
-        if unit == "mm":
-            # 毫米单位：A4纸张 210x297mm
-            self.main_window.x_input.setRange(0, 210)
-            self.main_window.y_input.setRange(0, 297)
-            self.main_window.x_input.setSingleStep(1)
-            self.main_window.y_input.setSingleStep(1)
-        elif unit == "inch":
-            # 英寸单位：A4纸张约 8.27x11.69 英寸
-            self.main_window.x_input.setRange(0, 827)  # 以百分之一英寸为单位
-            self.main_window.y_input.setRange(0, 1169)
-            self.main_window.x_input.setSingleStep(10)
-            self.main_window.y_input.setSingleStep(10)
-        else:  # points (默认)
-            # 磅单位：A4纸张 595x842 points
-            self.main_window.x_input.setRange(0, 595)
-            self.main_window.y_input.setRange(0, 842)
-            self.main_window.x_input.setSingleStep(1)
-            self.main_window.y_input.setSingleStep(1)
+        # 根据不同单位调整位置输入控件的范围和步长（其余单位按磅处理）
+        x_range, y_range, step = self._UNIT_CFG.get(unit, self._UNIT_CFG["pt"])
+        mw = self.main_window
+        blockers = [QSignalBlocker(mw.x_input), QSignalBlocker(mw.y_input)]
+        mw.x_input.setRange(*x_range)
+        mw.y_input.setRange(*y_range)
+        mw.x_input.setSingleStep(step)
+        mw.y_input.setSingleStep(step)
+        for blocker in blockers:
+            blocker.unblock()
             
         # 触发预设位置的重新计算
-        self._apply_top_left_preset()
+        self._apply_preset("top_left")
         
-    def _on_header_template_changed(self, template: str):
-        """当页眉模板改变时的处理"""
-        template_mapping = {
+    def _build_template_mapping(self) -> dict:
+        """构建当前语言下的模板映射并缓存"""
+        self._template_mapping = {
             self._("Custom"): "",
             self._("Company Name"): "DocDeck Solutions Inc.",
             self._("Document Title"): "Document Title",
@@ -59,70 +82,66 @@ class EventHandlers:
             self._("Draft"): "DRAFT",
             self._("Final Version"): "FINAL VERSION"
         }
+        return self._template_mapping
+        
+    def _on_header_template_changed(self, template: str):
+        """当页眉模板改变时的处理"""
+        template_mapping = self._template_mapping or self._build_template_mapping()
         
         if template in template_mapping:
             suggested_text = template_mapping[template]
             if suggested_text and not self.main_window.header_text_input.text():
                 self.main_window.header_text_input.setText(suggested_text)
                 
-        self.main_window.update_preview()
+        self._schedule_preview()
+        
+    def _apply_preset(self, name: str):
+        """应用预设位置：四个输入框批量赋值期间屏蔽信号，最后只请求一次预览"""
+        x, y, footer_x, footer_y = self._PRESETS[name]
+        mw = self.main_window
+        blockers = [QSignalBlocker(w) for w in (mw.x_input, mw.y_input, mw.footer_x_input, mw.footer_y_input)]
+        mw.x_input.setValue(x)
+        mw.y_input.setValue(y)
+        mw.footer_x_input.setValue(footer_x)
+        mw.footer_y_input.setValue(footer_y)
+        for blocker in blockers:
+            blocker.unblock()
+        self._schedule_preview()
         
     def _apply_top_left_preset(self):
         """应用左上角预设位置"""
-        self.main_window.x_input.setValue(72)  # 1英寸边距
-        self.main_window.y_input.setValue(792)  # 接近顶部
-        self.main_window.footer_x_input.setValue(72)
-        self.main_window.footer_y_input.setValue(50)  # 接近底部
-        self.main_window.update_preview()
+        self._apply_preset("top_left")
         
     def _apply_top_center_preset(self):
         """应用顶部居中预设位置"""
-        self.main_window.x_input.setValue(297)  # A4宽度中心
-        self.main_window.y_input.setValue(792)
-        self.main_window.footer_x_input.setValue(297)
-        self.main_window.footer_y_input.setValue(50)
-        self.main_window.update_preview()
+        self._apply_preset("top_center")
         
     def _apply_top_right_preset(self):
         """应用右上角预设位置"""
-        self.main_window.x_input.setValue(523)  # 595-72，右边距
-        self.main_window.y_input.setValue(792)
-        self.main_window.footer_x_input.setValue(523)
-        self.main_window.footer_y_input.setValue(50)
-        self.main_window.update_preview()
+        self._apply_preset("top_right")
         
     def _apply_bottom_left_preset(self):
         """应用左下角预设位置"""
-        self.main_window.x_input.setValue(72)
-        self.main_window.y_input.setValue(50)
-        self.main_window.footer_x_input.setValue(72)
-        self.main_window.footer_y_input.setValue(792)
-        self.main_window.update_preview()
+        self._apply_preset("bottom_left")
         
     def _apply_bottom_center_preset(self):
         """应用底部居中预设位置"""
-        self.main_window.x_input.setValue(297)
-        self.main_window.y_input.setValue(50)
-        self.main_window.footer_x_input.setValue(297)
-        self.main_window.footer_y_input.setValue(792)
-        self.main_window.update_preview()
+        self._apply_preset("bottom_center")
         
     def _apply_bottom_right_preset(self):
         """应用右下角预设位置"""
-        self.main_window.x_input.setValue(523)
-        self.main_window.y_input.setValue(50)
-        self.main_window.footer_x_input.setValue(523)
-        self.main_window.footer_y_input.setValue(792)
-        self.main_window.update_preview()
+        self._apply_preset("bottom_right")
         
     def _change_language(self, language: str):
         """切换语言"""
         try:
             self.main_window.locale_manager.set_locale(language)
+            self._template_mapping = None
+            self._message_tokens = None
             self._refresh_ui_texts()
             
             # 保存语言设置
-            settings = QSettings("DocDeck", "DocDeck")
+            settings = self._settings
             settings.setValue("language", language)
             
             QMessageBox.information(
@@ -160,7 +179,7 @@ class EventHandlers:
             )
             
             if file_path:
-                settings = QSettings("DocDeck", "DocDeck")
+                settings = self._settings
                 # 这里可以添加导入设置的具体逻辑
                 QMessageBox.information(
                     self.main_window,
@@ -182,7 +201,7 @@ class EventHandlers:
             )
             
             if file_path:
-                settings = QSettings("DocDeck", "DocDeck")
+                settings = self._settings
                 # 这里可以添加导出设置的具体逻辑
                 QMessageBox.information(
                     self.main_window,
@@ -205,38 +224,61 @@ class EventHandlers:
         
         if reply == QMessageBox.Yes:
             try:
-                # 重置各种输入控件到默认值
-                self.main_window.font_size_spin.setValue(12)
-                self.main_window.footer_font_size_spin.setValue(10)
-                self.main_window.x_input.setValue(72)
-                self.main_window.y_input.setValue(792)
-                self.main_window.footer_x_input.setValue(72)
-                self.main_window.footer_y_input.setValue(50)
-                self.main_window.header_text_input.clear()
-                self.main_window.footer_text_input.clear()
-                self.main_window.prefix_input.setText("Doc-")
-                self.main_window.start_spin.setValue(1)
-                self.main_window.step_spin.setValue(1)
-                self.main_window.digits_spin.setValue(3)
-                self.main_window.suffix_input.clear()
+                mw = self.main_window
+                widgets = (
+                    mw.font_size_spin, mw.footer_font_size_spin, mw.x_input, mw.y_input,
+                    mw.footer_x_input, mw.footer_y_input, mw.header_text_input, mw.footer_text_input,
+                    mw.prefix_input, mw.start_spin, mw.step_spin, mw.digits_spin, mw.suffix_input,
+                    mw.structured_checkbox, mw.struct_cn_fixed_checkbox, mw.memory_optimization_checkbox,
+                    mw.normalize_a4_checkbox, mw.merge_checkbox, mw.page_numbers_checkbox,
+                    mw.font_select, mw.footer_font_select, mw.align_combo, mw.footer_align_combo,
+                    mw.header_template_combo, mw.mode_select_combo,
+                )
+                previous_mode = mw.mode_select_combo.currentText()
+                # 批量重置期间屏蔽所有控件信号，结束后统一刷新一次
+                blockers = [QSignalBlocker(w) for w in widgets]
+                try:
+                    # 重置各种输入控件到默认值
+                    self.main_window.font_size_spin.setValue(12)
+                    self.main_window.footer_font_size_spin.setValue(10)
+                    self.main_window.x_input.setValue(72)
+                    self.main_window.y_input.setValue(792)
+                    self.main_window.footer_x_input.setValue(72)
+                    self.main_window.footer_y_input.setValue(50)
+                    self.main_window.header_text_input.clear()
+                    self.main_window.footer_text_input.clear()
+                    self.main_window.prefix_input.setText("Doc-")
+                    self.main_window.start_spin.setValue(1)
+                    self.main_window.step_spin.setValue(1)
+                    self.main_window.digits_spin.setValue(3)
+                    self.main_window.suffix_input.clear()
                 
-                # 重置复选框
-                self.main_window.structured_checkbox.setChecked(False)
-                self.main_window.struct_cn_fixed_checkbox.setChecked(False)
-                self.main_window.memory_optimization_checkbox.setChecked(True)
-                self.main_window.normalize_a4_checkbox.setChecked(True)
-                self.main_window.merge_checkbox.setChecked(False)
-                self.main_window.page_numbers_checkbox.setChecked(False)
+                    # 重置复选框
+                    self.main_window.structured_checkbox.setChecked(False)
+                    self.main_window.struct_cn_fixed_checkbox.setChecked(False)
+                    self.main_window.memory_optimization_checkbox.setChecked(True)
+                    self.main_window.normalize_a4_checkbox.setChecked(True)
+                    self.main_window.merge_checkbox.setChecked(False)
+                    self.main_window.page_numbers_checkbox.setChecked(False)
                 
-                # 重置下拉框到第一项
-                self.main_window.font_select.setCurrentIndex(0)
-                self.main_window.footer_font_select.setCurrentIndex(0)
-                self.main_window.align_combo.setCurrentIndex(0)
-                self.main_window.footer_align_combo.setCurrentIndex(0)
-                self.main_window.header_template_combo.setCurrentIndex(0)
-                self.main_window.mode_select_combo.setCurrentIndex(0)
+                    # 重置下拉框到第一项
+                    self.main_window.font_select.setCurrentIndex(0)
+                    self.main_window.footer_font_select.setCurrentIndex(0)
+                    self.main_window.align_combo.setCurrentIndex(0)
+                    self.main_window.footer_align_combo.setCurrentIndex(0)
+                    self.main_window.header_template_combo.setCurrentIndex(0)
+                    self.main_window.mode_select_combo.setCurrentIndex(0)
+                finally:
+                    for blocker in blockers:
+                        blocker.unblock()
                 
-                self.main_window.update_preview()
+                # 模式切换会影响界面布局，仍需通知
+                if mw.mode_select_combo.currentText() != previous_mode:
+                    mw.mode_select_combo.currentTextChanged.emit(mw.mode_select_combo.currentText())
+                toolbar = getattr(mw, 'toolbar_manager', None)
+                if toolbar is not None:
+                    toolbar.auto_number_changed.emit(toolbar.get_auto_number_settings())
+                self._schedule_preview()
                 
                 QMessageBox.information(
                     self.main_window,
@@ -247,41 +289,46 @@ class EventHandlers:
                 logger.error(f"重置设置失败: {e}")
                 QMessageBox.warning(self.main_window, self._("Error"), f"{self._('Failed to reset settings')}: {str(e)}")
                 
+    def _build_message_tokens(self) -> dict:
+        """构建当前语言下处理完成提示的译文并缓存"""
+        self._message_tokens = {
+            'completed': self._('Processing completed successfully!'),
+            'success': self._("Success"),
+            'with_errors': self._('Processing completed with errors'),
+            'failed_files': self._('Failed files'),
+            'and': self._('and'),
+            'more': self._('more'),
+            'partial': self._("Partial Success"),
+        }
+        return self._message_tokens
+        
     def on_processing_finished(self, results: list):
         """处理完成后的回调"""
         try:
-            success_count = len([r for r in results if r.get('success', False)])
+            # 单次遍历统计；失败文件名只保留消息中展示的前 5 个
+            success_count = 0
+            failed_files = []
+            for r in results:
+                if r.get('success', False):
+                    success_count += 1
+                elif len(failed_files) < 5:
+                    failed_files.append(r.get('file', 'Unknown'))
             total_count = len(results)
+            failed_count = total_count - success_count
             
+            tokens = self._message_tokens or self._build_message_tokens()
             if success_count == total_count:
-                message = f"{self._('Processing completed successfully!')} {success_count}/{total_count}"
-                QMessageBox.information(self.main_window, self._("Success"), message)
+                message = f"{tokens['completed']} {success_count}/{total_count}"
+                QMessageBox.information(self.main_window, tokens['success'], message)
             else:
-                failed_files = [r.get('file', 'Unknown') for r in results if not r.get('success', False)]
-                message = f"{self._('Processing completed with errors')} {success_count}/{total_count}\n"
-                message += f"{self._('Failed files')}: {', '.join(failed_files[:5])}"
-                if len(failed_files) > 5:
-                    message += f" {self._('and')} {len(failed_files) - 5} {self._('more')}"
-                QMessageBox.warning(self.main_window, self._("Partial Success"), message)
+                parts = [
+                    f"{tokens['with_errors']} {success_count}/{total_count}\n",
+                    f"{tokens['failed_files']}: ", ", ".join(failed_files),
+                ]
+                if failed_count > 5:
+                    parts.append(f" {tokens['and']} {failed_count - 5} {tokens['more']}")
+                QMessageBox.warning(self.main_window, tokens['partial'], "".join(parts))
                 
         except Exception as e:
             logger.error(f"处理完成回调失败: {e}")
             QMessageBox.information(self.main_window, self._("Processing"), self._("Processing completed"))
-            
-    def _apply_top_right_preset(self):
-        """应用右上角预设位置"""
-        # 简化版本，设置固定的右上角位置
-        self.main_window.x_input.setValue(523)  # 595-72，右边距
-        self.main_window.y_input.setValue(792)  # 上边距
-        self.main_window.footer_x_input.setValue(523)
-        self.main_window.footer_y_input.setValue(50)
-        self.main_window.update_preview()
-        
-    def _apply_bottom_right_preset(self):
-        """应用右下角预设位置"""
-        # 简化版本，设置固定的右下角位置
-        self.main_window.x_input.setValue(523)  # 595-72，右边距
-        self.main_window.y_input.setValue(50)   # 下边距
-        self.main_window.footer_x_input.setValue(523)
-        self.main_window.footer_y_input.setValue(792)
-        self.main_window.update_preview()
@@ -5,48 +5,69 @@
 """
 
 import locale
-from typing import Dict, Any
+import sys
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
 from .translations import TRANSLATIONS
 
 
+@lru_cache(maxsize=1)
+def _detect_system_language_cached() -> str:
+    """检测系统语言（每个进程只查询一次系统 locale）"""
+    try:
+        # 获取系统语言
+        system_locale = locale.getdefaultlocale()[0]
+        if system_locale:
+            if system_locale.startswith('zh'):
+                return 'zh_CN'
+            elif system_locale.startswith('en'):
+                return 'en_US'
+        # 强制使用中文界面
+        return 'zh_CN'
+    except:
+        return 'zh_CN'
+
+
 class LocaleManager:
     """语言管理器"""
     
     def __init__(self):
         self.current_locale = self._detect_system_language()
         self.translations = TRANSLATIONS
+        self._available_locales = tuple(self.translations.keys())
+        # 扁平化为 (语言, 原文) -> 译文，一次哈希查找；键做 intern，各处复用同一字符串对象
+        self._flat: Dict[Tuple[str, str], str] = {
+            (sys.intern(loc), sys.intern(key)): value
+            for loc, table in self.translations.items()
+            for key, value in table.items()
+        }
     
     def _detect_system_language(self) -> str:
         """检测系统语言"""
-        try:
-            # 获取系统语言
-            system_locale = locale.getdefaultlocale()[0]
-            if system_locale:
-                if system_locale.startswith('zh'):
-                    return 'zh_CN'
-                elif system_locale.startswith('en'):
-                    return 'en_US'
-            # 强制使用中文界面
-            return 'zh_CN'
-        except:
-            return 'zh_CN'
+        return _detect_system_language_cached()
     
     def _(self, text: str) -> str:
         """获取本地化文本"""
-        return self.translations.get(self.current_locale, {}).get(text, text)
+        return self._flat.get((self.current_locale, text), text)
+    
+    def translate_many(self, texts: List[str]) -> List[str]:
+        """批量获取本地化文本"""
+        flat = self._flat
+        current = self.current_locale
+        return [flat.get((current, text), text) for text in texts]
     
     def set_locale(self, locale_code: str):
         """设置语言"""
         if locale_code in self.translations:
-            self.current_locale = locale_code
+            self.current_locale = sys.intern(locale_code)
     
     def get_current_locale(self) -> str:
         """获取当前语言"""
         return self.current_locale
     
-    def get_available_locales(self) -> list:
-        """获取可用语言列表"""
-        return list(self.translations.keys())
+    def get_available_locales(self) -> Tuple[str, ...]:
+        """获取可用语言列表（共享的只读元组）"""
+        return self._available_locales
 
 
 # 全局实例（单例模式）
@@ -15,7 +15,7 @@ from PySide6.QtWidgets import (
     QGroupBox, QMenu, QInputDialog, QProgressBar
 )
 from PySide6.QtCore import (
-    Qt, QCoreApplication, QThread, QTimer, QRect, QPoint, QSize, QEvent, Signal
+    Qt, QCoreApplication, QThread, QThreadPool, QTimer, QRect, QPoint, QSize, QEvent, Signal
 )
 from PySide6.QtGui import (
     QPainter, QPen, QFont, QPixmap, QImage, QBrush, QColor, QIcon, QAction, QTransform
@@ -32,18 +32,151 @@ from reportlab.pdfgen import canvas as rl_canvas
 # 应用模块
 from models import PDFFileItem, EncryptionStatus
 from controller import ProcessingController, Worker
-from font_manager import get_system_fonts, suggest_chinese_fallback_font
+from font_manager import get_system_fonts, refresh_system_fonts, suggest_chinese_fallback_font
 from pdf_handler import merge_pdfs, add_page_numbers
 from position_utils import suggest_safe_header_y, is_out_of_print_safe_area
 from merge_dialog import MergeDialog
+from fitz_lock import FITZ_LOCK
 from geometry_context import build_geometry_context
 from font_manager import register_font_safely
 from logger import logger
 from ui.components.preview_manager import PreviewManager
+from ui.utils.ui_helpers import file_dialog_options
 
 # 导入语言管理器
 from ui.i18n.locale_manager import get_locale_manager
 
+# 文件列表区域的样式表在导入时构建一次，每次创建窗口复用同一字符串
+_FILE_GROUP_QSS = """
+    QGroupBox {
+        background-color: #f8f9fa;
+        border: 2px solid #dee2e6;
+        border-radius: 10px;
+        margin-top: 15px;
+        padding-top: 15px;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 15px;
+        padding: 0 10px 0 10px;
+        color: #2c3e50;
+        background-color: #f8f9fa;
+        font-size: 14px;
+        font-weight: bold;
+    }
+"""
+
+_CONTROLS_GROUP_QSS = """
+    QGroupBox {
+        background-color: #f8f9fa;
+        border: 2px solid #dee2e6;
+        border-radius: 10px;
+        margin-top: 15px;
+        padding-top: 15px;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 15px;
+        padding: 0 10px 0 10px;
+        color: #2c3e50;
+        font-size: 14px;
+        font-weight: bold;
+    }
+"""
+
+_FILE_TABLE_QSS = """
+    QTableWidget {
+        background-color: white;
+        alternate-background-color: #f8f9fa;
+        gridline-color: #e9ecef;
+        border: 2px solid #dee2e6;
+        border-radius: 8px;
+        selection-background-color: #3498db;
+        selection-color: white;
+        font-size: 11px;
+    }
+    QTableWidget::item {
+        padding: 6px 8px;
+        border-bottom: 1px solid #f1f3f4;
+    }
+    QTableWidget::item:selected {
+        background-color: #3498db;
+        color: white;
+    }
+    QHeaderView::section {
+        background-color: #34495e;
+        color: white;
+        padding: 10px 8px;
+        border: none;
+        font-weight: bold;
+        font-size: 11px;
+    }
+    QHeaderView::section:hover {
+        background-color: #2c3e50;
+    }
+    QScrollBar:vertical {
+        background-color: #f1f3f4;
+        width: 12px;
+        border-radius: 6px;
+    }
+    QScrollBar::handle:vertical {
+        background-color: #c1c1c1;
+        border-radius: 6px;
+        min-height: 20px;
+    }
+    QScrollBar::handle:vertical:hover {
+        background-color: #a8a8a8;
+    }
+    QScrollBar:horizontal {
+        background-color: #f1f3f4;
+        height: 12px;
+        border-radius: 6px;
+    }
+    QScrollBar::handle:horizontal {
+        background-color: #c1c1c1;
+        border-radius: 6px;
+        min-width: 20px;
+    }
+    QScrollBar::handle:horizontal:hover {
+        background-color: #a8a8a8;
+    }
+"""
+
+# 文件表格各列的调整模式：序号/大小/页数固定宽度，文件名/页眉/页脚可调整
+_FILE_TABLE_RESIZE_MODES = (
+    QHeaderView.Fixed, QHeaderView.Interactive, QHeaderView.Fixed,
+    QHeaderView.Fixed, QHeaderView.Interactive, QHeaderView.Interactive,
+)
+
+# 文件操作按钮按 objectName 着色，规则并入控制组样式表只解析一次；各按钮只有配色不同，由同一模板生成
+_BTN_QSS_TMPL = """
+    QPushButton#%(name)s {
+        background-color: %(bg)s;
+        border: none;
+        color: white;
+        padding: 8px 16px;
+        border-radius: 6px;
+        font-weight: bold;
+        font-size: 12px;
+        min-width: 80px;
+    }
+    QPushButton#%(name)s:hover {
+        background-color: %(hover)s;
+    }
+    QPushButton#%(name)s:pressed {
+        background-color: %(pressed)s;
+    }
+    QPushButton#%(name)s:disabled {
+        background-color: #bdc3c7;
+        color: #7f8c8d;
+    }
+"""
+_CONTROLS_GROUP_QSS += "".join(_BTN_QSS_TMPL % colors for colors in (
+    {"name": "btn-secondary", "bg": "#6c757d", "hover": "#5a6268", "pressed": "#495057"},
+    {"name": "btn-danger", "bg": "#e74c3c", "hover": "#c0392b", "pressed": "#a93226"},
+))
+
+
 class MainWindow(QMainWindow):
     """
     应用程序主窗口。
@@ -115,6 +248,7 @@ class MainWindow(QMainWindow):
         from config import load_settings
         self._apply_settings(load_settings())
         self._update_ui_state()
+        self._prewarm_type0_fonts()
         
         # 设置拖拽支持
         self._setup_drag_drop()
@@ -881,24 +1015,7 @@ class MainWindow(QMainWindow):
         
         # 创建表格区域组
         table_group = QGroupBox("📋 " + self._("File List"))
-        table_group.setStyleSheet("""
-            QGroupBox {
-                background-color: #f8f9fa;
-                border: 2px solid #dee2e6;
-                border-radius: 10px;
-                margin-top: 15px;
-                padding-top: 15px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px 0 10px;
-                color: #2c3e50;
-                background-color: #f8f9fa;
-                font-size: 14px;
-                font-weight: bold;
-            }
-        """)
+        table_group.setStyleSheet(_FILE_GROUP_QSS)
         
         table_group_layout = QVBoxLayout()
         table_group_layout.setSpacing(15)
@@ -916,12 +1033,9 @@ class MainWindow(QMainWindow):
         self.file_table.setMinimumWidth(1000)  # 总宽度：80+300+100+100+200+200 = 980px + 边距
         
         # 设置列宽比例，优化显示效果
-        self.file_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Fixed)      # 序号列固定宽度
-        self.file_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Interactive) # 文件名列可调整
-        self.file_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Fixed)      # 大小列固定宽度
-        self.file_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Fixed)      # 页数列固定宽度
-        self.file_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Interactive) # 页眉列可调整
-        self.file_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.Interactive) # 页脚列可调整
+        header = self.file_table.horizontalHeader()
+        for col, mode in enumerate(_FILE_TABLE_RESIZE_MODES):
+            header.setSectionResizeMode(col, mode)
         
         # 设置默认列宽
         self.file_table.setColumnWidth(0, 80)   # 序号列（增加宽度显示锁图标）
@@ -936,65 +1050,15 @@ class MainWindow(QMainWindow):
         
         self.file_table.setSelectionBehavior(QTableWidget.SelectRows)
         self.file_table.setEditTriggers(QTableWidget.DoubleClicked)
+
+        # 固定行高：滚动时按行号直接计算偏移，无需逐行测量内容
+        vh = self.file_table.verticalHeader()
+        vh.setSectionResizeMode(QHeaderView.Fixed)
+        vh.setDefaultSectionSize(32)
+        vh.setMinimumSectionSize(32)
         
         # 设置表格样式表
-        self.file_table.setStyleSheet("""
-            QTableWidget {
-                background-color: white;
-                alternate-background-color: #f8f9fa;
-                gridline-color: #e9ecef;
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                selection-background-color: #3498db;
-                selection-color: white;
-                font-size: 11px;
-            }
-            QTableWidget::item {
-                padding: 6px 8px;
-                border-bottom: 1px solid #f1f3f4;
-            }
-            QTableWidget::item:selected {
-                background-color: #3498db;
-                color: white;
-            }
-            QHeaderView::section {
-                background-color: #34495e;
-                color: white;
-                padding: 10px 8px;
-                border: none;
-                font-weight: bold;
-                font-size: 11px;
-            }
-            QHeaderView::section:hover {
-                background-color: #2c3e50;
-            }
-            QScrollBar:vertical {
-                background-color: #f1f3f4;
-                width: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #c1c1c1;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #a8a8a8;
-            }
-            QScrollBar:horizontal {
-                background-color: #f1f3f4;
-                height: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:horizontal {
-                background-color: #c1c1c1;
-                border-radius: 6px;
-                min-width: 20px;
-            }
-            QScrollBar::handle:horizontal:hover {
-                background-color: #a8a8a8;
-            }
-        """)
+        self.file_table.setStyleSheet(_FILE_TABLE_QSS)
         
         # 表格编辑或选择变化时，实时刷新预览
         self.file_table.itemChanged.connect(lambda *_: self.update_preview())
@@ -1020,23 +1084,7 @@ class MainWindow(QMainWindow):
         
         # 创建控制按钮组
         controls_group = QGroupBox("🎛️ " + self._("File Operations"))
-        controls_group.setStyleSheet("""
-            QGroupBox {
-                background-color: #f8f9fa;
-                border: 2px solid #dee2e6;
-                border-radius: 10px;
-                margin-top: 15px;
-                padding-top: 15px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px 0 10px;
-                color: #2c3e50;
-                font-size: 14px;
-                font-weight: bold;
-            }
-        """)
+        controls_group.setStyleSheet(_CONTROLS_GROUP_QSS)
         
         controls_layout = QVBoxLayout()
         controls_layout.setSpacing(10)
@@ -1044,78 +1092,15 @@ class MainWindow(QMainWindow):
         
         self.move_up_button = QPushButton("⬆️ " + self._("Move Up"))
         self.move_up_button.setMinimumHeight(35)
-        self.move_up_button.setStyleSheet("""
-            QPushButton {
-                background-color: #6c757d;
-                border: none;
-                color: white;
-                padding: 8px 16px;
-                border-radius: 6px;
-                font-weight: bold;
-                font-size: 12px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #5a6268;
-            }
-            QPushButton:pressed {
-                background-color: #495057;
-            }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-                color: #7f8c8d;
-            }
-        """)
+        self.move_up_button.setObjectName("btn-secondary")
         
         self.move_down_button = QPushButton("⬇️ " + self._("Move Down"))
         self.move_down_button.setMinimumHeight(35)
-        self.move_down_button.setStyleSheet("""
-            QPushButton {
-                background-color: #6c757d;
-                border: none;
-                color: white;
-                padding: 8px 16px;
-                border-radius: 6px;
-                font-weight: bold;
-                font-size: 12px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #5a6268;
-            }
-            QPushButton:pressed {
-                background-color: #495057;
-            }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-                color: #7f8c8d;
-            }
-        """)
+        self.move_down_button.setObjectName("btn-secondary")
         
         self.remove_button = QPushButton("🗑️ " + self._("Remove"))
         self.remove_button.setMinimumHeight(35)
-        self.remove_button.setStyleSheet("""
-            QPushButton {
-                background-color: #e74c3c;
-                border: none;
-                color: white;
-                padding: 8px 16px;
-                border-radius: 6px;
-                font-weight: bold;
-                font-size: 12px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #c0392b;
-            }
-            QPushButton:pressed {
-                background-color: #a93226;
-            }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-                color: #7f8c8d;
-            }
-        """)
+        self.remove_button.setObjectName("btn-danger")
         
         controls_layout.addStretch()
         # 顶部不再放置的按钮：迁移到文件操作区
@@ -1466,7 +1451,8 @@ class MainWindow(QMainWindow):
     def remove_selected_items(self):
         selected_rows = sorted([r.row() for r in self.file_table.selectionModel().selectedRows()], reverse=True)
         for row in selected_rows:
-            self.file_items.pop(row)
+            removed = self.file_items.pop(row)
+            self.preview.invalidate(removed.path)
             self.file_table.removeRow(row)
         self._update_ui_state()
 
@@ -1603,16 +1589,38 @@ class MainWindow(QMainWindow):
     def clear_file_list(self):
         """清空文件列表"""
         self.file_items.clear()
+        self.preview.invalidate()
         self._populate_table_from_items()
         # 确保UI状态正确更新
         self._update_ui_state()
 
     def _populate_table_from_items(self):
-        """用文件数据填充表格"""
-        logger.info(f"Populating table with {len(self.file_items)} items")
-        
-        # 临时禁用排序功能，避免干扰表格填充
+        """用文件数据填充表格；填充期间暂停排序与重绘，结束后只绘制一次"""
+        self._begin_table_bulk_insert()
+        try:
+            self._fill_table_rows()
+        finally:
+            self._end_table_bulk_insert()
+        # 不在此处调用自定义排序，避免递归填充；由触发端显式调用
+        self._update_ui_state()
+        if self.file_items: self._font_linked_once = False
+
+    def _begin_table_bulk_insert(self):
+        """批量填充前：关闭排序与重绘，各列临时固定宽度，避免逐行重排与重算列宽"""
         self.file_table.setSortingEnabled(False)
+        self.file_table.setUpdatesEnabled(False)
+        self.file_table.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
+    def _end_table_bulk_insert(self):
+        """批量填充后：恢复各列的调整模式并一次性重绘（内置排序保持关闭，统一使用自定义排序）"""
+        header = self.file_table.horizontalHeader()
+        for col, mode in enumerate(_FILE_TABLE_RESIZE_MODES):
+            header.setSectionResizeMode(col, mode)
+        self.file_table.setUpdatesEnabled(True)
+        self.file_table.viewport().update()
+
+    def _fill_table_rows(self):
+        logger.info(f"Populating table with {len(self.file_items)} items")
         
         # 调试：打印所有文件项的信息
         for i, item in enumerate(self.file_items):
@@ -1712,12 +1720,6 @@ class MainWindow(QMainWindow):
                     self.file_table.setItem(idx, 3, QTableWidgetItem(str(item.page_count)))
                     self.file_table.setItem(idx, 4, QTableWidgetItem(item.header_text))
                     self.file_table.setItem(idx, 5, QTableWidgetItem(item.footer_text or ""))
-        
-        # 保持禁用内置排序，统一使用自定义排序；若已有排序状态，重放一次
-        self.file_table.setSortingEnabled(False)
-        # 不在此处调用自定义排序，避免递归填充；由触发端显式调用
-        self._update_ui_state()
-        if self.file_items: self._font_linked_once = False
 
     def _get_item_index_by_row(self, row: int) -> int:
         """通过表格行安全地映射到 self.file_items 下标（基于路径绑定）。"""
@@ -1749,7 +1751,8 @@ class MainWindow(QMainWindow):
 
     def select_output_folder(self):
         """选择输出文件夹"""
-        folder = QFileDialog.getExistingDirectory(self, self._("Select Output Directory"))
+        folder = QFileDialog.getExistingDirectory(self, self._("Select Output Directory"), self.output_folder or "",
+                                                  file_dialog_options() | QFileDialog.ShowDirsOnly)
         if folder: self.output_path_display.setText(folder); self.output_folder = folder
 
     def move_item_up(self):
@@ -1910,6 +1913,7 @@ class MainWindow(QMainWindow):
             logger.info(f"Found {len(valid_items)} valid items")
             
             self.file_items.extend(valid_items)
+            self.preview.mark_files_changed()
             logger.info(f"Total file_items count: {len(self.file_items)}")
             
             self._populate_table_from_items()
@@ -1977,10 +1981,15 @@ class MainWindow(QMainWindow):
             packet.seek(0)
             
             # 使用 PyMuPDF 渲染这个 overlay PDF
-            overlay_doc = fitz.open("pdf", packet.read())
-            pix = overlay_doc[0].get_pixmap(alpha=True) # 必须使用 alpha=True
-            image = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGBA8888)
-            return QPixmap.fromImage(image)
+            with FITZ_LOCK:
+                overlay_doc = fitz.open("pdf", packet.read())
+                pix = overlay_doc[0].get_pixmap(alpha=True) # 必须使用 alpha=True
+                image = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGBA8888)
+                pixmap = QPixmap.fromImage(image)
+                # 在锁内释放 MuPDF 对象
+                del image, pix
+                overlay_doc.close()
+            return pixmap
 
         except Exception as e:
             logger.error(f"渲染预览文本覆盖层失败: {e}", exc_info=True)
@@ -2094,10 +2103,24 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.show_error(self._("Failed to apply settings due to an error. Please check the logs."), e)
 
+    def _prewarm_type0_fonts(self):
+        """在后台线程预热结构化模式会用到的中文字体载体，避免首次处理时同步生成"""
+        from type0_font_provider import prewarm_type0_fonts
+        fonts = [self.struct_cn_font_combo.currentText()]
+        for combo in (self.font_select, self.footer_font_select):
+            try:
+                fonts.append(suggest_chinese_fallback_font(combo.currentText()))
+            except Exception as e:
+                logger.debug(f"[Type0] 预热时推断回退字体失败: {e}")
+        QThreadPool.globalInstance().start(lambda: prewarm_type0_fonts(fonts))
+        # 字体下拉框可能使用了磁盘缓存的字体列表，后台核对并更新缓存供下次启动使用
+        QThreadPool.globalInstance().start(refresh_system_fonts)
+
     def closeEvent(self, event):
         """在关闭应用前保存设置"""
         from config import save_settings
         save_settings(self._get_current_settings())
+        self.preview.close_all()
         event.accept()
 
     def show_error(self, message: str, exception: Exception = None):
@@ -2362,7 +2385,8 @@ class MainWindow(QMainWindow):
                 QMessageBox.StandardButton.Cancel
             )
             if reply == QMessageBox.StandardButton.Ok:
-                self.file_items.pop(row)
+                removed = self.file_items.pop(row)
+                self.preview.invalidate(removed.path)
                 self._populate_table_from_items()
 
     def _unlock_selected(self):
@@ -2952,10 +2976,10 @@ class MainWindow(QMainWindow):
         self.statusBar.showMessage(self._("Ready"))
         
         # 刷新表格标题
-        self.file_table.setHorizontalHeaderLabels([
-            self._("No."), self._("Filename"), self._("Size (MB)"), 
-            self._("Page Count"), self._("Header Text"), self._("Footer Text")
-        ])
+        self.file_table.setHorizontalHeaderLabels(self.locale_manager.translate_many([
+            "No.", "Filename", "Size (MB)",
+            "Page Count", "Header Text", "Footer Text"
+        ]))
         
         # 更新预览
         self.update_preview()
@@ -3020,10 +3044,10 @@ class MainWindow(QMainWindow):
         if row >= 0 and row < len(self.file_items):
             try:
                 import fitz
-                doc = fitz.open(self.file_items[row].path)
-                if len(doc) > 0:
-                    page = doc[0]
-                    page_width = page.rect.width
+                # 只在持锁期间读取页宽，控件更新放在锁外
+                with FITZ_LOCK, fitz.open(self.file_items[row].path) as doc:
+                    page_width = doc[0].rect.width if len(doc) > 0 else None
+                if page_width is not None:
                     # 转换页面宽度到当前单位
                     page_width_unit = self._convert_unit(page_width, "pt", unit)
                     # X = 页面宽度 - 右边距 - 预估文本宽度
@@ -3031,7 +3055,6 @@ class MainWindow(QMainWindow):
                     estimated_text_width = font_size * 0.6 * 20  # 假设20个字符
                     x = page_width_unit - right_margin - estimated_text_width
                     self.x_input.setValue(max(0, int(x)))
-                doc.close()
             except:
                 # 如果无法获取页面尺寸，使用默认值
                 self.x_input.setValue(72)
@@ -3060,10 +3083,10 @@ class MainWindow(QMainWindow):
         if row >= 0 and row < len(self.file_items):
             try:
                 import fitz
-                doc = fitz.open(self.file_items[row].path)
-                if len(doc) > 0:
-                    page = doc[0]
-                    page_width = page.rect.width
+                # 只在持锁期间读取页宽，控件更新放在锁外
+                with FITZ_LOCK, fitz.open(self.file_items[row].path) as doc:
+                    page_width = doc[0].rect.width if len(doc) > 0 else None
+                if page_width is not None:
                     # 转换页面宽度到当前单位
                     page_width_unit = self._convert_unit(page_width, "pt", unit)
                     # X = 页面宽度 - 右边距 - 预估文本宽度
@@ -3071,7 +3094,6 @@ class MainWindow(QMainWindow):
                     estimated_text_width = font_size * 0.6 * 20
                     x = page_width_unit - right_margin - estimated_text_width
                     self.footer_x_input.setValue(max(0, int(x)))
-                doc.close()
             except:
                 self.footer_x_input.setValue(72)
         
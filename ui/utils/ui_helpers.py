@@ -1,4 +1,7 @@
-from PySide6.QtWidgets import QTableWidget
+import os
+import sys
+
+from PySide6.QtWidgets import QFileDialog, QTableWidget
 
 def ensure_selection_or_first_row(file_table: QTableWidget) -> int:
     """确保有选中行，若无则选中第0行并返回行号；若失败返回-1。"""
@@ -12,4 +15,9 @@ def ensure_selection_or_first_row(file_table: QTableWidget) -> int:
         return -1
 
 
-
+def file_dialog_options() -> QFileDialog.Option:
+    """文件对话框选项：Linux（或设置 DOCDECK_NO_NATIVE_DIALOG）下绕过原生对话框，避免打开时长时间卡顿。"""
+    options = QFileDialog.Option(0)
+    if sys.platform.startswith('linux') or os.environ.get('DOCDECK_NO_NATIVE_DIALOG'):
+        options |= QFileDialog.DontUseNativeDialog | QFileDialog.DontUseCustomDirectoryIcons
+    return options